@@ -0,0 +1,399 @@
+"""
+Latency benchmarks for db_utils against a live database.
+
+    python bench.py -u root                        # time every function and report
+    python bench.py -u root --scale 1,10,100       # pop_gen data at 1x, 10x, 100x
+    python bench.py -u root --scale 10 -o new.json --compare old.json
+    python bench.py -u root --compare-migration 2  # before/after the index pack
+    python bench.py -u root --compare-migration 1  # summary tables vs. aggregation
+
+Every case is called through its uncached function so every run reaches
+MySQL, after --warmup untimed calls; p50/p95/p99 are taken over --repeat
+timed calls, and rows/s is the row count divided by the p50.
+
+With --scale each factor gets its own database (football_league_bench_10x,
+...), created from schema.sql and loaded from pop_gen.py output the first
+time, then reused (--reload starts over). Pending migrations are applied
+before timing. get_next_id is only timed on the --scale databases, or on
+--database with --id-allocation, because it re-seeds and consumes the
+Player ID sequence. --output saves the results as JSON, and --compare prints
+the p50 change against a file saved earlier, e.g. on another commit.
+
+With --compare-migration the migration is reverted and re-applied around
+the runs, leaving it as it was found (earlier pending migrations are
+applied first).
+"""
+import argparse
+import datetime
+import getpass
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import pymysql
+
+import db_utils
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_FILE = os.path.join(SRC_DIR, "schema.sql")
+POP_GEN_FILE = os.path.join(SRC_DIR, "pop_gen.py")
+
+BENCH_DATABASE = "football_league_bench_{}x"
+LOAD_BATCH = 5000  # populate statements per commit
+
+
+def _uncached(func):
+    return getattr(func, "__wrapped__", func)
+
+def sample_params(conn):
+    """Picks real argument values for the parameterized queries."""
+    params = {"tournament_name": "", "manager_id": "", "archetype_prefix": "P", "search_term": "Player"}
+    with db_utils.borrow_connection(conn) as db, db.cursor() as cursor:
+        cursor.execute("SELECT tournament_name FROM Tournament LIMIT 1")
+        row = cursor.fetchone()
+        if row:
+            params["tournament_name"] = row["tournament_name"]
+        cursor.execute("SELECT manager_id FROM Player WHERE manager_id IS NOT NULL LIMIT 1")
+        row = cursor.fetchone()
+        if row:
+            params["manager_id"] = row["manager_id"]
+        cursor.execute("SELECT player_name FROM Player WHERE player_name IS NOT NULL LIMIT 1")
+        row = cursor.fetchone()
+        if row and row["player_name"].split():
+            params["search_term"] = row["player_name"].split()[-1]
+    return params
+
+def report_cases(conn):
+    """[(name, func, args)] for every report and library query."""
+    p = sample_params(conn)
+    cases = [
+        ("league_management_report", db_utils.get_league_management_report, ()),
+        ("club_assignments_report", db_utils.get_club_assignments_report, ()),
+        ("player_skills_report", db_utils.get_player_skills_report, ()),
+        ("manager_performance_sheet", db_utils.get_manager_performance_sheet, ()),
+        ("tournament_snapshot", db_utils.get_tournament_snapshot, ()),
+        ("underrated_manager_report", db_utils.get_underrated_manager_report, ()),
+        ("league_power_report", db_utils.get_league_power_report, ()),
+        ("archetype_mvp_report", db_utils.get_archetype_mvp_report, ()),
+        ("managers_with_min_wins", db_utils.query_managers_with_min_wins, (p["tournament_name"], 5)),
+        ("players_by_manager", db_utils.query_players_by_manager, (p["manager_id"],)),
+        ("average_rating_for_tournament", db_utils.query_average_rating_for_tournament, (p["tournament_name"],)),
+        ("archetype_by_prefix", db_utils.query_archetype_by_prefix, (p["archetype_prefix"],)),
+        ("trophy_leaderboard", db_utils.query_trophy_leaderboard, ()),
+        ("elite_players", db_utils.query_elite_players, ()),
+        ("active_league_insights", db_utils.query_active_league_insights, ()),
+    ]
+    return [(name, _uncached(func), args) for name, func, args in cases]
+
+def function_cases(conn, id_allocation=True):
+    """
+    [(name, func, args)] for the browsing, search and ID functions the TUI
+    calls. id_allocation=False leaves out get_next_id, which uses up IDs.
+    """
+    term = sample_params(conn)["search_term"]
+    cases = [
+        ("view_table Player", db_utils.view_table, ("Player", 100)),
+        ("view_table TournamentMatch", db_utils.view_table, ("TournamentMatch", 100)),
+        ("search_table Player", db_utils.search_table, ("Player", term)),
+        ("search_table Player fulltext", db_utils.search_table, ("Player", term, None, None, "fulltext")),
+        ("search_global", db_utils.search_global, (term,)),
+    ]
+    if id_allocation:
+        cases.append(("get_next_id Player", db_utils.get_next_id, ("Player", "player_id", "R")))
+    return [(name, _uncached(func), args) for name, func, args in cases]
+
+def _row_count(result):
+    if isinstance(result, dict):  # search_global: {table: rows}
+        return sum(len(rows) for rows in result.values())
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1 if result else 0
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+def time_call(conn, func, args, repeat, warmup=1):
+    """Latency summary (ms) of `repeat` runs after `warmup` untimed ones."""
+    rows = 0
+    for _ in range(warmup):
+        rows = _row_count(func(conn, *args))
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = _row_count(func(conn, *args))
+        samples.append(time.perf_counter() - started)
+    p50 = percentile(samples, 50)
+    return {
+        "runs": repeat,
+        "rows": rows,
+        "p50_ms": p50 * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "rows_per_sec": rows / p50 if p50 else 0.0,
+    }
+
+def time_cases(conn, cases, repeat, warmup=1):
+    return {name: time_call(conn, func, args, repeat, warmup) for name, func, args in cases}
+
+def time_reports(conn, repeat, warmup=1):
+    return time_cases(conn, report_cases(conn), repeat, warmup)
+
+def _ms(ms):
+    return f"{ms:10.2f}"
+
+def print_timings(timings):
+    print(f"{'case':<34}{'rows':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rows/s':>12}")
+    for name, t in timings.items():
+        print(f"{name:<34}{t['rows']:>8}{_ms(t['p50_ms'])}{_ms(t['p95_ms'])}{_ms(t['p99_ms'])}"
+              f"{t['rows_per_sec']:12.0f}")
+
+def compare_migration(conn, version, repeat, warmup=1):
+    """Times every report without and with migration `version`."""
+    was_applied = version in db_utils.applied_migrations(conn)
+    if not was_applied and version not in db_utils.apply_migrations(conn, target=version):
+        print(f"Could not apply migration {version}.")
+        return 1
+    with_migration = time_reports(conn, repeat, warmup)
+
+    if not db_utils.revert_migration(conn, version):
+        return 1
+    without_migration = time_reports(conn, repeat, warmup)
+    if was_applied:
+        db_utils.apply_migrations(conn, target=version)
+
+    print(f"{'report':<32}{'without ms':>11}{'with ms':>11}{'speedup':>9}")
+    for name, before in without_migration.items():
+        after = with_migration[name]["p50_ms"]
+        speedup = before["p50_ms"] / after if after else float("inf")
+        print(f"{name:<32}{_ms(before['p50_ms'])} {_ms(after)}{speedup:8.1f}x")
+    return 0
+
+# ---------------------------------------------------------
+# SCALED DATASETS
+# ---------------------------------------------------------
+
+def bench_database(scale):
+    return BENCH_DATABASE.format(scale)
+
+def _is_loaded(server, database):
+    # Migrations run after the load, so their table marks a finished dataset.
+    with server.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s "
+                       "AND TABLE_NAME = 'schema_migrations'", (database,))
+        return cursor.fetchone() is not None
+
+def _read_script(path, database):
+    with open(path, encoding="utf-8") as f:
+        return re.sub(r"\bfootball_league_db\b", database, f.read())
+
+def create_database(server, database):
+    """(Re)creates `database` from schema.sql."""
+    with server.cursor() as cursor:
+        for statement in db_utils.split_sql_script(_read_script(SCHEMA_FILE, database)):
+            cursor.execute(statement)
+
+def generate_dataset(scale, path):
+    """Writes pop_gen.py output for `scale` to path."""
+    subprocess.run([sys.executable, POP_GEN_FILE, "--scale", str(scale), "--jobs", "0", "--output", path],
+                   check=True, stdout=subprocess.DEVNULL)
+
+def _script_statements(path):
+    """Statements of a pop_gen script, streamed (it writes one per line)."""
+    with open(path, encoding="utf-8") as f:
+        pending = []
+        for line in f:
+            stripped = line.strip()
+            if not pending and (not stripped or stripped.startswith("--")):
+                continue
+            pending.append(stripped)
+            if stripped.endswith(";"):
+                yield " ".join(pending).rstrip(";")
+                pending = []
+
+def load_dataset(server, database, path):
+    """Runs a populate script in `database`, committing every LOAD_BATCH statements."""
+    server.select_db(database)
+    loaded = 0
+    with server.cursor() as cursor:
+        server.begin()
+        for statement in _script_statements(path):
+            if statement.upper().startswith("USE "):
+                continue
+            cursor.execute(statement)
+            loaded += 1
+            if loaded % LOAD_BATCH == 0:
+                server.commit()
+                server.begin()
+        server.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    return loaded
+
+def prepare_scale(server, scale, reload=False):
+    """Makes sure the bench database for `scale` exists and holds its dataset."""
+    database = bench_database(scale)
+    if not reload and _is_loaded(server, database):
+        return database
+    print(f"Loading the {scale}x dataset into {database} ...")
+    create_database(server, database)
+    fd, path = tempfile.mkstemp(suffix=".sql")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        generate_dataset(scale, path)
+        loaded = load_dataset(server, database, path)
+        print(f"  {loaded} statements in {time.perf_counter() - started:.1f}s")
+    finally:
+        os.remove(path)
+    return database
+
+def table_counts(conn):
+    catalog = db_utils.get_schema_catalog(conn)
+    counts = {}
+    with db_utils.borrow_connection(conn) as db, db.cursor() as cursor:
+        for table in catalog.tables():
+            cursor.execute(f"SELECT COUNT(*) AS n FROM {db_utils.validate_identifier(table)}")
+            counts[table] = cursor.fetchone()["n"]
+    return counts
+
+def benchmark_database(conn, repeat, warmup, id_allocation=False):
+    """
+    Times every function and report case on an already loaded database.
+    id_allocation also re-seeds the Player ID sequence and times get_next_id;
+    only do that on a database nobody else is writing to, since rewinding
+    the sequence under another writer's reserved block hands out its IDs twice.
+    """
+    if id_allocation:
+        db_utils.reset_id_sequence(conn, "Player", "player_id", "R")
+    db_utils.invalidate_query_cache()
+    cases = function_cases(conn, id_allocation) + report_cases(conn)
+    return {"row_counts": table_counts(conn), "cases": time_cases(conn, cases, repeat, warmup)}
+
+# ---------------------------------------------------------
+# RESULT FILES
+# ---------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def new_results(conn, repeat, warmup):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT VERSION() AS v")
+        version = cursor.fetchone()["v"]
+    return {
+        "commit": _git_commit(),
+        "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "server_version": version,
+        "repeat": repeat,
+        "warmup": warmup,
+        "runs": {},
+    }
+
+def compare_results(old, new):
+    """Prints the p50 of every case found in both result files."""
+    print(f"p50 change from {old.get('commit') or 'baseline'} to {new.get('commit') or 'this run'}")
+    for label, run in new["runs"].items():
+        before = old.get("runs", {}).get(label)
+        if not before:
+            continue
+        print(f"\n[{label}]")
+        print(f"{'case':<34}{'old ms':>10}{'new ms':>10}{'change':>9}")
+        for name, t in run["cases"].items():
+            prev = before["cases"].get(name)
+            if not prev:
+                continue
+            change = (t["p50_ms"] / prev["p50_ms"] - 1) * 100 if prev["p50_ms"] else 0.0
+            print(f"{name:<34}{_ms(prev['p50_ms'])}{_ms(t['p50_ms'])}{change:+8.1f}%")
+
+def _scales(value):
+    try:
+        scales = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        scales = []
+    if not scales or min(scales) < 1:
+        raise argparse.ArgumentTypeError("expected positive integers, e.g. 1,10,100")
+    return scales
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark db_utils functions and reports")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("-u", "--user", default="root")
+    parser.add_argument("-p", "--password", help="prompted for if omitted")
+    parser.add_argument("-d", "--database", default="football_league_db")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before timing")
+    parser.add_argument("--scale", type=_scales, metavar="N[,N...]",
+                        help="benchmark pop_gen datasets at these scale factors instead of --database")
+    parser.add_argument("--reload", action="store_true", help="regenerate the --scale datasets")
+    parser.add_argument("--id-allocation", action="store_true",
+                        help="also time get_next_id on --database (re-seeds its Player sequence and uses up IDs; "
+                             "always on for --scale)")
+    parser.add_argument("-o", "--output", help="save the results as JSON")
+    parser.add_argument("--compare", metavar="JSON", help="compare with results saved by --output")
+    parser.add_argument("--compare-migration", type=int, metavar="VERSION",
+                        help="time every report without and with this migration")
+    args = parser.parse_args(argv)
+    if args.repeat < 1 or args.warmup < 0:
+        parser.error("--repeat must be at least 1 and --warmup at least 0")
+    if args.scale and args.compare_migration is not None:
+        parser.error("--compare-migration works on --database, not --scale")
+
+    password = args.password if args.password is not None else getpass.getpass("MySQL password: ")
+    if args.scale:
+        server = db_utils.get_db_connection(args.host, args.user, password, None)
+    else:
+        server = db_utils.get_db_connection(args.host, args.user, password, args.database)
+    if not server:
+        return 1
+    try:
+        if args.compare_migration is not None:
+            return compare_migration(server, args.compare_migration, args.repeat, args.warmup)
+
+        results = new_results(server, args.repeat, args.warmup)
+        if args.scale:
+            for scale in args.scale:
+                database = prepare_scale(server, scale, args.reload)
+                conn = db_utils.get_db_connection(args.host, args.user, password, database)
+                if not conn:
+                    return 1
+                try:
+                    db_utils.apply_migrations(conn)
+                    run = results["runs"][f"{scale}x"] = benchmark_database(conn, args.repeat, args.warmup, id_allocation=True)
+                finally:
+                    conn.close()
+                print(f"\n[{scale}x] {sum(run['row_counts'].values())} rows")
+                print_timings(run["cases"])
+        else:
+            run = results["runs"][args.database] = benchmark_database(server, args.repeat, args.warmup, args.id_allocation)
+            print_timings(run["cases"])
+    except (pymysql.Error, subprocess.CalledProcessError) as e:
+        print(f"Benchmark failed: {e}")
+        return 1
+    finally:
+        server.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nSaved results to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print()
+            compare_results(json.load(f), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,22 @@
 import pymysql
+import os
 import re
+import bisect
 import datetime
+import decimal
+import time
+import random
+import threading
+import contextlib
+import csv
+import functools
+import gzip
+import hashlib
+import json
+import logging
+from collections import deque, OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 
 # =============================================================================
 # SECURITY & VALIDATION HELPER
@@ -18,26 +34,839 @@ def validate_identifier(identifier):
         raise ValueError(f"Security Alert: Invalid identifier detected: {identifier}")
     return identifier
 
+# =============================================================================
+# QUERY TRACING
+# =============================================================================
+
+log = logging.getLogger(__name__)
+
+TRACE_BUFFER_SIZE = 1000
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+_trace_state = threading.local()
+
+
+class Tracer:
+    """
+    Hands one event per executed statement to the registered sinks: the
+    db_utils operation that ran it, a statement id (hash of the SQL), the
+    parameters, wall time, server time, rows and bytes on the wire.
+    Tracing is off while no sink is registered, which costs one attribute
+    check per statement.
+
+    redact=True replaces every parameter with '?'; a callable receives the
+    parameters and returns what to record. server_time=True also asks
+    performance_schema how long the server spent on the statement (one
+    extra round trip each).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.redact = None
+        self.server_time = False
+        self._sinks = []
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink):
+        """Registers a callable that receives each event dict."""
+        with self._lock:
+            self._sinks = self._sinks + [sink]
+            self.enabled = True
+        return sink
+
+    def remove_sink(self, sink):
+        with self._lock:
+            self._sinks = [s for s in self._sinks if s != sink]
+            self.enabled = bool(self._sinks)
+
+    def _params(self, args):
+        if args is None or not self.redact:
+            return args
+        if callable(self.redact):
+            return self.redact(args)
+        if isinstance(args, dict):
+            return {key: "?" for key in args}
+        if isinstance(args, (list, tuple)):
+            return ["?"] * len(args)
+        return "?"
+
+    def execute(self, cursor, execute, query, args):
+        conn = cursor.connection
+        sent = getattr(conn, "bytes_sent", 0)
+        received = getattr(conn, "bytes_received", 0)
+        error = None
+        started = time.perf_counter()
+        try:
+            return execute(query, args)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            wall = time.perf_counter() - started
+            sql = _normalize_sql(query)
+            event = {
+                "time": time.time(),
+                "operation": getattr(_trace_state, "operation", None),
+                "statement": _statement_id(sql),
+                "sql": sql,
+                "params": self._params(args),
+                "wall_ms": wall * 1000,
+                "server_ms": None,
+                # An unbuffered cursor does not know its row count yet
+                "rows": None if isinstance(cursor, pymysql.cursors.SSCursor) else cursor.rowcount,
+                "bytes_sent": getattr(conn, "bytes_sent", 0) - sent,
+                "bytes_received": getattr(conn, "bytes_received", 0) - received,
+                "error": f"{type(error).__name__}: {error}" if error else None,
+            }
+            if self.server_time and error is None:
+                event["server_ms"] = _server_time_ms(cursor)
+            self.emit(event)
+
+    def emit(self, event):
+        for sink in self._sinks:
+            try:
+                sink(event)
+            except Exception as e:
+                log.error(f"Trace sink error: {e}")
+
+
+tracer = Tracer()
+
+
+class RingBufferSink:
+    """Keeps the last `size` trace events in memory."""
+
+    def __init__(self, size=TRACE_BUFFER_SIZE):
+        self._events = deque(maxlen=size)
+
+    def __call__(self, event):
+        self._events.append(event)
+
+    def events(self):
+        return list(self._events)
+
+    def clear(self):
+        self._events.clear()
+
+
+class JsonlSink:
+    """Appends each trace event to a file as one JSON line."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class TraceStats:
+    """
+    Trace sink that aggregates events per operation for a dashboard:
+    latency histogram (LATENCY_BUCKETS_MS), p50/p95 over the last `samples`
+    statements, server time, rows, bytes and errors, plus the slowest of the
+    last `recent` statements and the rows fetched per second over `window`
+    seconds.
+    """
+
+    def __init__(self, samples=200, recent=TRACE_BUFFER_SIZE, window=10.0):
+        self.samples = samples
+        self.window = window
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent)
+        self._operations = {}
+
+    def __call__(self, event):
+        name = event["operation"] or "(other)"
+        wall = event["wall_ms"]
+        with self._lock:
+            op = self._operations.get(name)
+            if op is None:
+                op = self._operations[name] = {
+                    "calls": 0, "errors": 0, "rows": 0, "bytes": 0, "max_ms": 0.0,
+                    "server_ms": 0.0, "server_calls": 0,
+                    "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    "latencies": deque(maxlen=self.samples),
+                }
+            op["calls"] += 1
+            op["errors"] += event["error"] is not None
+            op["rows"] += max(event["rows"] or 0, 0)
+            op["bytes"] += event["bytes_sent"] + event["bytes_received"]
+            op["max_ms"] = max(op["max_ms"], wall)
+            if event["server_ms"] is not None:
+                op["server_ms"] += event["server_ms"]
+                op["server_calls"] += 1
+            op["buckets"][bisect.bisect_left(LATENCY_BUCKETS_MS, wall)] += 1
+            op["latencies"].append(wall)
+            self._recent.append(event)
+
+    def snapshot(self, slowest=10):
+        """{"operations": {name: summary}, "slowest": [events], "rows_per_sec": float}"""
+        now = time.time()
+        with self._lock:
+            operations = {}
+            for name, op in self._operations.items():
+                latencies = sorted(op["latencies"])
+                operations[name] = {
+                    "calls": op["calls"], "errors": op["errors"], "rows": op["rows"], "bytes": op["bytes"],
+                    "max_ms": op["max_ms"], "buckets": list(op["buckets"]),
+                    "p50_ms": _percentile(latencies, 50), "p95_ms": _percentile(latencies, 95),
+                    "server_ms": op["server_ms"] / op["server_calls"] if op["server_calls"] else None,
+                }
+            recent = list(self._recent)
+        rows = sum(max(e["rows"] or 0, 0) for e in recent if e["time"] >= now - self.window)
+        return {
+            "operations": operations,
+            "slowest": sorted(recent, key=lambda e: e["wall_ms"], reverse=True)[:slowest],
+            "rows_per_sec": rows / self.window,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+            self._recent.clear()
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return None
+    return ordered[max(1, -(-len(ordered) * pct // 100)) - 1]
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_sql(query):
+    return " ".join(query.split()) if isinstance(query, str) else repr(query)
+
+@functools.lru_cache(maxsize=1024)
+def _statement_id(sql):
+    return hashlib.sha1(sql.encode("utf-8")).hexdigest()[:12]
+
+def _server_time_ms(cursor):
+    if not isinstance(cursor._result, pymysql.connections.MySQLResult) or cursor._result.unbuffered_active:
+        return None  # The connection is still streaming rows
+    try:
+        with cursor.connection.cursor(pymysql.cursors.Cursor) as probe:
+            probe.execute("SELECT TIMER_WAIT / 1000000000 FROM performance_schema.events_statements_history "
+                          "WHERE THREAD_ID = PS_CURRENT_THREAD_ID() ORDER BY EVENT_ID DESC LIMIT 1")
+            row = probe.fetchone()
+            return float(row[0]) if row and row[0] is not None else None
+    except pymysql.Error:
+        return None
+
+
+# =============================================================================
+# RESULT SETS
+# =============================================================================
+# Rows come back as Row views over plain tuples that share one Columns
+# header per result, instead of one dict per row. A Row reads like a
+# read-only dict (row["name"], row.get(), keys(), items(), dict(row)), and
+# column lookup ignores case.
+
+class Columns:
+    """The column names of one result, shared by all of its rows."""
+
+    __slots__ = ("names", "_positions")
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        positions = {}
+        for i, name in enumerate(self.names):
+            positions.setdefault(name.lower(), i)
+        for i, name in enumerate(self.names):
+            positions[name] = i
+        self._positions = positions
+
+    def position(self, name):
+        """Index of a column (exact match first, then case-insensitive), or None."""
+        pos = self._positions.get(name)
+        if pos is None and isinstance(name, str):
+            pos = self._positions.get(name.lower())
+        return pos
+
+
+class Row(Mapping):
+    """One result row: a tuple of values read through its result's Columns."""
+
+    __slots__ = ("_columns", "_values")
+
+    def __init__(self, columns, values):
+        self._columns = columns
+        self._values = values
+
+    def __getitem__(self, key):
+        pos = self._columns.position(key)
+        if pos is None:
+            raise KeyError(key)
+        return self._values[pos]
+
+    def get(self, key, default=None):
+        pos = self._columns.position(key)
+        return default if pos is None else self._values[pos]
+
+    def __contains__(self, key):
+        return self._columns.position(key) is not None
+
+    def __iter__(self):
+        return iter(self._columns.names)
+
+    def __len__(self):
+        return len(self._values)
+
+    def keys(self):
+        return self._columns.names
+
+    def values(self):
+        return self._values
+
+    def items(self):
+        return tuple(zip(self._columns.names, self._values))
+
+    def __repr__(self):
+        return f"Row({dict(self.items())!r})"
+
+
+class ResultSet(list):
+    """The Rows of one result; `columns` is their shared Columns header."""
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns, rows=()):
+        super().__init__(Row(columns, values) for values in rows)
+        self.columns = columns
+
+    def copy(self):
+        """A new ResultSet holding the same Rows."""
+        rows = ResultSet(self.columns)
+        rows.extend(self)
+        return rows
+
+
+class RowCursorMixin:
+    """Fetches Row / ResultSet objects instead of dicts (see DictCursorMixin)."""
+
+    _columns = None
+
+    def _do_get_result(self):
+        super()._do_get_result()
+        if self.description:
+            fields = []
+            for f in self._result.fields:
+                name = f.name
+                if name in fields:
+                    name = f"{f.table_name}.{name}"
+                fields.append(name)
+            self._columns = Columns(fields)
+
+    def fetchone(self):
+        row = super().fetchone()
+        return None if row is None else Row(self._columns, row)
+
+    def fetchmany(self, size=None):
+        return ResultSet(self._columns, super().fetchmany(size))
+
+    def fetchall(self):
+        return ResultSet(self._columns, super().fetchall())
+
+
+class TracedCursor(RowCursorMixin, pymysql.cursors.Cursor):
+    """Row cursor that reports its statements to the tracer while it is enabled."""
+
+    def execute(self, query, args=None):
+        if not tracer.enabled:
+            return super().execute(query, args)
+        return tracer.execute(self, super().execute, query, args)
+
+
+class TracedSSCursor(RowCursorMixin, pymysql.cursors.SSCursor):
+    """Unbuffered (server-side) Row cursor that reports its statements to the tracer."""
+
+    def fetchall(self):
+        # SSCursor.fetchall reads through fetchone, which already returns Rows.
+        rows = ResultSet(self._columns)
+        rows.extend(self.fetchall_unbuffered())
+        return rows
+
+    def execute(self, query, args=None):
+        if not tracer.enabled:
+            return super().execute(query, args)
+        return tracer.execute(self, super().execute, query, args)
+
+
+class TracedConnection(pymysql.connections.Connection):
+    """Connection that counts the bytes it sends and receives."""
+
+    bytes_sent = 0
+    bytes_received = 0
+
+    def _write_bytes(self, data):
+        self.bytes_sent += len(data)
+        super()._write_bytes(data)
+
+    def _read_bytes(self, num_bytes):
+        data = super()._read_bytes(num_bytes)
+        self.bytes_received += len(data)
+        return data
+
+
+def traced(func):
+    """Names the statements `func` runs after it in trace events (outermost call wins)."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled or getattr(_trace_state, "operation", None):
+            return func(*args, **kwargs)
+        _trace_state.operation = name
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _trace_state.operation = None
+    return wrapper
+
 # =============================================================================
 # CONNECTION & ID GENERATION
 # =============================================================================
 
+def _open_connection(host, user, password, db_name):
+    return TracedConnection(
+        host=host,
+        user=user,
+        password=password,
+        database=db_name,
+        cursorclass=TracedCursor,
+        autocommit=True
+    )
+
 def get_db_connection(host, user, password, db_name):
     """Establishes a connection to the MySQL database."""
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=db_name,
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=True
-        )
-        return connection
+        return _open_connection(host, user, password, db_name)
     except pymysql.Error as e:
-        print(f"Error connecting to MySQL: {e}")
+        log.error(f"Error connecting to MySQL: {e}")
         return None
 
+
+class PoolExhaustedError(pymysql.err.OperationalError):
+    """No pooled connection became available before the checkout timeout."""
+
+
+# Set by borrowing_for: the thread whose borrows this thread's count as.
+_borrow_owner = threading.local()
+
+@contextlib.contextmanager
+def borrowing_for(thread_ident):
+    """
+    Registers the pool connections this thread borrows meanwhile under
+    another thread's ident, so cancel_queries(thread_ident) reaches work that
+    thread handed to helper threads (e.g. iter_search_global's executor).
+    """
+    previous = getattr(_borrow_owner, "ident", None)
+    _borrow_owner.ident = thread_ident
+    try:
+        yield
+    finally:
+        _borrow_owner.ident = previous
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of autocommit connections (rows come back as Row objects).
+
+    Every db_utils function accepts a pool wherever it accepts a raw
+    connection; the call borrows a connection for its duration and hands it
+    back afterwards, so background workers can run queries side by side.
+
+    - min_size connections are opened up front and never evicted.
+    - At most max_size connections are open at once; further borrowers wait
+      up to checkout_timeout seconds, then get PoolExhaustedError.
+    - Borrowed connections are pinged first (unless they were returned less
+      than ping_grace seconds ago) and silently replaced if dead.
+    - Connections idle for longer than idle_timeout are closed.
+    """
+
+    def __init__(self, host, user, password, db_name, min_size=1, max_size=8,
+                 idle_timeout=300.0, checkout_timeout=30.0, ping_grace=1.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+        self.db_name = db_name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_grace = ping_grace
+        self._connect_args = (host, user, password, db_name)
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, returned_at), most recently used on the right
+        self._size = 0        # open connections, idle + borrowed
+        self._borrowers = {}  # thread ident -> connections it has borrowed
+        self._cancel_pending = set()  # borrowed connections cancel_queries has targeted
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+            self._size += 1
+
+    def _open(self):
+        return _open_connection(*self._connect_args)
+
+    def _evict_idle_locked(self):
+        """Pops connections idle past idle_timeout (oldest first). Caller closes them."""
+        stale = []
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, returned_at = self._idle[0]
+            if now - returned_at < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            stale.append(conn)
+        return stale
+
+    def acquire(self, timeout=None):
+        """Borrows a healthy connection. Prefer the connection() context manager."""
+        conn = self._checkout(timeout)
+        with self._cond:
+            owner = getattr(_borrow_owner, "ident", None) or threading.get_ident()
+            self._borrowers.setdefault(owner, []).append(conn)
+        return conn
+
+    def _checkout(self, timeout):
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        conn, returned_at, stale = None, None, []
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise pymysql.err.InterfaceError("Connection pool is closed.")
+                stale.extend(self._evict_idle_locked())
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(f"No connection available within {timeout:.1f}s (max_size={self.max_size}).")
+                self._cond.wait(remaining)
+
+        for old in stale:
+            _close_quietly(old)
+
+        try:
+            if conn is None:
+                return self._open()
+            if time.monotonic() - returned_at >= self.ping_grace:
+                try:
+                    conn.ping(reconnect=False)
+                except pymysql.Error:
+                    _close_quietly(conn)
+                    return self._open()
+            return conn
+        except BaseException:
+            # Could not open a replacement: give the slot back.
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, discard=False):
+        """
+        Returns a borrowed connection. Broken connections are dropped, and so
+        are connections cancel_queries targeted: its KILL QUERY may still be
+        on its way and must not hit the next borrower's statement.
+        """
+        with self._cond:
+            for ident, borrowed in list(self._borrowers.items()):
+                if conn in borrowed:
+                    borrowed.remove(conn)
+                    if not borrowed:
+                        del self._borrowers[ident]
+                    break
+            if conn in self._cancel_pending:
+                self._cancel_pending.discard(conn)
+                discard = True
+
+        if not discard and conn.open:
+            try:
+                if conn.server_status & pymysql.constants.SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                    conn.rollback()
+            except pymysql.Error:
+                discard = True
+        else:
+            discard = True
+
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            stale = self._evict_idle_locked()
+            self._cond.notify()
+
+        if conn is not None:
+            _close_quietly(conn)
+        for old in stale:
+            _close_quietly(old)
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        """Context manager that borrows a connection and always hands it back."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def cancel_queries(self, thread_ident):
+        """
+        Sends KILL QUERY for whatever is running on the connections currently
+        borrowed by the given thread (threading.get_ident() of a worker). The
+        interrupted call fails with error 1317. The targeted connections are
+        marked so release() closes them instead of pooling them, since the
+        KILL is sent later, from another connection, and a pooled connection
+        could meanwhile be running someone else's query. Returns how many
+        statements were targeted.
+        """
+        with self._cond:
+            borrowed = self._borrowers.get(thread_ident, [])
+            self._cancel_pending.update(borrowed)
+            targets = [c.thread_id() for c in borrowed]
+        if not targets:
+            return 0
+
+        control = self._open()
+        try:
+            with control.cursor() as cursor:
+                for server_thread in targets:
+                    try:
+                        cursor.execute("KILL QUERY %s", (server_thread,))
+                    except pymysql.Error:
+                        pass  # Statement already finished
+        finally:
+            _close_quietly(control)
+        return len(targets)
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {"size": self._size, "idle": idle, "in_use": self._size - idle,
+                    "min_size": self.min_size, "max_size": self.max_size}
+
+    def close(self):
+        """Closes idle connections now; borrowed ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle = [c for c, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            _close_quietly(conn)
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+def create_pool(host, user, password, db_name, **pool_options):
+    """Builds a ConnectionPool, or returns None if MySQL cannot be reached."""
+    try:
+        return ConnectionPool(host, user, password, db_name, **pool_options)
+    except pymysql.Error as e:
+        log.error(f"Error connecting to MySQL: {e}")
+        return None
+
+def cancel_queries(conn, thread_ident):
+    """Kills the running statements of a worker thread. Only pools track this."""
+    if isinstance(conn, ConnectionPool):
+        try:
+            return conn.cancel_queries(thread_ident)
+        except pymysql.Error as e:
+            log.error(f"Error cancelling query: {e}")
+    return 0
+
+@contextlib.contextmanager
+def borrow_connection(conn):
+    """
+    Yields a usable connection from either a ConnectionPool or a raw
+    pymysql connection, so callers never care which one they were given.
+    """
+    if isinstance(conn, Transaction):
+        try:
+            yield conn.db
+        except pymysql.Error as e:
+            # The caller will most likely swallow this and return False;
+            # remember it so the unit of work cannot commit half-done.
+            if conn.error is None:
+                conn.error = e
+            raise
+    elif isinstance(conn, ConnectionPool):
+        with conn.connection() as pooled:
+            yield pooled
+    else:
+        yield conn
+
+# =============================================================================
+# TRANSACTIONS (UNIT OF WORK)
+# =============================================================================
+# Connections run in autocommit mode, so each statement is its own
+# transaction. transaction() groups several db_utils calls into one: pass
+# the Transaction it yields as the conn argument of any db_utils function.
+
+RETRYABLE_ERRORS = {1213, 1205}  # ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT
+TRANSACTION_RETRIES = 3
+RETRY_BACKOFF = 0.05  # seconds, doubled per attempt
+
+def _is_retryable(error):
+    return isinstance(error, pymysql.Error) and bool(error.args) and error.args[0] in RETRYABLE_ERRORS
+
+class Transaction:
+    """An open transaction on one borrowed connection; see transaction()."""
+
+    def __init__(self, owner, db):
+        self.owner = owner      # the pool or connection it was opened from
+        self.db = db
+        self.error = None       # first database error raised inside it
+        self._pending = []      # write notifications, delivered on commit
+        self._savepoints = 0
+
+    def _execute(self, sql):
+        with self.db.cursor() as cursor:
+            cursor.execute(sql)
+
+    @contextlib.contextmanager
+    def savepoint(self):
+        """
+        Makes a block all-or-nothing within the transaction. If the block
+        raises, or a db_utils call inside it failed, its changes are rolled
+        back to the savepoint and the rest of the transaction carries on.
+        Deadlocks abort the whole transaction and are not contained.
+        """
+        self._savepoints += 1
+        name = f"sp_{self._savepoints}"
+        error_before, pending_before = self.error, len(self._pending)
+        self._execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except BaseException as e:
+            if not _is_retryable(e) and not _is_retryable(self.error):
+                self._execute(f"ROLLBACK TO SAVEPOINT {name}")
+                self.error = error_before
+                del self._pending[pending_before:]
+            raise
+        if self.error is not error_before and not _is_retryable(self.error):
+            self._execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self.error = error_before
+            del self._pending[pending_before:]
+        else:
+            self._execute(f"RELEASE SAVEPOINT {name}")
+
+
+@contextlib.contextmanager
+def transaction(conn):
+    """
+    Runs a block as a single transaction:
+
+        with db_utils.transaction(pool) as tx:
+            db_utils.update_record(tx, "Player", pk, changes)
+            db_utils.delete_record(tx, "Transfer", transfer_pk)
+
+    Commits when the block ends and rolls back if it raises. db_utils
+    functions report failure by returning False/None, so if any of them hit
+    a database error the unit is rolled back and that error is raised when
+    the block ends. Given a Transaction, the block becomes a savepoint in it.
+    """
+    if isinstance(conn, Transaction):
+        with conn.savepoint() as tx:
+            yield tx
+        return
+
+    with borrow_connection(conn) as db:
+        tx = Transaction(conn, db)
+        db.begin()
+        try:
+            yield tx
+            if tx.error is not None:
+                raise tx.error
+            db.commit()
+        except BaseException:
+            try:
+                db.rollback()
+            except pymysql.Error:
+                pass  # Connection is gone; the server rolls back for us
+            raise
+    for notification in tx._pending:
+        _deliver_write(*notification)
+
+def run_in_transaction(conn, func, *args, retries=TRANSACTION_RETRIES, **kwargs):
+    """
+    Calls func(tx, *args, **kwargs) inside transaction(conn) and returns its
+    result. Deadlocks and lock-wait timeouts roll the attempt back and run
+    func again (up to `retries` more times, with jittered exponential
+    backoff), so func must be safe to repeat. Other errors propagate.
+    """
+    if isinstance(conn, Transaction):
+        retries = 0  # Only the outermost transaction can be retried
+    attempt = 0
+    while True:
+        try:
+            with transaction(conn) as tx:
+                return func(tx, *args, **kwargs)
+        except pymysql.Error as e:
+            if not _is_retryable(e) or attempt >= retries:
+                raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+            attempt += 1
+
+@contextlib.contextmanager
+def _atomic(conn, db):
+    """One all-or-nothing step: its own transaction, or a savepoint inside a Transaction."""
+    if isinstance(conn, Transaction):
+        with conn.savepoint():
+            yield
+        return
+    db.begin()
+    try:
+        yield
+    except BaseException:
+        db.rollback()
+        raise
+    db.commit()
+
+# =============================================================================
+# ID SEQUENCES
+# =============================================================================
+# IDs look like <prefix><3-16 letters><3 digits> (e.g. RAAA001), counting
+# AAA001..AAA999, AAB001, ... ZZZ999, AAAA001. Each table has a row in
+# IdSequence holding the next free ordinal in that order; a process reserves
+# a whole block of ordinals with one atomic UPDATE and hands them out from
+# memory, so inserts need no read first and concurrent writers never collide.
+
+SEQUENCE_TABLE = "IdSequence"
+ID_BLOCK_SIZE = 1000
+ID_ALPHA_MIN, ID_ALPHA_MAX = 3, 16
+
+_SEQUENCE_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {SEQUENCE_TABLE} (
+        seq_name VARCHAR(64) PRIMARY KEY,
+        next_value BIGINT UNSIGNED NOT NULL
+    )
+"""
+
+_ID_SUFFIX = re.compile(r'^([A-Z]{%d,%d})(\d{3})$' % (ID_ALPHA_MIN, ID_ALPHA_MAX))
+
 def increment_alpha_part(alpha_str):
     chars = list(alpha_str)
     i = len(chars) - 1
@@ -50,87 +879,621 @@ def increment_alpha_part(alpha_str):
             return "".join(chars)
     return 'A' + "".join(chars)
 
-def get_next_id(connection, table_name, id_column, prefix):
+def id_to_ordinal(id_value, prefix):
+    """Position of an ID in the sequence (prefix + 'AAA001' is 0), or None if malformed."""
+    if not id_value or not id_value.startswith(prefix):
+        return None
+    match = _ID_SUFFIX.match(id_value[len(prefix):])
+    if not match or match.group(2) == "000":
+        return None
+    alpha, number = match.groups()
+    alpha_index = sum(26 ** n for n in range(ID_ALPHA_MIN, len(alpha)))
+    value = 0
+    for ch in alpha:
+        value = value * 26 + (ord(ch) - ord('A'))
+    return (alpha_index + value) * 999 + int(number) - 1
+
+def ordinal_to_id(ordinal, prefix):
+    """Inverse of id_to_ordinal."""
+    alpha_index, number = divmod(ordinal, 999)
+    length = ID_ALPHA_MIN
+    while alpha_index >= 26 ** length:
+        alpha_index -= 26 ** length
+        length += 1
+    if length > ID_ALPHA_MAX:
+        raise ValueError(f"ID sequence for prefix '{prefix}' is exhausted")
+    letters = []
+    for _ in range(length):
+        alpha_index, digit = divmod(alpha_index, 26)
+        letters.append(chr(ord('A') + digit))
+    return f"{prefix}{''.join(reversed(letters))}{number + 1:03d}"
+
+def _seed_ordinal(cursor, clean_table, clean_col, prefix):
+    """Ordinal after the highest ID already stored (longest alpha part sorts last)."""
+    cursor.execute(
+        f"SELECT {clean_col} FROM {clean_table} WHERE {clean_col} LIKE %s "
+        f"ORDER BY CHAR_LENGTH({clean_col}) DESC, {clean_col} DESC LIMIT 1",
+        (f"{prefix}%",))
+    row = cursor.fetchone()
+    ordinal = id_to_ordinal(row[clean_col], prefix) if row else None
+    return 0 if ordinal is None else ordinal + 1
+
+def _reserve_ordinals(cursor, clean_table, clean_col, prefix, count):
+    """Atomically claims `count` ordinals and returns the first one."""
+    sql = (f"UPDATE {SEQUENCE_TABLE} SET next_value = LAST_INSERT_ID(next_value + %s) "
+           f"WHERE seq_name = %s")
+    for attempt in range(2):
+        try:
+            cursor.execute(sql, (count, clean_table))
+        except pymysql.err.ProgrammingError as e:
+            if attempt or e.args[0] != 1146:  # ER_NO_SUCH_TABLE
+                raise
+            cursor.execute(_SEQUENCE_DDL)
+            invalidate_schema_catalog()
+            continue
+        if cursor.rowcount:
+            cursor.execute("SELECT LAST_INSERT_ID() AS seq_end")
+            return int(cursor.fetchone()["seq_end"]) - count
+        # First use: start after whatever the table already holds. INSERT
+        # IGNORE lets concurrent first users agree on a single row.
+        seed = _seed_ordinal(cursor, clean_table, clean_col, prefix)
+        cursor.execute(f"INSERT IGNORE INTO {SEQUENCE_TABLE} (seq_name, next_value) VALUES (%s, %s)",
+                       (clean_table, seed))
+    cursor.execute(sql, (count, clean_table))
+    cursor.execute("SELECT LAST_INSERT_ID() AS seq_end")
+    return int(cursor.fetchone()["seq_end"]) - count
+
+
+class IdAllocator:
     """
-    Generates the next ID. 
-    SECURE: Validates table/column names, Parameterizes the LIKE clause.
+    Per-process cache of reserved ID blocks, keyed by (database, table).
+    IDs left in a block when the process exits are simply never used, so
+    sequences may have gaps but never repeats.
     """
-    # 1. Validate Identifiers (Cannot be parameterized)
-    clean_table = validate_identifier(table_name)
-    clean_col = validate_identifier(id_column)
 
+    def __init__(self, block_size=ID_BLOCK_SIZE):
+        self.block_size = block_size
+        self._blocks = {}  # key -> [next_ordinal, end_ordinal]
+        self._lock = threading.Lock()
+
+    def take(self, conn, table_name, id_column, prefix, count=1):
+        clean_table = validate_identifier(table_name)
+        clean_col = validate_identifier(id_column)
+        if isinstance(conn, Transaction):
+            if not isinstance(conn.owner, ConnectionPool):
+                # The reservation would share the caller's fate on rollback,
+                # so it must not be cached for later use.
+                with borrow_connection(conn) as db, db.cursor() as cursor:
+                    start = _reserve_ordinals(cursor, clean_table, clean_col, prefix, count)
+                return [ordinal_to_id(o, prefix) for o in range(start, start + count)]
+            # Reserve on another pooled connection so the IdSequence row lock
+            # is not held until the caller's transaction ends.
+            conn = conn.owner
+        key = (_catalog_key(conn), clean_table)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None or block[1] - block[0] < count:
+                # A request bigger than the block size gets its own block;
+                # the remainder of the old one is abandoned.
+                size = max(self.block_size, count)
+                with borrow_connection(conn) as db, db.cursor() as cursor:
+                    start = _reserve_ordinals(cursor, clean_table, clean_col, prefix, size)
+                block = self._blocks[key] = [start, start + size]
+            first = block[0]
+            block[0] += count
+        return [ordinal_to_id(o, prefix) for o in range(first, first + count)]
+
+    def forget(self, conn=None):
+        """Drops cached blocks (for one database or all), e.g. after a reseed."""
+        with self._lock:
+            if conn is None:
+                self._blocks.clear()
+            else:
+                db_key = _catalog_key(conn)
+                for key in [k for k in self._blocks if k[0] == db_key]:
+                    del self._blocks[key]
+
+
+_id_allocator = IdAllocator()
+
+@traced
+def next_ids(conn, table_name, id_column, prefix, n):
+    """Returns n fresh, consecutive IDs for table_name (e.g. for a bulk load)."""
     try:
-        with connection.cursor() as cursor:
-            # 2. Parameterize Values (%s)
-            sql = f"SELECT {clean_col} FROM {clean_table} WHERE {clean_col} LIKE %s ORDER BY {clean_col} DESC LIMIT 1"
-            cursor.execute(sql, (f"{prefix}%",))
-            result = cursor.fetchone()
+        return _id_allocator.take(conn, table_name, id_column, prefix, n)
+    except pymysql.Error as e:
+        log.error(f"Error generating IDs: {e}")
+        return []
+    except ValueError as ve:
+        log.error(ve)
+        return []
 
-            if not result:
-                return f"{prefix}AAA001"
-            
-            current_id = result[clean_col]
-            match = re.search(r'([A-Z]+)(\d{3})$', current_id[len(prefix):])
-            
-            if not match:
-                return f"{prefix}AAA001"
+@traced
+def get_next_id(connection, table_name, id_column, prefix):
+    """
+    Generates the next ID from the table's sequence (see next_ids).
+    SECURE: Validates table/column names.
+    """
+    ids = next_ids(connection, table_name, id_column, prefix, 1)
+    return ids[0] if ids else None
 
-            alpha_part = match.group(1)
-            number_part = int(match.group(2))
-            
-            next_number = number_part + 1
-            next_alpha = alpha_part
-            
-            if next_number > 999:
-                next_number = 1
-                next_alpha = increment_alpha_part(alpha_part)
-            
-            return f"{prefix}{next_alpha}{next_number:03d}"
-            
+@traced
+def id_seed_query(conn, table_name, id_column, prefix):
+    """
+    Runs the read-only query a sequence is seeded from and returns the
+    ordinal after the highest stored ID (None on error). Reserves nothing.
+    SECURE: Validates table/column names.
+    """
+    try:
+        clean_table = validate_identifier(table_name)
+        clean_col = validate_identifier(id_column)
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            return _seed_ordinal(cursor, clean_table, clean_col, prefix)
     except pymysql.Error as e:
-        print(f"Error generating ID: {e}")
+        log.error(f"Error reading ID seed: {e}")
         return None
     except ValueError as ve:
-        print(ve)
+        log.error(ve)
         return None
 
+@traced
+def reset_id_sequence(conn, table_name, id_column, prefix):
+    """
+    Re-seeds a sequence from the IDs stored in the table. Needed after rows
+    were loaded with explicit IDs that bypassed the sequence (e.g. pop_gen).
+    """
+    try:
+        clean_table = validate_identifier(table_name)
+        clean_col = validate_identifier(id_column)
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute(_SEQUENCE_DDL)
+            seed = _seed_ordinal(cursor, clean_table, clean_col, prefix)
+            cursor.execute(f"REPLACE INTO {SEQUENCE_TABLE} (seq_name, next_value) VALUES (%s, %s)",
+                           (clean_table, seed))
+        _id_allocator.forget(conn)
+        return True
+    except pymysql.Error as e:
+        log.error(f"Error resetting ID sequence: {e}")
+        return False
+    except ValueError as ve:
+        log.error(ve)
+        return False
+
+# =============================================================================
+# SCHEMA CATALOG (CACHED METADATA)
+# =============================================================================
+
+TEXT_TYPES = {'char', 'varchar', 'text', 'mediumtext', 'longtext', 'enum'}
+
+# Bookkeeping tables that are hidden from browsing, search and indexing.
+INTERNAL_TABLES = {SEQUENCE_TABLE, "schema_migrations",
+                   "ManagerStats", "ManagerHeadToHead", "ClubMatchSummary"}
+
+# How often (seconds) a cached catalog re-checks the schema fingerprint.
+SCHEMA_CHECK_INTERVAL = 30.0
+
+_CATALOG_SQL = """
+    SELECT c.table_name AS table_name,
+           c.column_name AS column_name,
+           c.data_type AS data_type,
+           c.column_type AS column_type,
+           c.character_maximum_length AS max_length,
+           s.index_name AS index_name,
+           s.seq_in_index AS seq_in_index,
+           s.non_unique AS non_unique,
+           s.index_type AS index_type
+    FROM information_schema.columns c
+    LEFT JOIN information_schema.statistics s
+           ON s.table_schema = c.table_schema
+          AND s.table_name = c.table_name
+          AND s.column_name = c.column_name
+    WHERE c.table_schema = DATABASE()
+    ORDER BY c.table_name, c.ordinal_position, s.index_name
+"""
+
+_FINGERPRINT_SQL = """
+    SELECT COUNT(*) AS column_count,
+           SUM(CRC32(CONCAT_WS('.', table_name, column_name, column_type))) AS column_hash,
+           (SELECT COUNT(*) FROM information_schema.statistics
+             WHERE table_schema = DATABASE()) AS index_column_count
+    FROM information_schema.columns
+    WHERE table_schema = DATABASE()
+"""
+
+class SchemaCatalog:
+    """
+    In-process snapshot of the schema: per table, the ordered columns
+    (name, data_type, column_type, max_length) and indexes
+    ({index_name: {"columns": [...], "unique": bool, "type": "BTREE"|"FULLTEXT"|...}}).
+    Built from a single information_schema query by load_schema_catalog().
+    """
+
+    def __init__(self, tables, fingerprint=None):
+        self._tables = tables
+        self._by_lower = {name.lower(): name for name in tables}
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+
+    def _entry(self, table_name):
+        name = table_name if table_name in self._tables else self._by_lower.get(str(table_name).lower())
+        return self._tables.get(name, {"columns": [], "indexes": {}})
+
+    def tables(self):
+        return [t for t in self._tables if t not in INTERNAL_TABLES]
+
+    def has_table(self, table_name):
+        return table_name in self._tables or str(table_name).lower() in self._by_lower
+
+    def columns(self, table_name):
+        return self._entry(table_name)["columns"]
+
+    def column_types(self, table_name):
+        return [(c["name"], c["type"]) for c in self.columns(table_name)]
+
+    def text_columns(self, table_name):
+        return [c["name"] for c in self.columns(table_name) if c["type"] in TEXT_TYPES]
+
+    def indexes(self, table_name):
+        return self._entry(table_name)["indexes"]
+
+    def primary_key(self, table_name):
+        return list(self.indexes(table_name).get("PRIMARY", {}).get("columns", []))
+
+
+def _read_fingerprint(cursor):
+    cursor.execute(_FINGERPRINT_SQL)
+    row = cursor.fetchone()
+    return (int(row["column_count"] or 0), int(row["column_hash"] or 0), int(row["index_column_count"] or 0))
+
+@traced
+def load_schema_catalog(conn):
+    """Reads columns and indexes for every table in one information_schema query."""
+    with borrow_connection(conn) as db, db.cursor() as cursor:
+        fingerprint = _read_fingerprint(cursor)
+        cursor.execute(_CATALOG_SQL)
+        rows = cursor.fetchall()
+
+    tables = {}
+    for row in rows:
+        entry = tables.setdefault(row["table_name"], {"columns": [], "indexes": {}})
+        cols = entry["columns"]
+        if not cols or cols[-1]["name"] != row["column_name"]:
+            cols.append({
+                "name": row["column_name"],
+                "type": row["data_type"].lower(),
+                "column_type": row["column_type"],
+                "max_length": row["max_length"],
+            })
+        if row["index_name"]:
+            idx = entry["indexes"].setdefault(row["index_name"], {
+                "columns": {},
+                "unique": not int(row["non_unique"]),
+                "type": row["index_type"],
+            })
+            idx["columns"][int(row["seq_in_index"])] = row["column_name"]
+
+    for entry in tables.values():
+        for idx in entry["indexes"].values():
+            idx["columns"] = [idx["columns"][seq] for seq in sorted(idx["columns"])]
+
+    return SchemaCatalog(tables, fingerprint)
+
+
+_catalogs = {}
+_catalog_lock = threading.Lock()
+
+def _catalog_key(conn):
+    if isinstance(conn, Transaction):
+        conn = conn.owner
+    if isinstance(conn, ConnectionPool):
+        host, _, _, db_name = conn._connect_args
+        return (host, db_name)
+    db_name = conn.db.decode() if isinstance(conn.db, bytes) else conn.db
+    return (conn.host, db_name)
+
+def get_schema_catalog(conn, refresh=False):
+    """
+    Returns the cached SchemaCatalog for this database, loading it on first
+    use. Every SCHEMA_CHECK_INTERVAL seconds a cheap fingerprint query decides
+    whether DDL has happened since, in which case the catalog is reloaded.
+    """
+    key = _catalog_key(conn)
+    with _catalog_lock:
+        catalog = _catalogs.get(key)
+
+    if catalog is not None and not refresh:
+        if time.monotonic() - catalog.checked_at < SCHEMA_CHECK_INTERVAL:
+            return catalog
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            fingerprint = _read_fingerprint(cursor)
+        if fingerprint == catalog.fingerprint:
+            catalog.checked_at = time.monotonic()
+            return catalog
+
+    catalog = load_schema_catalog(conn)
+    with _catalog_lock:
+        _catalogs[key] = catalog
+    return catalog
+
+def invalidate_schema_catalog(conn=None):
+    """Drops the cached catalog for one database (or all of them if conn is None)."""
+    with _catalog_lock:
+        if conn is None:
+            _catalogs.clear()
+        else:
+            _catalogs.pop(_catalog_key(conn), None)
+
+# =============================================================================
+# MIGRATIONS
+# =============================================================================
+# Schema changes made after schema.sql live in migrations/ as
+# NNN_name.sql, with an optional NNN_name.down.sql to revert them. Applied
+# versions are recorded in schema_migrations. The files are plain mysql
+# scripts (DELIMITER included), so they can also be run with the mysql client.
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+_MIGRATION_FILE = re.compile(r'^(\d+)_(\w+?)(\.down)?\.sql$')
+
+_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+def split_sql_script(text):
+    """
+    Splits a SQL script into statements like the mysql client does:
+    honours DELIMITER lines and ignores delimiters inside quotes or comments.
+    """
+    statements, current = [], []
+    delimiter = ";"
+    quote = None
+    line_start = True
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if quote:
+            current.append(ch)
+            if ch == "\\" and quote != "`" and i + 1 < n:
+                current.append(text[i + 1])
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+            i += 1
+            continue
+        if line_start:
+            end = text.find("\n", i)
+            end = n if end == -1 else end
+            line = text[i:end].strip()
+            if line.upper().startswith("DELIMITER ") and not "".join(current).strip():
+                delimiter = line.split(None, 1)[1]
+                i = end + 1
+                continue
+        line_start = ch == "\n"
+        if ch in "'\"`":
+            quote = ch
+        elif ch == "#" or (text.startswith("--", i) and text[i + 2:i + 3] in ("", " ", "\t", "\n", "\r")):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        elif text.startswith(delimiter, i):
+            statement = "".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+            i += len(delimiter)
+            continue
+        current.append(ch)
+        i += 1
+    statement = "".join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    """[(version, name, up_path, down_path or None)] sorted by version."""
+    found = {}
+    for filename in os.listdir(directory):
+        match = _MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version, name, down = int(match.group(1)), match.group(2), bool(match.group(3))
+        entry = found.setdefault(version, [version, name, None, None])
+        entry[3 if down else 2] = os.path.join(directory, filename)
+    return [tuple(entry) for _, entry in sorted(found.items()) if entry[2]]
+
+@traced
+def applied_migrations(conn):
+    """{version: name} of the migrations recorded in this database."""
+    try:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute(_MIGRATIONS_DDL)
+            cursor.execute("SELECT version, name FROM schema_migrations ORDER BY version")
+            return {row["version"]: row["name"] for row in cursor.fetchall()}
+    except pymysql.Error as e:
+        log.error(f"Error reading migrations: {e}")
+        return {}
+
+def _run_script(cursor, path):
+    with open(path, encoding="utf-8") as f:
+        for statement in split_sql_script(f.read()):
+            cursor.execute(statement)
+
+@traced
+def apply_migrations(conn, directory=MIGRATIONS_DIR, target=None):
+    """
+    Applies pending migrations in version order (up to `target` if given)
+    and returns the versions applied. MySQL cannot roll back DDL, so a
+    failing migration stops the run and is left unrecorded for repair.
+    """
+    applied = []
+    try:
+        done = applied_migrations(conn)
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            for version, name, up_path, _ in list_migrations(directory):
+                if version in done or (target is not None and version > target):
+                    continue
+                _run_script(cursor, up_path)
+                cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                applied.append(version)
+    except (pymysql.Error, OSError) as e:
+        log.error(f"Error applying migrations: {e}")
+    finally:
+        if applied:
+            invalidate_schema_catalog(conn)
+            query_cache.invalidate()
+    return applied
+
+@traced
+def revert_migration(conn, version, directory=MIGRATIONS_DIR):
+    """Runs the .down.sql of an applied migration and unrecords it."""
+    try:
+        migration = next((m for m in list_migrations(directory) if m[0] == version), None)
+        if migration is None or migration[3] is None:
+            raise ValueError(f"Migration {version} has no down script.")
+        if version not in applied_migrations(conn):
+            raise ValueError(f"Migration {version} is not applied.")
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            _run_script(cursor, migration[3])
+            cursor.execute("DELETE FROM schema_migrations WHERE version = %s", (version,))
+        invalidate_schema_catalog(conn)
+        query_cache.invalidate()
+        return True
+    except (pymysql.Error, OSError, ValueError) as e:
+        log.error(f"Error reverting migration: {e}")
+        return False
+
+# =============================================================================
+# FULLTEXT SEARCH INDEXES
+# =============================================================================
+
+FULLTEXT_INDEX_NAME = "ft_search"
+FULLTEXT_TYPES = {'char', 'varchar', 'text', 'mediumtext', 'longtext'}
+
+# Words shorter than this are not indexed by InnoDB (innodb_ft_min_token_size).
+FULLTEXT_MIN_TOKEN = 3
+
+def _searchable_text_columns(catalog, table_name):
+    """
+    CHAR/VARCHAR/TEXT columns that hold words rather than keys: primary key
+    columns and *_id references are left out (search reaches them through
+    the LIKE/equality predicates instead).
+    """
+    pk_cols = {c.lower() for c in catalog.primary_key(table_name)}
+    return [c["name"] for c in catalog.columns(table_name)
+            if c["type"] in FULLTEXT_TYPES
+            and c["name"].lower() not in pk_cols
+            and not c["name"].lower().endswith("_id")]
+
+@traced
+def ensure_fulltext_indexes(conn, tables=None):
+    """
+    Creates (or rebuilds, if the text columns changed) one InnoDB FULLTEXT
+    index named FULLTEXT_INDEX_NAME over the word-bearing text columns of each
+    table (see _searchable_text_columns), e.g. Player(player_name) but not
+    player_id, archetype_id or manager_id.
+    Returns the tables whose index was created or rebuilt.
+
+    The first FULLTEXT index on a table makes InnoDB rebuild it, so on large
+    tables run this in a maintenance window rather than from the TUI.
+    """
+    changed = []
+    try:
+        catalog = get_schema_catalog(conn, refresh=True)
+        for table in tables or catalog.tables():
+            clean_table = validate_identifier(table)
+            wanted = [validate_identifier(c) for c in _searchable_text_columns(catalog, clean_table)]
+            existing = catalog.indexes(clean_table).get(FULLTEXT_INDEX_NAME)
+            if existing and existing["columns"] == wanted:
+                continue
+
+            with borrow_connection(conn) as db, db.cursor() as cursor:
+                if existing:
+                    cursor.execute(f"ALTER TABLE {clean_table} DROP INDEX {FULLTEXT_INDEX_NAME}")
+                if wanted:
+                    cursor.execute(f"ALTER TABLE {clean_table} ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} ({', '.join(wanted)})")
+            changed.append(clean_table)
+    except (pymysql.Error, ValueError) as e:
+        log.error(f"Error maintaining FULLTEXT indexes: {e}")
+    finally:
+        invalidate_schema_catalog(conn)
+    return changed
+
+@traced
+def drop_fulltext_indexes(conn, tables=None):
+    """Removes the search FULLTEXT indexes created by ensure_fulltext_indexes."""
+    dropped = []
+    try:
+        catalog = get_schema_catalog(conn, refresh=True)
+        for table in tables or catalog.tables():
+            clean_table = validate_identifier(table)
+            if FULLTEXT_INDEX_NAME not in catalog.indexes(clean_table):
+                continue
+            with borrow_connection(conn) as db, db.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {clean_table} DROP INDEX {FULLTEXT_INDEX_NAME}")
+            dropped.append(clean_table)
+    except (pymysql.Error, ValueError) as e:
+        log.error(f"Error dropping FULLTEXT indexes: {e}")
+    finally:
+        invalidate_schema_catalog(conn)
+    return dropped
+
+def _fulltext_columns(conn, table_name):
+    index = get_schema_catalog(conn).indexes(table_name).get(FULLTEXT_INDEX_NAME)
+    if not index or index["type"] != "FULLTEXT":
+        return []
+    return index["columns"]
+
+def _fulltext_match(conn, table_name, search_term):
+    """
+    Returns (match_sql, boolean_query) for a FULLTEXT search of search_term,
+    or None when the table has no search index or the term is too short.
+    Every long-enough word is required and prefix-matched: "real mad" ->
+    "+real* +mad*". Boolean-mode operators in the term are stripped.
+    """
+    cols = _fulltext_columns(conn, table_name)
+    words = [w for w in re.findall(r'\w+', str(search_term)) if len(w) >= FULLTEXT_MIN_TOKEN]
+    if not cols or not words:
+        return None
+    clean_cols = ", ".join(validate_identifier(c) for c in cols)
+    query = " ".join(f"+{w}*" for w in words)
+    return f"MATCH({clean_cols}) AGAINST (%s IN BOOLEAN MODE)", query
+
 # =============================================================================
 # VIEW, SEARCH & RECENT FUNCTIONALITY
 # =============================================================================
 
+@traced
 def get_all_tables(conn):
     try:
-        with conn.cursor() as cursor:
-            cursor.execute("SHOW TABLES")
-            return [list(row.values())[0] for row in cursor.fetchall()]
+        return get_schema_catalog(conn).tables()
     except pymysql.Error as e:
-        print(f"Error fetching tables: {e}")
+        log.error(f"Error fetching tables: {e}")
         return []
 
+@traced
 def get_text_columns(conn, table_name):
-    # Validate table name before passing to query
+    # Validate table name before looking it up
     try:
         clean_table = validate_identifier(table_name)
-        with conn.cursor() as cursor:
-            sql = """
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = DATABASE() 
-                AND table_name = %s 
-                AND data_type IN ('char', 'varchar', 'text', 'mediumtext', 'longtext', 'enum')
-            """
-            cursor.execute(sql, (clean_table,))
-            rows = cursor.fetchall()
-            return [row.get('COLUMN_NAME') or row.get('column_name') for row in rows]
-            
+        return get_schema_catalog(conn).text_columns(clean_table)
     except pymysql.Error as e:
-        print(f"Error fetching columns for {table_name}: {e}")
+        log.error(f"Error fetching columns for {table_name}: {e}")
         return []
     except ValueError as ve:
-        print(ve)
+        log.error(ve)
         return []
 
 
+@traced
 def get_searchable_columns(conn, table_name):
     """Return list of (column_name, data_type) for columns we can search across.
     This includes text, numeric and date/time types so the application can
@@ -138,129 +1501,399 @@ def get_searchable_columns(conn, table_name):
     """
     try:
         clean_table = validate_identifier(table_name)
-        with conn.cursor() as cursor:
-            sql = """
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_schema = DATABASE()
-                AND table_name = %s
-            """
-            cursor.execute(sql, (clean_table,))
-            rows = cursor.fetchall()
-            return [(row.get('COLUMN_NAME') or row.get('column_name'), (row.get('DATA_TYPE') or row.get('data_type')).lower()) for row in rows]
+        return get_schema_catalog(conn).column_types(clean_table)
     except pymysql.Error as e:
-        print(f"Error fetching searchable columns for {table_name}: {e}")
+        log.error(f"Error fetching searchable columns for {table_name}: {e}")
         return []
     except ValueError as ve:
-        print(ve)
+        log.error(ve)
         return []
 
+@traced
 def view_table(conn, table_name, limit=100):
-    try:
-        clean_table = validate_identifier(table_name)
-        with conn.cursor() as cursor:
-            # Table name is validated f-string, Limit is parameterized
-            sql = f"SELECT * FROM {clean_table} LIMIT %s"
-            cursor.execute(sql, (limit,))
-            return cursor.fetchall()
-    except (pymysql.Error, ValueError) as e:
-        print(f"Error viewing table: {e}")
-        return []
+    """First `limit` rows of the table in primary-key order (see browse_table)."""
+    return browse_table(conn, table_name, page_size=limit)["rows"]
 
-def search_table(conn, table_name, search_term):
+def _keyset_predicate(cols, op):
+    """
+    Expands a row comparison on the key columns into a form the range
+    optimizer handles: (a, b) > (x, y) -> a > x OR (a = x AND b > y).
+    op is '>', '<' or '>=' (the last one only loosens the final column).
+    """
+    strict = op.rstrip("=")
+    terms = []
+    for i, col in enumerate(cols):
+        last_op = op if i == len(cols) - 1 else strict
+        eqs = [f"{c} = %s" for c in cols[:i]]
+        terms.append("(" + " AND ".join(eqs + [f"{col} {last_op} %s"]) + ")")
+    return "(" + " OR ".join(terms) + ")"
+
+def _keyset_params(key):
+    params = []
+    for i in range(len(key)):
+        params.extend(key[:i + 1])
+    return params
+
+@traced
+def browse_table(conn, table_name, pk_cols=None, page_size=100, after=None, before=None, start_at=None):
+    """
+    Keyset pagination in primary-key order. Returns a page dict:
+    {"rows", "first_key", "last_key", "has_prev", "has_next", "error"}.
+    error is None, or the message of the failure that left rows empty, so
+    callers can tell a failed read from the end of the table.
+
+    - after=page["last_key"] fetches the next page (WHERE pk > key).
+    - before=page["first_key"] fetches the previous one (WHERE pk < key,
+      read backwards and flipped back into ascending order).
+    - start_at=key starts the page at that key, or the first one after it.
+    Keys are tuples in pk_cols order; pk_cols defaults to the table's
+    primary key from the schema catalog and may be composite. Each page
+    costs one index range read however deep into the table it is.
+    """
+    page = {"rows": [], "first_key": None, "last_key": None, "has_prev": False, "has_next": False, "error": None}
     try:
         clean_table = validate_identifier(table_name)
+        pk_cols = list(pk_cols or get_schema_catalog(conn).primary_key(clean_table))
+        clean_pks = [validate_identifier(c) for c in pk_cols]
+        if not clean_pks:
+            # Nothing to page by: fall back to a single unordered page.
+            with borrow_connection(conn) as db, db.cursor() as cursor:
+                cursor.execute(f"SELECT * FROM {clean_table} LIMIT %s", (page_size,))
+                page["rows"] = cursor.fetchall()
+            return page
+
+        key = after if after is not None else before if before is not None else start_at
+        backwards = before is not None and after is None
+        where, params = "", []
+        if key is not None:
+            key = tuple(key)
+            if len(key) != len(clean_pks):
+                raise ValueError(f"Cursor {key} does not match key columns {pk_cols}.")
+            op = "<" if backwards else ">" if after is not None else ">="
+            where = f" WHERE {_keyset_predicate(clean_pks, op)}"
+            params = _keyset_params(key)
+
+        direction = " DESC" if backwards else ""
+        order = ", ".join(f"{c}{direction}" for c in clean_pks)
+        sql = f"SELECT * FROM {clean_table}{where} ORDER BY {order} LIMIT %s"
+        params.append(page_size + 1)
+
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute(sql, tuple(params))
+            rows = cursor.fetchall()
 
-        # Retrieve searchable columns and types
-        cols = get_searchable_columns(conn, clean_table)
-
-        if not cols:
-            return []
+        more = len(rows) > page_size
+        del rows[page_size:]
+        if backwards:
+            rows.reverse()
+            page["has_prev"], page["has_next"] = more, True
+        else:
+            page["has_prev"], page["has_next"] = key is not None, more
 
-        # Attempt to interpret search term as int/float/date to enable numeric/date searches
-        is_int = False
-        is_float = False
-        is_date = False
-        num_val = None
-        date_val = None
+        page["rows"] = rows
+        if rows:
+            page["first_key"] = tuple(rows[0][c] for c in pk_cols)
+            page["last_key"] = tuple(rows[-1][c] for c in pk_cols)
+        return page
+    except (pymysql.Error, ValueError) as e:
+        log.error(f"Error viewing table: {e}")
+        page["error"] = str(e)
+        return page
+
+INTEGER_RANGES = {
+    'tinyint': 8, 'smallint': 16, 'mediumint': 24, 'int': 32, 'integer': 32, 'bigint': 64,
+}
+DECIMAL_TYPES = {'decimal', 'float', 'double'}
+DATE_TYPES = {'date', 'datetime', 'timestamp'}
+
+def _parse_search_term(search_term):
+    """Works out every way search_term could be read: number, date, year."""
+    term = str(search_term).strip()
+    parsed = {"text": term, "int": None, "number": None, "date": None, "datetime": None, "year": None}
+
+    if re.fullmatch(r'[+-]?\d+(\.\d+)?', term):
+        parsed["number"] = decimal.Decimal(term)
+        if parsed["number"] == parsed["number"].to_integral_value():
+            parsed["int"] = int(parsed["number"])
+
+    for fmt, key in (("%Y-%m-%d %H:%M:%S", "datetime"), ("%Y-%m-%d", "date")):
         try:
-            num_val = int(search_term)
-            is_int = True
-        except Exception:
-            try:
-                num_val = float(search_term)
-                is_float = True
-            except Exception:
-                num_val = None
-
-        # parse date (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS or YYYY)
-        for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y"):
-            try:
-                dt = datetime.datetime.strptime(search_term, fmt)
-                is_date = True
-                # normalize to YYYY-MM-DD for DATE comparisons; if format was year only, keep year
-                date_val = dt.date().isoformat() if fmt != "%Y" else dt.year
-                break
-            except Exception:
+            parsed[key] = datetime.datetime.strptime(term, fmt)
+            break
+        except ValueError:
+            continue
+    if parsed["datetime"]:
+        parsed["date"] = parsed["datetime"]
+
+    if re.fullmatch(r'\d{4}', term) and 1000 <= int(term) <= 9999:
+        parsed["year"] = int(term)
+    return parsed
+
+def _escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _enum_values(column_type):
+    return [v.replace("''", "'") for v in re.findall(r"'((?:[^']|'')*)'", column_type or "")]
+
+def _fits_integer(value, dtype, column_type):
+    bits = INTEGER_RANGES[dtype]
+    if "unsigned" in (column_type or "").lower():
+        return 0 <= value < 2 ** bits
+    return -(2 ** (bits - 1)) <= value < 2 ** (bits - 1)
+
+def compile_search_predicates(columns, search_term, skip_columns=()):
+    """
+    Turns a search term into index-friendly predicates, one per column that
+    could possibly hold it, to be OR-ed together. Returns (clauses, params).
+
+    - Text columns use a plain LIKE; the tables' case-insensitive collations
+      make LOWER() unnecessary. Terms longer than the column are skipped.
+    - ENUM columns become col IN (...) over the members containing the term.
+    - Numeric columns compare with =, only if the term is a number that fits.
+    - Dates become half-open ranges on the bare column, e.g. "2024" on a DATE
+      column -> col >= '2024-01-01' AND col < '2025-01-01', so an index on the
+      column can serve them.
+
+    columns are SchemaCatalog column dicts; skip_columns are left out (used
+    for columns already matched through a FULLTEXT index).
+    """
+    parsed = _parse_search_term(search_term)
+    term = parsed["text"]
+    clauses = []
+    params = []
+
+    for col in columns:
+        name, dtype, column_type = col["name"], col["type"], col.get("column_type")
+        if name in skip_columns:
+            continue
+        try:
+            clean_col = validate_identifier(name)
+        except ValueError:
+            continue
+
+        if dtype == 'enum':
+            members = [v for v in _enum_values(column_type) if term.lower() in v.lower()]
+            if members:
+                clauses.append(f"{clean_col} IN ({', '.join(['%s'] * len(members))})")
+                params.extend(members)
+
+        elif dtype in TEXT_TYPES:
+            if col.get("max_length") is not None and len(term) > col["max_length"]:
                 continue
+            clauses.append(f"{clean_col} LIKE %s")
+            params.append(f"%{_escape_like(term)}%")
 
-        clauses = []
-        params = []
-
-        text_types = {'char', 'varchar', 'text', 'mediumtext', 'longtext', 'enum'}
-        numeric_types = {'int', 'bigint', 'smallint', 'mediumint', 'decimal', 'float', 'double', 'tinyint'}
-        date_types = {'date', 'datetime', 'timestamp', 'year', 'time'}
-
-        for col, dtype in cols:
-            try:
-                clean_col = validate_identifier(col)
-            except ValueError:
-                continue
+        elif dtype in INTEGER_RANGES:
+            if parsed["int"] is not None and _fits_integer(parsed["int"], dtype, column_type):
+                clauses.append(f"{clean_col} = %s")
+                params.append(parsed["int"])
 
-            if dtype in text_types:
-                clauses.append(f"LOWER({clean_col}) LIKE LOWER(%s)")
-                params.append(f"%{search_term}%")
+        elif dtype in DECIMAL_TYPES:
+            if parsed["number"] is not None:
+                clauses.append(f"{clean_col} = %s")
+                params.append(parsed["number"])
 
-            if dtype in numeric_types and (is_int or is_float):
+        elif dtype == 'year':
+            if parsed["year"] is not None:
                 clauses.append(f"{clean_col} = %s")
-                params.append(num_val)
+                params.append(parsed["year"])
 
-            if dtype in date_types and is_date:
-                # If search was year-only, compare YEAR(), else DATE()
-                if isinstance(date_val, int):
-                    clauses.append(f"YEAR({clean_col}) = %s")
-                    params.append(date_val)
+        elif dtype in DATE_TYPES:
+            if parsed["datetime"] and dtype != 'date':
+                clauses.append(f"{clean_col} = %s")
+                params.append(parsed["datetime"].strftime("%Y-%m-%d %H:%M:%S"))
+            elif parsed["date"]:
+                day = parsed["date"].date()
+                if dtype == 'date':
+                    clauses.append(f"{clean_col} = %s")
+                    params.append(day.isoformat())
                 else:
-                    clauses.append(f"DATE({clean_col}) = %s")
-                    params.append(date_val)
+                    clauses.append(f"({clean_col} >= %s AND {clean_col} < %s)")
+                    params.extend([day.isoformat(), (day + datetime.timedelta(days=1)).isoformat()])
+            elif parsed["year"] is not None:
+                clauses.append(f"({clean_col} >= %s AND {clean_col} < %s)")
+                params.extend([f"{parsed['year']:04d}-01-01", f"{parsed['year'] + 1:04d}-01-01"])
 
-        if not clauses:
-            return []
+    return clauses, params
 
-        where_clause = " OR ".join(clauses)
-        sql = f"SELECT * FROM {clean_table} WHERE {where_clause}"
+def build_search_query(conn, table_name, search_term, limit=None, timeout_ms=None, mode="like", columns=None):
+    """
+    Returns (sql, params) for search_table, or None if no column of the
+    table can match the term. See search_table for the arguments; columns
+    limits the search to those column names.
+    """
+    clean_table = validate_identifier(table_name)
+    wanted = {c.lower() for c in columns} if columns else None
+    columns = [c for c in get_schema_catalog(conn).columns(clean_table)
+               if wanted is None or c["name"].lower() in wanted]
+    if not columns:
+        return None
 
-        with conn.cursor() as cursor:
-            cursor.execute(sql, tuple(params))
+    clauses = []
+    params = []
+    order_by = ""
+    ft_cols = set()
+
+    if mode == "fulltext":
+        ft_match = _fulltext_match(conn, clean_table, search_term)
+        if ft_match:
+            match_sql, query = ft_match
+            clauses.append(match_sql)
+            params.append(query)
+            order_by = f" ORDER BY {match_sql} DESC"
+            ft_cols = set(_fulltext_columns(conn, clean_table))
+
+    col_clauses, col_params = compile_search_predicates(columns, search_term, ft_cols)
+    clauses.extend(col_clauses)
+    params.extend(col_params)
+    if not clauses:
+        return None
+
+    where_clause = " OR ".join(clauses)
+    hint = f"/*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */ " if timeout_ms else ""
+    sql = f"SELECT {hint}* FROM {clean_table} WHERE {where_clause}"
+    if order_by:
+        sql += order_by
+        params.append(query)
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(int(limit))
+    return sql, tuple(params)
+
+@traced
+def search_table(conn, table_name, search_term, limit=None, timeout_ms=None, mode="like"):
+    """
+    Returns rows of table_name where any column matches search_term, using
+    the predicates from compile_search_predicates.
+    limit caps the number of rows returned; timeout_ms asks the server to
+    abort the SELECT after that many milliseconds (MAX_EXECUTION_TIME).
+
+    mode="fulltext" matches text columns through the table's FULLTEXT index
+    (see ensure_fulltext_indexes) and orders rows by relevance. Tables
+    without one, and terms with no word of FULLTEXT_MIN_TOKEN characters,
+    fall back to the LIKE search.
+    """
+    try:
+        query = build_search_query(conn, table_name, search_term, limit, timeout_ms, mode)
+        if not query:
+            return []
+
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute(*query)
             return cursor.fetchall()
 
     except (pymysql.Error, ValueError) as e:
-        print(f"Error searching table: {e}")
+        log.error(f"Error searching table: {e}")
+        return []
+
+@traced
+def explain_search(conn, table_name, search_term, mode="like", columns=None):
+    """
+    Runs EXPLAIN on the query search_table would send and returns the plan
+    rows, e.g. to confirm that a date search on ClubMatch.match_date reads
+    an index range (type 'range'/'index_merge') instead of a full scan ('ALL').
+    columns narrows the query to those columns' predicates: the full search
+    ORs in LIKE '%term%' on text columns, which no B-tree index can serve.
+    plan_check.py runs it over SEARCH_PROBES.
+    """
+    try:
+        query = build_search_query(conn, table_name, search_term, mode=mode, columns=columns)
+        if not query:
+            return []
+        sql, params = query
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute("EXPLAIN " + sql, params)
+            return cursor.fetchall()
+    except (pymysql.Error, ValueError) as e:
+        log.error(f"Error explaining search: {e}")
         return []
 
-def search_global(conn, search_term):
+def iter_search_global(conn, search_term, max_workers=None, deadline=None, row_limit=None, mode="like",
+                       cancel=None):
+    """
+    Searches every table and yields (table_name, rows) as each table finishes.
+
+    Given a ConnectionPool, the per-table searches run concurrently on up to
+    max_workers threads (default: the pool's max_size), each on its own pooled
+    connection. A raw connection cannot be shared across threads, so tables
+    are then searched one after another.
+
+    deadline is a total budget in seconds: once it passes, unfinished tables
+    are abandoned (and their SELECTs are cut off server-side) and the
+    generator stops, so callers keep whatever arrived in time.
+    row_limit caps the rows returned per table; mode is passed to search_table.
+
+    cancel is an optional threading.Event: once it is set no further table
+    is searched and the generator stops. The executor threads borrow on
+    behalf of the calling thread, so cancel_queries(<that thread's ident>)
+    kills the SELECTs already running.
+    """
+    started = time.monotonic()
     tables = get_all_tables(conn)
+
+    def remaining():
+        return None if deadline is None else deadline - (time.monotonic() - started)
+
+    def timeout_ms():
+        left = remaining()
+        return None if left is None else max(1, int(left * 1000))
+
+    if not isinstance(conn, ConnectionPool):
+        for table in tables:
+            if deadline is not None and remaining() <= 0:
+                return
+            if cancel is not None and cancel.is_set():
+                return
+            matches = search_table(conn, table, search_term, limit=row_limit, timeout_ms=timeout_ms(), mode=mode)
+            if matches:
+                yield table, matches
+        return
+
+    owner = threading.get_ident()
+
+    def search(table, limit_ms):
+        if cancel is not None and cancel.is_set():
+            return []
+        with borrowing_for(owner):
+            return search_table(conn, table, search_term, row_limit, limit_ms, mode)
+
+    workers = max(1, min(max_workers or conn.max_size, len(tables) or 1))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search_global")
+    futures = {executor.submit(search, table, timeout_ms()): table for table in tables}
+    try:
+        for future in as_completed(futures, timeout=remaining()):
+            if cancel is not None and cancel.is_set():
+                return
+            matches = future.result()
+            if matches:
+                yield futures[future], matches
+    except FuturesTimeout:
+        return
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+@traced
+def search_global(conn, search_term, parallel=False, max_workers=None, deadline=None, row_limit=None, mode="like",
+                  cancel=None):
+    """
+    Returns {table_name: rows} for every table with a match. With
+    parallel=True the tables are searched concurrently (see
+    iter_search_global); without it they are searched one by one.
+    """
+    if not parallel:
+        max_workers = 1
     results = {}
-    for table in tables:
-        matches = search_table(conn, table, search_term)
-        if matches:
-            results[table] = matches
-    return results
+    for table, matches in iter_search_global(conn, search_term, max_workers, deadline, row_limit, mode, cancel):
+        results[table] = matches
+    return dict(sorted(results.items()))
 
+@traced
 def get_recent_records(conn, table_name, pk_col=None, limit=5):
     try:
         clean_table = validate_identifier(table_name)
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             if pk_col:
                 clean_pk = validate_identifier(pk_col)
                 sql = f"SELECT * FROM {clean_table} ORDER BY {clean_pk} DESC LIMIT %s"
@@ -270,114 +1903,951 @@ def get_recent_records(conn, table_name, pk_col=None, limit=5):
             cursor.execute(sql, (limit,))
             return cursor.fetchall()
     except (pymysql.Error, ValueError) as e:
-        print(f"Error fetching recent records: {e}")
+        log.error(f"Error fetching recent records: {e}")
         return []
 
 # =============================================================================
-# UPDATE & DELETE FUNCTIONALITY (SECURE)
+# STREAMING (SERVER-SIDE CURSORS)
 # =============================================================================
+# The functions above buffer the whole result before returning it. The
+# stream/iter variants read it through an unbuffered server-side cursor and
+# yield lists of at most chunk_size rows, so memory depends on the chunk
+# size, not on the size of the result.
 
-def update_record(conn, table_name, pk_dict, updates_dict):
-    if not updates_dict or not pk_dict:
-        return False
+STREAM_CHUNK_SIZE = 500
+
+def stream_query(conn, sql, params=None, chunk_size=STREAM_CHUNK_SIZE, operation=None):
+    """
+    Yields the rows of a SELECT in lists of at most chunk_size rows.
+
+    Close the generator (or break out of the loop) to stop early. A pooled
+    connection is then closed rather than handed back, since reading the
+    rest of an unbuffered result can take as long as the query itself; a
+    raw connection or transaction has to drain the remaining rows first.
+    """
+    pooled = isinstance(conn, ConnectionPool)
+    finished = False
+    db = None
+    try:
+        if pooled:
+            db = conn.acquire()
+        with contextlib.ExitStack() as stack:
+            if db is None:
+                db = stack.enter_context(borrow_connection(conn))
+            cursor = db.cursor(TracedSSCursor)
+            try:
+                if operation and tracer.enabled and not getattr(_trace_state, "operation", None):
+                    _trace_state.operation = operation
+                    try:
+                        cursor.execute(sql, params)
+                    finally:
+                        _trace_state.operation = None
+                else:
+                    cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+                finished = True
+            finally:
+                if finished or not pooled:
+                    cursor.close()  # Drains whatever is left
+    except pymysql.Error as e:
+        log.error(f"Error streaming rows: {e}")
+    finally:
+        if pooled and db is not None:
+            conn.release(db, discard=not finished)
 
+def iter_table(conn, table_name, chunk_size=STREAM_CHUNK_SIZE):
+    """Yields every row of a table in chunks (see stream_query)."""
     try:
         clean_table = validate_identifier(table_name)
-        
-        # Validate Column Names (Identifiers)
-        clean_set_cols = [validate_identifier(col) for col in updates_dict.keys()]
-        clean_pk_cols = [validate_identifier(col) for col in pk_dict.keys()]
+    except ValueError as ve:
+        log.error(ve)
+        return
+    yield from stream_query(conn, f"SELECT * FROM {clean_table}", chunk_size=chunk_size, operation="iter_table")
 
-        # Build Query Strings
-        set_clauses = [f"{col} = %s" for col in clean_set_cols]
-        set_str = ", ".join(set_clauses)
-        
-        where_clauses = [f"{col} = %s" for col in clean_pk_cols]
-        where_str = " AND ".join(where_clauses)
+def export_table_csv(conn, table_name, path, chunk_size=STREAM_CHUNK_SIZE):
+    """Writes a whole table to a CSV file chunk by chunk. Returns the row count, or None on error."""
+    written = 0
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = None
+            for rows in iter_table(conn, table_name, chunk_size):
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+                    writer.writeheader()
+                writer.writerows(rows)
+                written += len(rows)
+    except OSError as e:
+        log.error(f"Error exporting {table_name}: {e}")
+        return None
+    return written
+
+# =============================================================================
+# FUZZY SEARCH (IN-PROCESS TRIGRAM INDEX)
+# =============================================================================
+
+def _trigrams(value):
+    """Trigrams of each word, padded like pg_trgm: "Kane" -> '  k', ' ka', 'kan', 'ane', 'ne '."""
+    grams = set()
+    for word in re.findall(r'\w+', str(value).lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class TrigramIndex:
+    """
+    Typo-tolerant search over the text columns of every table, held entirely
+    in memory so lookups never touch MySQL.
+
+    Each indexed cell (table, primary key, column, value) is split into
+    trigrams; a query is scored against a cell by the Dice coefficient of
+    their trigram sets, and each row keeps its best-scoring cell.
+
+    Build it in bulk with build(conn) or from a file with load(path), then
+    register on_write with add_write_listener so inserts, updates and deletes
+    made through db_utils keep it current. Rows removed by ON DELETE CASCADE
+    or by other clients are only dropped on the next rebuild.
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tables = {}      # table -> {"pk": [...], "text": [...]}
+        self._cells = {}       # cell_id -> (table, pk_tuple, column, value, gram_count)
+        self._rows = {}        # (table, pk_tuple) -> {column: cell_id}
+        self._postings = {}    # trigram -> set(cell_id)
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    @staticmethod
+    def indexable_columns(catalog, table_name):
+        """Text columns worth fuzzy matching: not ENUMs, and not *_id keys."""
+        return [c["name"] for c in catalog.columns(table_name)
+                if c["type"] in FULLTEXT_TYPES and not c["name"].lower().endswith("_id")]
+
+    def build(self, conn, tables=None, batch_size=5000):
+        """(Re)loads every row's indexable text columns with one SELECT per table."""
+        catalog = get_schema_catalog(conn)
+        fresh = TrigramIndex()
+        for table in tables or catalog.tables():
+            pk_cols = catalog.primary_key(table)
+            text_cols = self.indexable_columns(catalog, table)
+            if not pk_cols or not text_cols:
+                continue
+            clean_table = validate_identifier(table)
+            select_cols = [validate_identifier(c) for c in pk_cols + text_cols]
+            fresh._tables[clean_table] = {"pk": pk_cols, "text": text_cols}
+            with borrow_connection(conn) as db, db.cursor() as cursor:
+                cursor.execute(f"SELECT {', '.join(select_cols)} FROM {clean_table}")
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        fresh._add_row_locked(clean_table, row)
+
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+        return self
+
+    def _pk_tuple(self, table_name, values):
+        return tuple(str(values.get(c)) for c in self._tables[table_name]["pk"])
+
+    def _add_cell_locked(self, table_name, pk, column, value):
+        grams = _trigrams(value)
+        if not grams:
+            return
+        cell_id = self._next_id
+        self._next_id += 1
+        self._cells[cell_id] = (table_name, pk, column, str(value), len(grams))
+        self._rows.setdefault((table_name, pk), {})[column] = cell_id
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(cell_id)
+
+    def _remove_cell_locked(self, cell_id):
+        table_name, pk, column, value, _ = self._cells.pop(cell_id)
+        for gram in _trigrams(value):
+            bucket = self._postings.get(gram)
+            if bucket is not None:
+                bucket.discard(cell_id)
+                if not bucket:
+                    del self._postings[gram]
+
+    def _add_row_locked(self, table_name, row):
+        pk = self._pk_tuple(table_name, row)
+        for column in self._tables[table_name]["text"]:
+            if row.get(column) is not None:
+                self._add_cell_locked(table_name, pk, column, row[column])
+
+    def _remove_row_locked(self, table_name, pk):
+        cells = self._rows.pop((table_name, pk), {})
+        for cell_id in cells.values():
+            self._remove_cell_locked(cell_id)
+
+    def on_write(self, table_name, operation, pk_dict, values):
+        """Write listener: applies one db_utils insert/update/delete to the index."""
+        with self._lock:
+            if table_name not in self._tables:
+                return
+            config = self._tables[table_name]
+            if operation == "insert":
+                self._remove_row_locked(table_name, self._pk_tuple(table_name, values))
+                self._add_row_locked(table_name, values)
+            elif operation == "delete":
+                self._remove_row_locked(table_name, self._pk_tuple(table_name, pk_dict))
+            elif operation == "update":
+                old_pk = self._pk_tuple(table_name, pk_dict)
+                new_pk = self._pk_tuple(table_name, {**pk_dict, **{k: v for k, v in values.items() if k in config["pk"]}})
+                current = {}
+                for column, cell_id in self._rows.get((table_name, old_pk), {}).items():
+                    current[column] = self._cells[cell_id][3]
+                for column in config["text"]:
+                    if column in values:
+                        current[column] = values[column]
+                self._remove_row_locked(table_name, old_pk)
+                for column, value in current.items():
+                    if value is not None:
+                        self._add_cell_locked(table_name, new_pk, column, value)
+
+    def search(self, term, limit=50, min_score=0.3, tables=None):
+        """
+        Returns up to limit matches, best first, as dicts:
+        {"table", "pk": {col: value}, "column", "value", "score"}.
+        """
+        query = _trigrams(term)
+        if not query:
+            return []
+        with self._lock:
+            shared = {}
+            for gram in query:
+                for cell_id in self._postings.get(gram, ()):
+                    shared[cell_id] = shared.get(cell_id, 0) + 1
+
+            best = {}
+            for cell_id, count in shared.items():
+                table_name, pk, column, value, gram_count = self._cells[cell_id]
+                if tables and table_name not in tables:
+                    continue
+                score = 2.0 * count / (len(query) + gram_count)
+                if score < min_score:
+                    continue
+                key = (table_name, pk)
+                if key not in best or score > best[key][0]:
+                    best[key] = (score, column, value)
+
+            ranked = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+            return [
+                {
+                    "table": table_name,
+                    "pk": dict(zip(self._tables[table_name]["pk"], pk)),
+                    "column": column,
+                    "value": value,
+                    "score": round(score, 3),
+                }
+                for (table_name, pk), (score, column, value) in ranked
+            ]
+
+    def save(self, path):
+        """Writes a gzip'd JSON snapshot; trigrams are recomputed on load."""
+        with self._lock:
+            rows = {}
+            for (table_name, pk), cells in self._rows.items():
+                rows.setdefault(table_name, []).append(
+                    [list(pk), {column: self._cells[cell_id][3] for column, cell_id in cells.items()}]
+                )
+            snapshot = {"version": self.SNAPSHOT_VERSION, "tables": self._tables, "rows": rows}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+
+    def load(self, path):
+        """Replaces the index contents with a snapshot written by save()."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") != self.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported trigram snapshot version: {snapshot.get('version')}")
+
+        fresh = TrigramIndex()
+        fresh._tables = snapshot["tables"]
+        for table_name, table_rows in snapshot["rows"].items():
+            for pk, cells in table_rows:
+                for column, value in cells.items():
+                    fresh._add_cell_locked(table_name, tuple(pk), column, value)
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+        return self
+
+# =============================================================================
+# STATEMENT REGISTRY
+# =============================================================================
+# The generic write paths used to validate identifiers and rebuild their SQL
+# on every call. The registry builds each template once per
+# (operation, table, columns) key and serves it from memory afterwards.
+# pymysql only speaks MySQL's text protocol, so there is no driver-level
+# prepared statement to reuse; parameters are still sent with each call.
+
+STATEMENT_CACHE_SIZE = 512
+
+class StatementRegistry:
+    """LRU cache of SQL templates with hit/miss counters."""
+
+    def __init__(self, max_size=STATEMENT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> [sql, uses]
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """
+        Returns the SQL for key, calling build() on a miss. build validates
+        the identifiers, so a template is only ever cached once it is safe;
+        if it raises ValueError nothing is stored.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry[1] += 1
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        sql = build()
+        with self._lock:
+            self._entries[key] = [sql, 1]
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return sql
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries),
+                    "max_size": self.max_size}
+
+    def statements(self):
+        """[(key, sql, uses)] for every cached template, most used first."""
+        with self._lock:
+            entries = [(key, sql, uses) for key, (sql, uses) in self._entries.items()]
+        return sorted(entries, key=lambda e: e[2], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+statements = StatementRegistry()
+
+def statement_stats():
+    return statements.stats()
+
+def _insert_sql(table_name, columns):
+    def build():
+        clean_table = validate_identifier(table_name)
+        clean_cols = [validate_identifier(col) for col in columns]
+        placeholders = ", ".join(["%s"] * len(clean_cols))
+        return f"INSERT INTO {clean_table} ({', '.join(clean_cols)}) VALUES ({placeholders})"
+    return statements.get(("insert", table_name, columns), build)
+
+def _update_sql(table_name, set_columns, pk_columns):
+    def build():
+        clean_table = validate_identifier(table_name)
+        set_str = ", ".join(f"{validate_identifier(col)} = %s" for col in set_columns)
+        where_str = " AND ".join(f"{validate_identifier(col)} = %s" for col in pk_columns)
+        return f"UPDATE {clean_table} SET {set_str} WHERE {where_str}"
+    return statements.get(("update", table_name, set_columns, pk_columns), build)
+
+def _delete_sql(table_name, pk_columns):
+    def build():
+        clean_table = validate_identifier(table_name)
+        where_str = " AND ".join(f"{validate_identifier(col)} = %s" for col in pk_columns)
+        return f"DELETE FROM {clean_table} WHERE {where_str}"
+    return statements.get(("delete", table_name, pk_columns), build)
+
+# =============================================================================
+# INSERT, UPDATE & DELETE FUNCTIONALITY (SECURE)
+# =============================================================================
+
+# Callbacks run after every successful write made through db_utils, as
+# callback(table_name, operation, pk_dict, values) with operation one of
+# "insert", "update", "delete". values holds the inserted row or the
+# updated columns (None for deletes).
+_write_listeners = []
+
+def add_write_listener(callback):
+    if callback not in _write_listeners:
+        _write_listeners.append(callback)
+
+def remove_write_listener(callback):
+    if callback in _write_listeners:
+        _write_listeners.remove(callback)
+
+def _notify_write(conn, table_name, operation, pk_dict, values=None):
+    """Tells the listeners about a write, once it is committed."""
+    if isinstance(conn, Transaction):
+        conn._pending.append((table_name, operation, pk_dict, values))
+    else:
+        _deliver_write(table_name, operation, pk_dict, values)
+
+def _deliver_write(table_name, operation, pk_dict, values=None):
+    for callback in list(_write_listeners):
+        try:
+            callback(table_name, operation, dict(pk_dict or {}), values)
+        except Exception as e:
+            log.error(f"Write listener error: {e}")
+
+@traced
+def insert_record(conn, table_name, data):
+    """Inserts one row from a {column: value} dict."""
+    if not data:
+        return False
+
+    try:
+        sql = _insert_sql(table_name, tuple(data.keys()))
 
-        sql = f"UPDATE {clean_table} SET {set_str} WHERE {where_str}"
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute(sql, tuple(data.values()))
+        _notify_write(conn, table_name, "insert", None, dict(data))
+        return True
+
+    except (pymysql.Error, ValueError) as e:
+        log.error(f"Error inserting record: {e}")
+        return False
+
+@traced
+def update_record(conn, table_name, pk_dict, updates_dict):
+    if not updates_dict or not pk_dict:
+        return False
+
+    try:
+        # Identifiers are validated when the template is first built
+        sql = _update_sql(table_name, tuple(updates_dict.keys()), tuple(pk_dict.keys()))
         
         # Combine Values into Tuple
         params = tuple(list(updates_dict.values()) + list(pk_dict.values()))
         
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, params)
-            return True # Return True even if 0 rows updated (query succeeded)
+        _notify_write(conn, table_name, "update", pk_dict, dict(updates_dict))
+        return True # Return True even if 0 rows updated (query succeeded)
             
     except (pymysql.Error, ValueError) as e:
-        print(f"Error updating record: {e}")
+        log.error(f"Error updating record: {e}")
         return False
 
+@traced
 def delete_record(conn, table_name, pk_dict):
     if not pk_dict:
         return False
 
     try:
-        clean_table = validate_identifier(table_name)
-        clean_pk_cols = [validate_identifier(col) for col in pk_dict.keys()]
-
-        where_clauses = [f"{col} = %s" for col in clean_pk_cols]
-        where_str = " AND ".join(where_clauses)
-        
-        sql = f"DELETE FROM {clean_table} WHERE {where_str}"
+        sql = _delete_sql(table_name, tuple(pk_dict.keys()))
         params = tuple(pk_dict.values())
         
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, params)
-            return True
+        _notify_write(conn, table_name, "delete", pk_dict)
+        _after_parent_delete(conn, table_name)
+        return True
             
     except pymysql.Error as e:
         if e.args[0] == 1451:
-            print("Cannot delete: This record is referenced by other tables.")
+            log.error("Cannot delete: This record is referenced by other tables.")
         else:
-            print(f"Error deleting record: {e}")
+            log.error(f"Error deleting record: {e}")
         return False
     except ValueError as ve:
-        print(ve)
+        log.error(ve)
+        return False
+
+# --- Bulk writes ---
+# insert_many / update_many / delete_many batch rows into multi-row
+# statements, each chunk kept under max_allowed_packet and committed in its
+# own transaction (a savepoint when called with a Transaction). If a chunk
+# fails it is rolled back and replayed row by row, so one bad row is
+# reported without losing its neighbours. They all
+# return {"written": n, "errors": [{"index": i, "row": row, "error": msg}]}
+# where index is the row's position in the input.
+
+BULK_MAX_ROWS = 5000
+BULK_PACKET_FRACTION = 0.9   # leave headroom under max_allowed_packet
+
+_packet_sizes = {}
+
+def _bulk_budget(conn, db):
+    """Largest statement (in bytes) a bulk write should send."""
+    key = _catalog_key(conn)
+    size = _packet_sizes.get(key)
+    if size is None:
+        with db.cursor() as cursor:
+            cursor.execute("SELECT @@max_allowed_packet AS max_packet")
+            size = _packet_sizes[key] = int(cursor.fetchone()["max_packet"])
+    return int(size * BULK_PACKET_FRACTION)
+
+def _bulk_chunks(entries, budget, row_overhead):
+    """Splits (index, literals, row) entries into chunks that fit the budget."""
+    chunk, size = [], 0
+    for entry in entries:
+        length = sum(len(lit) for lit in entry[1]) + row_overhead
+        if chunk and (size + length > budget or len(chunk) >= BULK_MAX_ROWS):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(entry)
+        size += length
+    if chunk:
+        yield chunk
+
+def _bulk_entries(db, members, *parts):
+    # db.escape is the same client-side escaping pymysql applies to %s
+    # parameters; doing it here lets us size each chunk exactly.
+    return [(i, [db.escape(v) for part in parts for v in part(row)], row) for i, row in members]
+
+def _bulk_execute(conn, db, chunks, build_sql, result, done, on_written, describe_error):
+    for chunk in chunks:
+        try:
+            with _atomic(conn, db), db.cursor() as cursor:
+                cursor.execute(build_sql(chunk))
+            written = chunk
+        except pymysql.Error as e:
+            if isinstance(conn, Transaction) and _is_retryable(e):
+                raise  # The whole transaction is gone
+            written = []
+            for entry in chunk:
+                try:
+                    with db.cursor() as cursor:
+                        cursor.execute(build_sql([entry]))
+                    written.append(entry)
+                except pymysql.Error as e:
+                    if isinstance(conn, Transaction) and _is_retryable(e):
+                        raise
+                    result["errors"].append({"index": entry[0], "row": entry[2], "error": describe_error(e)})
+        done.update(entry[0] for entry in chunk)
+        result["written"] += len(written)
+        for entry in written:
+            on_written(entry[2])
+
+def _bulk_groups(rows, signature):
+    """Groups (index, row) by column layout, since one statement needs one column list."""
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(signature(row), []).append((i, row))
+    return groups
+
+def _bulk_reject(result, done, members, error):
+    for i, row in members:
+        if i not in done:
+            done.add(i)
+            result["errors"].append({"index": i, "row": row, "error": str(error)})
+
+@traced
+def insert_many(conn, table_name, rows):
+    """Inserts a list of {column: value} dicts with multi-row INSERT statements."""
+    result, done = {"written": 0, "errors": []}, set()
+    if not rows:
+        return result
+    try:
+        clean_table = validate_identifier(table_name)
+    except ValueError as ve:
+        _bulk_reject(result, done, enumerate(rows), ve)
+        return result
+
+    try:
+        with borrow_connection(conn) as db:
+            budget = _bulk_budget(conn, db)
+            for cols, members in _bulk_groups(rows, lambda r: tuple(r.keys())).items():
+                try:
+                    head = f"INSERT INTO {clean_table} ({', '.join(validate_identifier(c) for c in cols)}) VALUES "
+                except ValueError as ve:
+                    _bulk_reject(result, done, members, ve)
+                    continue
+                entries = _bulk_entries(db, members, lambda r: r.values())
+                _bulk_execute(
+                    conn, db, _bulk_chunks(entries, budget - len(head), 4),
+                    lambda chunk: head + ", ".join(f"({', '.join(e[1])})" for e in chunk),
+                    result, done,
+                    lambda row: _notify_write(conn, clean_table, "insert", None, dict(row)),
+                    str)
+    except pymysql.Error as e:
+        log.error(f"Error inserting records: {e}")
+        _bulk_reject(result, done, enumerate(rows), e)
+    return result
+
+@traced
+def update_many(conn, table_name, changes):
+    """
+    Applies a list of (pk_dict, updates_dict) pairs. Each chunk is one
+    UPDATE joined against a derived table of the new values.
+    """
+    result, done = {"written": 0, "errors": []}, set()
+    if not changes:
+        return result
+    try:
+        clean_table = validate_identifier(table_name)
+    except ValueError as ve:
+        _bulk_reject(result, done, enumerate(changes), ve)
+        return result
+
+    try:
+        with borrow_connection(conn) as db:
+            budget = _bulk_budget(conn, db)
+            layouts = _bulk_groups(changes, lambda c: (tuple(c[0].keys()), tuple(c[1].keys())))
+            for (pk_cols, set_cols), members in layouts.items():
+                try:
+                    clean_pk = [validate_identifier(c) for c in pk_cols]
+                    clean_set = [validate_identifier(c) for c in set_cols]
+                    if not clean_pk or not clean_set:
+                        raise ValueError("update_many needs primary key values and columns to update")
+                except ValueError as ve:
+                    _bulk_reject(result, done, members, ve)
+                    continue
+                # Derived-table columns are aliased k0.. / v0.. so a column
+                # may appear both in the key and in the SET list.
+                aliases = [f"k{n}" for n in range(len(clean_pk))] + [f"v{n}" for n in range(len(clean_set))]
+                on = " AND ".join(f"t.{col} = u.k{n}" for n, col in enumerate(clean_pk))
+                set_str = ", ".join(f"t.{col} = u.v{n}" for n, col in enumerate(clean_set))
+
+                def build_sql(chunk, aliases=aliases, on=on, set_str=set_str):
+                    first, rest = chunk[0], chunk[1:]
+                    selects = ["SELECT " + ", ".join(f"{lit} AS {a}" for lit, a in zip(first[1], aliases))]
+                    selects += ["SELECT " + ", ".join(e[1]) for e in rest]
+                    return (f"UPDATE {clean_table} AS t JOIN ({' UNION ALL '.join(selects)}) AS u "
+                            f"ON {on} SET {set_str}")
+
+                entries = _bulk_entries(db, members, lambda c: c[0].values(), lambda c: c[1].values())
+                _bulk_execute(
+                    conn, db, _bulk_chunks(entries, budget - 200, 20 + 2 * len(aliases)),
+                    build_sql, result, done,
+                    lambda change: _notify_write(conn, clean_table, "update", change[0], dict(change[1])),
+                    str)
+    except pymysql.Error as e:
+        log.error(f"Error updating records: {e}")
+        _bulk_reject(result, done, enumerate(changes), e)
+    return result
+
+@traced
+def delete_many(conn, table_name, pk_dicts):
+    """Deletes a list of primary-key dicts with chunked DELETE ... WHERE pk IN (...)."""
+    result, done = {"written": 0, "errors": []}, set()
+    if not pk_dicts:
+        return result
+    try:
+        clean_table = validate_identifier(table_name)
+    except ValueError as ve:
+        _bulk_reject(result, done, enumerate(pk_dicts), ve)
+        return result
+
+    def describe_error(e):
+        if e.args[0] == 1451:
+            return "Cannot delete: This record is referenced by other tables."
+        return str(e)
+
+    try:
+        with borrow_connection(conn) as db:
+            budget = _bulk_budget(conn, db)
+            for pk_cols, members in _bulk_groups(pk_dicts, lambda r: tuple(r.keys())).items():
+                try:
+                    clean_pk = [validate_identifier(c) for c in pk_cols]
+                    if not clean_pk:
+                        raise ValueError("delete_many needs primary key values")
+                except ValueError as ve:
+                    _bulk_reject(result, done, members, ve)
+                    continue
+                if len(clean_pk) == 1:
+                    head = f"DELETE FROM {clean_table} WHERE {clean_pk[0]} IN "
+                else:
+                    head = f"DELETE FROM {clean_table} WHERE ({', '.join(clean_pk)}) IN "
+
+                def build_sql(chunk, head=head, single=len(clean_pk) == 1):
+                    if single:
+                        return head + "(" + ", ".join(e[1][0] for e in chunk) + ")"
+                    return head + "(" + ", ".join(f"({', '.join(e[1])})" for e in chunk) + ")"
+
+                entries = _bulk_entries(db, members, lambda r: r.values())
+                _bulk_execute(
+                    conn, db, _bulk_chunks(entries, budget - len(head), 4 + 2 * len(clean_pk)),
+                    build_sql, result, done,
+                    lambda pk: _notify_write(conn, clean_table, "delete", pk),
+                    describe_error)
+            if result["written"]:
+                _after_parent_delete(conn, clean_table)
+    except pymysql.Error as e:
+        log.error(f"Error deleting records: {e}")
+        _bulk_reject(result, done, enumerate(pk_dicts), e)
+    return result
+
+# =============================================================================
+# QUERY RESULT CACHE
+# =============================================================================
+# Reports and library queries are wrapped with @cached_query(<tables read>).
+# Results are cached per (function, database, arguments) together with the
+# version of every table they read. Each write made through db_utils bumps
+# its table's version (via the write listeners), so an entry is served only
+# while nothing it depends on has changed. Deletes and primary-key updates
+# can cascade through foreign keys, so they invalidate everything.
+# Writes made outside this process are not seen; RESULT_CACHE_MAX_AGE bounds
+# how stale such results can get, and invalidate_query_cache() resets it all
+# (e.g. after a bulk load with pop_gen).
+
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_MAX_ROWS = 50000
+RESULT_CACHE_MAX_AGE = 300.0  # seconds
+
+class QueryCache:
+    """Size-bounded LRU of query results, validated by table versions."""
+
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, max_rows=RESULT_CACHE_MAX_ROWS,
+                 max_age=RESULT_CACHE_MAX_AGE):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()  # key -> (rows, versions, epoch, stored_at)
+        self._rows = 0
+        self._versions = {}            # lower-case table name -> int
+        self._epoch = 0                # bumped when everything is invalidated
+        self._lock = threading.Lock()
+
+    def snapshot(self, tables):
+        with self._lock:
+            return tuple(self._versions.get(t, 0) for t in tables), self._epoch
+
+    def get(self, key, tables):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                rows, versions, epoch, stored_at = entry
+                current = tuple(self._versions.get(t, 0) for t in tables)
+                fresh = self.max_age is None or time.monotonic() - stored_at < self.max_age
+                if versions == current and epoch == self._epoch and fresh:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return rows
+                self._drop_locked(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, rows, snapshot):
+        """Stores rows read at `snapshot` (taken before the query ran)."""
+        if len(rows) > self.max_rows:
+            return
+        versions, epoch = snapshot
+        with self._lock:
+            self._drop_locked(key)
+            self._entries[key] = (rows, versions, epoch, time.monotonic())
+            self._rows += len(rows)
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                self._drop_locked(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= len(entry[0])
+
+    def bump(self, table_name):
+        with self._lock:
+            name = table_name.lower()
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def invalidate(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "rows": self._rows}
+
+    def on_write(self, table_name, operation, pk_dict, values):
+        """Write listener: bumps the table, or everything if the write may cascade."""
+        if operation == "delete" or (operation == "update" and set(values or ()) & set(pk_dict or ())):
+            self.invalidate()
+        else:
+            self.bump(table_name)
+
+
+query_cache = QueryCache()
+add_write_listener(query_cache.on_write)
+
+def invalidate_query_cache():
+    query_cache.invalidate()
+
+def _copy_rows(rows):
+    return rows.copy() if isinstance(rows, ResultSet) else list(rows)
+
+def cached_query(*tables):
+    """
+    Decorator for read-only db_utils functions of the form f(conn, ...) that
+    only read `tables`. Empty results are not cached (failures also come back
+    as []), and calls made inside a Transaction bypass the cache since they
+    may see uncommitted writes. Every call, hit or miss, gets its own copy of
+    the cached list, so callers may sort or extend it; the rows themselves
+    are shared.
+    """
+    deps = tuple(t.lower() for t in tables)
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(conn, *args, **kwargs):
+            if isinstance(conn, Transaction):
+                return func(conn, *args, **kwargs)
+            key = (func.__name__, _catalog_key(conn), args, tuple(sorted(kwargs.items())))
+            rows = query_cache.get(key, deps)
+            if rows is not None:
+                return _copy_rows(rows)
+            snapshot = query_cache.snapshot(deps)
+            rows = func(conn, *args, **kwargs)
+            if rows:
+                query_cache.put(key, rows, snapshot)
+                return _copy_rows(rows)
+            return rows
+        wrapper.tables = tables
+        return wrapper
+    return decorate
+
+# =============================================================================
+# MANAGER STATISTICS (SUMMARY TABLES)
+# =============================================================================
+# Migration 001 adds ManagerStats, ManagerHeadToHead and ClubMatchSummary,
+# kept current by triggers on TournamentMatch/ClubMatch. The win reports
+# read them when present and fall back to aggregating match history.
+
+# Deleting these cascades into ClubMatch rows (League -> City -> Club ->
+# ClubMatch) without firing any trigger. LeagueSeason only cascades into
+# ClubSeasonRegistry and PlayerStatistics; Tournament.season_id is SET NULL.
+STATS_CASCADE_PARENTS = {"League", "City"}
+
+_REBUILD_STATS_SQL = [
+    "DELETE FROM ManagerHeadToHead",
+    "DELETE FROM ManagerStats",
+    "DELETE FROM ClubMatchSummary",
+    """
+    INSERT INTO ManagerStats (manager_id, wins, matches_played)
+    SELECT manager_id, SUM(win_flag), COUNT(*)
+    FROM (
+        SELECT manager1_id AS manager_id, (winner_id <=> manager1_id) AS win_flag FROM TournamentMatch
+        UNION ALL
+        SELECT manager2_id AS manager_id, (winner_id <=> manager2_id) AS win_flag FROM TournamentMatch
+    ) s
+    WHERE manager_id IS NOT NULL
+    GROUP BY manager_id
+    """,
+    """
+    INSERT INTO ManagerHeadToHead (manager_id, opponent_id, wins, matches_played)
+    SELECT manager_id, opponent_id, SUM(win_flag), COUNT(*)
+    FROM (
+        SELECT manager1_id AS manager_id, manager2_id AS opponent_id,
+               (winner_id <=> manager1_id) AS win_flag FROM TournamentMatch
+        UNION ALL
+        SELECT manager2_id, manager1_id, (winner_id <=> manager2_id) FROM TournamentMatch
+    ) s
+    WHERE manager_id IS NOT NULL AND opponent_id IS NOT NULL
+    GROUP BY manager_id, opponent_id
+    """,
+    """
+    INSERT INTO ClubMatchSummary (home_club_id, home_manager_id, away_manager_id,
+                                  matches_played, home_wins, away_wins)
+    SELECT home_club_id, home_manager_id, away_manager_id,
+           COUNT(*), SUM(result = 'Home Win'), SUM(result = 'Away Win')
+    FROM ClubMatch
+    WHERE home_club_id IS NOT NULL AND home_manager_id IS NOT NULL AND away_manager_id IS NOT NULL
+    GROUP BY home_club_id, home_manager_id, away_manager_id
+    """,
+]
+
+def manager_stats_ready(conn):
+    """True once migration 001 has created the summary tables."""
+    try:
+        return get_schema_catalog(conn).has_table("ManagerStats")
+    except pymysql.Error:
         return False
 
+@traced
+def rebuild_manager_stats(conn):
+    """Recomputes the summary tables from the match tables in one transaction (repair)."""
+    def rebuild(tx):
+        with borrow_connection(tx) as db, db.cursor() as cursor:
+            for sql in _REBUILD_STATS_SQL:
+                cursor.execute(sql)
+    try:
+        run_in_transaction(conn, rebuild)
+        query_cache.invalidate()
+        return True
+    except pymysql.Error as e:
+        log.error(f"Error rebuilding manager stats: {e}")
+        return False
+
+def _after_parent_delete(conn, table_name):
+    if table_name in STATS_CASCADE_PARENTS and manager_stats_ready(conn):
+        rebuild_manager_stats(conn)
+
 # =============================================================================
 # COMPLEX RELATIONSHIP QUERIES (Static SQL is safe)
 # =============================================================================
 
+@cached_query("League", "LeagueSeason", "Tournament", "City", "Club")
+@traced
 def get_league_management_report(conn):
-    sql = """
-        SELECT L.league_name, LS.theme, T.tournament_name, C.club_name
-        FROM League L
-        JOIN LeagueSeason LS ON L.league_id = LS.league_id
-        JOIN Tournament T ON LS.season_id = T.season_id
-        JOIN City CT ON T.city_id = CT.city_id 
-        JOIN Club C ON CT.city_id = C.city_id
-        ORDER BY L.league_name, LS.year;
-    """
     try:
-        with conn.cursor() as cursor:
-            cursor.execute(sql)
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute(_LEAGUE_MANAGEMENT_SQL)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
+_LEAGUE_MANAGEMENT_SQL = """
+    SELECT L.league_name, LS.theme, T.tournament_name, C.club_name
+    FROM League L
+    JOIN LeagueSeason LS ON L.league_id = LS.league_id
+    JOIN Tournament T ON LS.season_id = T.season_id
+    JOIN City CT ON T.city_id = CT.city_id
+    JOIN Club C ON CT.city_id = C.city_id
+    ORDER BY L.league_name, LS.year
+"""
+
+def iter_league_management_report(conn, chunk_size=STREAM_CHUNK_SIZE):
+    """get_league_management_report in chunks, without holding the whole fan-out."""
+    return stream_query(conn, _LEAGUE_MANAGEMENT_SQL, chunk_size=chunk_size,
+                        operation="iter_league_management_report")
+
+@cached_query("ClubSeasonRegistry", "LeagueSeason", "Club", "ClubManager", "Manager", "City", "League")
+@traced
 def get_club_assignments_report(conn):
-    sql = """
-        SELECT LS.year, LS.theme, L.league_name, C.club_name, M.name
-        FROM ClubSeasonRegistry CSR
-        JOIN LeagueSeason LS ON CSR.season_id = LS.season_id
-        JOIN Club C ON CSR.club_id = C.club_id
-        JOIN ClubManager CM ON CSR.manager_id = CM.manager_id
-        JOIN Manager M ON CM.manager_id = M.manager_id
-        JOIN City CT ON C.city_id = CT.city_id
-        JOIN League L ON CT.league_id = L.league_id
-        ORDER BY LS.year DESC, L.league_name;
-    """
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute(sql)
+    try:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
+            cursor.execute(_CLUB_ASSIGNMENTS_SQL)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
+_CLUB_ASSIGNMENTS_SQL = """
+    SELECT LS.year, LS.theme, L.league_name, C.club_name, M.name
+    FROM ClubSeasonRegistry CSR
+    JOIN LeagueSeason LS ON CSR.season_id = LS.season_id
+    JOIN Club C ON CSR.club_id = C.club_id
+    JOIN ClubManager CM ON CSR.manager_id = CM.manager_id
+    JOIN Manager M ON CM.manager_id = M.manager_id
+    JOIN City CT ON C.city_id = CT.city_id
+    JOIN League L ON CT.league_id = L.league_id
+    ORDER BY LS.year DESC, L.league_name
+"""
+
+def iter_club_assignments_report(conn, chunk_size=STREAM_CHUNK_SIZE):
+    """get_club_assignments_report in chunks (see stream_query)."""
+    return stream_query(conn, _CLUB_ASSIGNMENTS_SQL, chunk_size=chunk_size,
+                        operation="iter_club_assignments_report")
+
+@cached_query("Player", "PlayerArchetype", "PlayerArchetypeSkill", "Skill")
+@traced
 def get_player_skills_report(conn):
     sql = """
         SELECT P.player_name, A.archetype_name, S.skill_name, S.effect_description
@@ -388,49 +2858,79 @@ def get_player_skills_report(conn):
         LIMIT 50;
     """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
+@cached_query("ClubMatch", "Club", "ClubManager", "Manager", "Player", "PlayerArchetype", "Position")
+@traced
 def get_manager_performance_sheet(conn, limit=15):
-    sql = """
-        SELECT 
-            C.club_name,
-            CM.manager_id,
-            M.manager_id AS opponent_manager_id,
-            M.name AS opponent_name,
-            COUNT(CH.match_id) AS matches_played,
-            SUM(CASE WHEN CH.result = 'Home Win' THEN 1 ELSE 0 END) AS home_wins,
-            SUM(CASE WHEN CH.result = 'Away Win' THEN 1 ELSE 0 END) AS away_wins,
-            ROUND(
-                SUM(CASE WHEN CH.result = 'Home Win' THEN 1 ELSE 0 END) / NULLIF(COUNT(CH.match_id), 0),
-                2
-            ) AS win_rate,
-            GROUP_CONCAT(DISTINCT CONCAT(A.archetype_name, ' (', COALESCE(POS.position_name, 'Unknown'), ')')
-                         ORDER BY A.archetype_name SEPARATOR ', ') AS signature_players
-        FROM ClubMatch CH
-        JOIN Club C ON CH.home_club_id = C.club_id
-        JOIN ClubManager CM ON CH.home_manager_id = CM.manager_id
-        JOIN Manager M ON CH.away_manager_id = M.manager_id
-        LEFT JOIN Player P ON P.manager_id = M.manager_id
-        LEFT JOIN PlayerArchetype A ON P.archetype_id = A.archetype_id
-        LEFT JOIN Position POS ON A.primary_position_id = POS.position_id
-        GROUP BY C.club_name, CM.manager_id, M.manager_id, M.name
-        ORDER BY matches_played DESC, win_rate DESC
-        LIMIT %s;
-    """
+    # Both paths pick the top pairs first, then build the signature list
+    # only for those opponents, with the same joins, so they return the
+    # same rows whether or not migration 001 is applied.
+    if manager_stats_ready(conn):
+        pairs = """
+                SELECT
+                    C.club_name,
+                    CM.manager_id,
+                    M.manager_id AS opponent_manager_id,
+                    M.name AS opponent_name,
+                    SUM(S.matches_played) AS matches_played,
+                    SUM(S.home_wins) AS home_wins,
+                    SUM(S.away_wins) AS away_wins,
+                    ROUND(SUM(S.home_wins) / NULLIF(SUM(S.matches_played), 0), 2) AS win_rate
+                FROM ClubMatchSummary S
+                JOIN Club C ON S.home_club_id = C.club_id
+                JOIN ClubManager CM ON S.home_manager_id = CM.manager_id
+                JOIN Manager M ON S.away_manager_id = M.manager_id
+                WHERE S.matches_played > 0
+                GROUP BY C.club_name, CM.manager_id, M.manager_id, M.name"""
+    else:
+        pairs = """
+                SELECT
+                    C.club_name,
+                    CM.manager_id,
+                    M.manager_id AS opponent_manager_id,
+                    M.name AS opponent_name,
+                    COUNT(*) AS matches_played,
+                    SUM(CH.result = 'Home Win') AS home_wins,
+                    SUM(CH.result = 'Away Win') AS away_wins,
+                    ROUND(SUM(CH.result = 'Home Win') / NULLIF(COUNT(*), 0), 2) AS win_rate
+                FROM ClubMatch CH
+                JOIN Club C ON CH.home_club_id = C.club_id
+                JOIN ClubManager CM ON CH.home_manager_id = CM.manager_id
+                JOIN Manager M ON CH.away_manager_id = M.manager_id
+                GROUP BY C.club_name, CM.manager_id, M.manager_id, M.name"""
+    sql = f"""
+            WITH top_pairs AS ({pairs}
+                ORDER BY matches_played DESC, win_rate DESC, club_name, manager_id, opponent_manager_id
+                LIMIT %s
+            )
+            SELECT
+                TP.*,
+                (SELECT GROUP_CONCAT(DISTINCT CONCAT(A.archetype_name, ' (', COALESCE(POS.position_name, 'Unknown'), ')')
+                                     ORDER BY A.archetype_name SEPARATOR ', ')
+                 FROM Player P
+                 JOIN PlayerArchetype A ON P.archetype_id = A.archetype_id
+                 LEFT JOIN Position POS ON A.primary_position_id = POS.position_id
+                 WHERE P.manager_id = TP.opponent_manager_id) AS signature_players
+            FROM top_pairs TP
+            ORDER BY matches_played DESC, win_rate DESC, club_name, manager_id, opponent_manager_id;
+        """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute("SET SESSION group_concat_max_len = 4096")
             cursor.execute(sql, (limit,))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
+# Not cached: the result depends on CURDATE(), not just on the tables.
+@traced
 def get_tournament_snapshot(conn):
     sql = """
         WITH archetype_usage AS (
@@ -454,60 +2954,86 @@ def get_tournament_snapshot(conn):
         ORDER BY start_date, rank_in_tournament;
     """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
+@cached_query("TournamentMatch", "TournamentEntry", "Manager")
+@traced
 def get_underrated_manager_report(conn):
-    sql = """
-        WITH match_stats AS (
-            SELECT manager_id,
-                   SUM(win_flag) AS wins,
-                   COUNT(*) AS matches_played
+    if manager_stats_ready(conn):
+        sql = """
+            SELECT *
             FROM (
-                SELECT manager1_id AS manager_id,
-                       CASE WHEN winner_id = manager1_id THEN 1 ELSE 0 END AS win_flag
-                FROM TournamentMatch
-                UNION ALL
-                SELECT manager2_id AS manager_id,
-                       CASE WHEN winner_id = manager2_id THEN 1 ELSE 0 END AS win_flag
-                FROM TournamentMatch
-            ) s
-            WHERE manager_id IS NOT NULL
-            GROUP BY manager_id
-        ),
-        tour_counts AS (
-            SELECT manager_id, COUNT(*) AS tournaments_entered
-            FROM TournamentEntry
-            GROUP BY manager_id
-        )
-        SELECT 
-            M.manager_id,
-            M.name,
-            COALESCE(MS.wins, 0) AS wins,
-            COALESCE(MS.matches_played, 0) AS matches_played,
-            COALESCE(TC.tournaments_entered, 0) AS tournaments_entered,
-            ROUND(COALESCE(MS.wins, 0) / NULLIF(COALESCE(MS.matches_played, 0), 0), 3) AS win_ratio
-        FROM Manager M
-        LEFT JOIN match_stats MS ON M.manager_id = MS.manager_id
-        LEFT JOIN tour_counts TC ON M.manager_id = TC.manager_id
-        WHERE COALESCE(MS.matches_played, 0) >= 10
-          AND COALESCE(MS.wins, 0) / NULLIF(COALESCE(MS.matches_played, 0), 0) >= 0.6
-          AND COALESCE(TC.tournaments_entered, 0) <= 3
-        ORDER BY win_ratio DESC, tournaments_entered ASC
-        LIMIT 25;
-    """
-    try:
-        with conn.cursor() as cursor:
+                SELECT 
+                    M.manager_id,
+                    M.name,
+                    MS.wins,
+                    MS.matches_played,
+                    (SELECT COUNT(*) FROM TournamentEntry TE
+                      WHERE TE.manager_id = MS.manager_id) AS tournaments_entered,
+                    ROUND(MS.wins / NULLIF(MS.matches_played, 0), 3) AS win_ratio
+                FROM ManagerStats MS
+                JOIN Manager M ON M.manager_id = MS.manager_id
+                WHERE MS.matches_played >= 10
+                  AND MS.wins / MS.matches_played >= 0.6
+            ) candidates
+            WHERE tournaments_entered <= 3
+            ORDER BY win_ratio DESC, tournaments_entered ASC
+            LIMIT 25;
+        """
+    else:
+        sql = """
+            WITH match_stats AS (
+                SELECT manager_id,
+                       SUM(win_flag) AS wins,
+                       COUNT(*) AS matches_played
+                FROM (
+                    SELECT manager1_id AS manager_id,
+                           CASE WHEN winner_id = manager1_id THEN 1 ELSE 0 END AS win_flag
+                    FROM TournamentMatch
+                    UNION ALL
+                    SELECT manager2_id AS manager_id,
+                           CASE WHEN winner_id = manager2_id THEN 1 ELSE 0 END AS win_flag
+                    FROM TournamentMatch
+                ) s
+                WHERE manager_id IS NOT NULL
+                GROUP BY manager_id
+            ),
+            tour_counts AS (
+                SELECT manager_id, COUNT(*) AS tournaments_entered
+                FROM TournamentEntry
+                GROUP BY manager_id
+            )
+            SELECT 
+                M.manager_id,
+                M.name,
+                COALESCE(MS.wins, 0) AS wins,
+                COALESCE(MS.matches_played, 0) AS matches_played,
+                COALESCE(TC.tournaments_entered, 0) AS tournaments_entered,
+                ROUND(COALESCE(MS.wins, 0) / NULLIF(COALESCE(MS.matches_played, 0), 0), 3) AS win_ratio
+            FROM Manager M
+            LEFT JOIN match_stats MS ON M.manager_id = MS.manager_id
+            LEFT JOIN tour_counts TC ON M.manager_id = TC.manager_id
+            WHERE COALESCE(MS.matches_played, 0) >= 10
+              AND COALESCE(MS.wins, 0) / NULLIF(COALESCE(MS.matches_played, 0), 0) >= 0.6
+              AND COALESCE(TC.tournaments_entered, 0) <= 3
+            ORDER BY win_ratio DESC, tournaments_entered ASC
+            LIMIT 25;
+        """
+    try:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
+@cached_query("TournamentMatch", "Manager", "Trophy", "Club", "City", "League", "Tournament")
+@traced
 def get_league_power_report(conn):
     sql = """
         WITH match_wins AS (
@@ -543,13 +3069,15 @@ def get_league_power_report(conn):
         ORDER BY match_wins DESC, tournaments_hosted DESC;
     """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
+@cached_query("Player", "PlayerArchetype")
+@traced
 def get_archetype_mvp_report(conn, limit=15):
     sql = """
         SELECT 
@@ -565,50 +3093,65 @@ def get_archetype_mvp_report(conn, limit=15):
         LIMIT %s;
     """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, (limit,))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Report Error: {e}")
+        log.error(f"Report Error: {e}")
         return []
 
 # =============================================================================
 # PARAMETERIZED QUERY LIBRARY
 # =============================================================================
 
+@cached_query("TournamentEntry", "Tournament", "Manager", "TournamentMatch")
+@traced
 def query_managers_with_min_wins(conn, tournament_name, min_wins=50):
-    sql = """
-        SELECT 
-            M.manager_id,
-            M.name,
-            TE.registration_date,
-            COALESCE(W.total_wins, 0) AS total_wins
-        FROM TournamentEntry TE
-        JOIN Tournament T ON TE.tournament_id = T.tournament_id
-        JOIN Manager M ON TE.manager_id = M.manager_id
-        LEFT JOIN (
-            SELECT winner_id, COUNT(*) AS total_wins
-            FROM TournamentMatch
-            WHERE winner_id IS NOT NULL
-            GROUP BY winner_id
-        ) W ON M.manager_id = W.winner_id
-        WHERE T.tournament_name = %s
-          AND COALESCE(W.total_wins, 0) > %s
-        ORDER BY total_wins DESC;
-    """
+    if manager_stats_ready(conn):
+        sql = """
+            SELECT 
+                M.manager_id,
+                M.name,
+                TE.registration_date,
+                COALESCE(MS.wins, 0) AS total_wins
+            FROM TournamentEntry TE
+            JOIN Tournament T ON TE.tournament_id = T.tournament_id
+            JOIN Manager M ON TE.manager_id = M.manager_id
+            LEFT JOIN ManagerStats MS ON M.manager_id = MS.manager_id
+            WHERE T.tournament_name = %s
+              AND COALESCE(MS.wins, 0) > %s
+            ORDER BY total_wins DESC;
+        """
+    else:
+        sql = """
+            SELECT 
+                M.manager_id,
+                M.name,
+                TE.registration_date,
+                COALESCE(W.total_wins, 0) AS total_wins
+            FROM TournamentEntry TE
+            JOIN Tournament T ON TE.tournament_id = T.tournament_id
+            JOIN Manager M ON TE.manager_id = M.manager_id
+            LEFT JOIN (
+                SELECT winner_id, COUNT(*) AS total_wins
+                FROM TournamentMatch
+                WHERE winner_id IS NOT NULL
+                GROUP BY winner_id
+            ) W ON M.manager_id = W.winner_id
+            WHERE T.tournament_name = %s
+              AND COALESCE(W.total_wins, 0) > %s
+            ORDER BY total_wins DESC;
+        """
     try:
-        with conn.cursor() as cursor:
-            try:
-                print("Executing SQL (Selection):\n" + sql.strip())
-                print("Params:", (tournament_name, min_wins))
-            except Exception:
-                pass
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, (tournament_name, min_wins))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Query Error: {e}")
+        log.error(f"Query Error: {e}")
         return []
 
+@cached_query("Player", "PlayerArchetype")
+@traced
 def query_players_by_manager(conn, manager_id):
     sql = """
         SELECT P.player_id, P.player_name, P.overall_rating, A.archetype_name
@@ -618,18 +3161,15 @@ def query_players_by_manager(conn, manager_id):
         ORDER BY P.overall_rating DESC;
     """
     try:
-        with conn.cursor() as cursor:
-            try:
-                print("Executing SQL (Projection):\n" + sql.strip())
-                print("Params:", (manager_id,))
-            except Exception:
-                pass
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, (manager_id,))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Query Error: {e}")
+        log.error(f"Query Error: {e}")
         return []
 
+@cached_query("Tournament", "TournamentEntry", "Player")
+@traced
 def query_average_rating_for_tournament(conn, tournament_name):
     sql = """
         SELECT 
@@ -643,18 +3183,15 @@ def query_average_rating_for_tournament(conn, tournament_name):
         GROUP BY T.tournament_id, T.tournament_name;
     """
     try:
-        with conn.cursor() as cursor:
-            try:
-                print("Executing SQL (Aggregate):\n" + sql.strip())
-                print("Params:", (tournament_name,))
-            except Exception:
-                pass
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, (tournament_name,))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Query Error: {e}")
+        log.error(f"Query Error: {e}")
         return []
 
+@cached_query("PlayerArchetype")
+@traced
 def query_archetype_by_prefix(conn, prefix):
     sql = """
         SELECT archetype_id, archetype_name, base_pace, base_shooting, base_passing
@@ -663,18 +3200,15 @@ def query_archetype_by_prefix(conn, prefix):
         ORDER BY archetype_name;
     """
     try:
-        with conn.cursor() as cursor:
-            try:
-                print("Executing SQL (Search):\n" + sql.strip())
-                print("Params:", (f"{prefix}%",))
-            except Exception:
-                pass
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, (f"{prefix}%",))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Query Error: {e}")
+        log.error(f"Query Error: {e}")
         return []
 
+@cached_query("Trophy", "Manager")
+@traced
 def query_trophy_leaderboard(conn, limit=10):
     sql = """
         SELECT 
@@ -689,13 +3223,15 @@ def query_trophy_leaderboard(conn, limit=10):
         LIMIT %s;
     """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, (limit,))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Query Error: {e}")
+        log.error(f"Query Error: {e}")
         return []
 
+@cached_query("Player", "PlayerArchetype", "Manager")
+@traced
 def query_elite_players(conn, min_rating=85):
     sql = """
         SELECT 
@@ -712,13 +3248,15 @@ def query_elite_players(conn, min_rating=85):
         LIMIT 50;
     """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, (min_rating,))
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Query Error: {e}")
+        log.error(f"Query Error: {e}")
         return []
 
+@cached_query("League", "City", "Tournament", "TournamentEntry", "LeagueSeason")
+@traced
 def query_active_league_insights(conn):
     sql = """
         SELECT 
@@ -735,11 +3273,11 @@ def query_active_league_insights(conn):
         ORDER BY tournaments_hosted DESC, visiting_managers DESC;
     """
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Query Error: {e}")
+        log.error(f"Query Error: {e}")
         return []
 
 # =============================================================================
@@ -755,6 +3293,7 @@ def validate_match_winner(manager1_id, manager2_id, winner_id):
         raise ValueError("Winner must be one of the participants")
     return True
 
+@traced
 def insert_match(conn, match_record):
     required = ['tournament_id', 'match_number']
     for k in required:
@@ -767,30 +3306,57 @@ def insert_match(conn, match_record):
                               match_record.get('manager2_id'), 
                               match_record.get('winner_id'))
     except ValueError as e:
-        print(e)
+        log.error(e)
         return False
 
     # Secure Insert Logic
-    cols = [validate_identifier(k) for k in match_record.keys()]
+    try:
+        sql = _insert_sql("TournamentMatch", tuple(match_record.keys()))
+    except ValueError as e:
+        log.error(e)
+        return False
     vals = list(match_record.values())
-    placeholders = ["%s"] * len(cols)
-
-    sql = f"INSERT INTO TournamentMatch ({', '.join(cols)}) VALUES ({', '.join(placeholders)})"
 
     try:
-        with conn.cursor() as cursor:
+        with borrow_connection(conn) as db, db.cursor() as cursor:
             cursor.execute(sql, vals)
-            return True
+        _notify_write(conn, "TournamentMatch", "insert", None, dict(match_record))
+        return True
     except pymysql.Error as e:
-        print(f"Error inserting match: {e}")
+        log.error(f"Error inserting match: {e}")
         return False
 
+@traced
+def insert_matches(conn, match_records):
+    """
+    Bulk version of insert_match (e.g. a season's results). Rows failing the
+    winner check are reported alongside database errors; see insert_many.
+    """
+    rejected, valid = [], []
+    for i, record in enumerate(match_records):
+        try:
+            if 'tournament_id' not in record or 'match_number' not in record:
+                raise ValueError("tournament_id and match_number are required")
+            validate_match_winner(record.get('manager1_id'), record.get('manager2_id'), record.get('winner_id'))
+            valid.append((i, record))
+        except ValueError as e:
+            rejected.append({"index": i, "row": record, "error": str(e)})
+
+    result = insert_many(conn, "TournamentMatch", [record for _, record in valid])
+    for err in result["errors"]:
+        err["index"] = valid[err["index"]][0]
+    result["errors"] = sorted(rejected + result["errors"], key=lambda err: err["index"])
+    return result
+
+@traced
 def update_match_winner(conn, tournament_id, match_number, new_winner_id):
-    try:
-        with conn.cursor() as cursor:
+    """Validates and sets the winner atomically (the row is locked between read and write)."""
+    def apply(tx):
+        with borrow_connection(tx) as db, db.cursor() as cursor:
             # Get participants
             cursor.execute(
-                "SELECT manager1_id, manager2_id FROM TournamentMatch WHERE tournament_id = %s AND match_number = %s",
+                "SELECT manager1_id, manager2_id FROM TournamentMatch "
+                "WHERE tournament_id = %s AND match_number = %s FOR UPDATE",
                 (tournament_id, match_number)
             )
             row = cursor.fetchone()
@@ -804,7 +3370,15 @@ def update_match_winner(conn, tournament_id, match_number, new_winner_id):
                 "UPDATE TournamentMatch SET winner_id = %s WHERE tournament_id = %s AND match_number = %s",
                 (new_winner_id, tournament_id, match_number)
             )
-            return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+        if updated:
+            _notify_write(tx, "TournamentMatch", "update",
+                          {"tournament_id": tournament_id, "match_number": match_number},
+                          {"winner_id": new_winner_id})
+        return updated
+
+    try:
+        return run_in_transaction(conn, apply)
     except (pymysql.Error, ValueError) as e:
-        print(f"Error updating winner: {e}")
+        log.error(f"Error updating winner: {e}")
         return False
@@ -0,0 +1,66 @@
+"""
+Applies the schema migrations in migrations/ to an existing database.
+
+    python migrate.py -u root                  # apply everything pending
+    python migrate.py -u root --status         # list applied / pending
+    python migrate.py -u root --down 1         # revert migration 001
+    python migrate.py -u root --rebuild-stats  # repair the manager summary tables
+"""
+import argparse
+import getpass
+import sys
+
+import db_utils
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Football league schema migrations")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("-u", "--user", default="root")
+    parser.add_argument("-p", "--password", help="prompted for if omitted")
+    parser.add_argument("-d", "--database", default="football_league_db")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--status", action="store_true", help="show applied and pending migrations")
+    action.add_argument("--target", type=int, help="apply pending migrations up to this version")
+    action.add_argument("--down", type=int, metavar="VERSION", help="revert one applied migration")
+    action.add_argument("--rebuild-stats", action="store_true",
+                        help="recompute ManagerStats / ManagerHeadToHead / ClubMatchSummary")
+    args = parser.parse_args(argv)
+
+    password = args.password if args.password is not None else getpass.getpass("MySQL password: ")
+    conn = db_utils.get_db_connection(args.host, args.user, password, args.database)
+    if not conn:
+        return 1
+
+    try:
+        if args.status:
+            applied = db_utils.applied_migrations(conn)
+            for version, name, _, down in db_utils.list_migrations():
+                state = "applied" if version in applied else "pending"
+                print(f"{version:03d} {name:<30} {state}{'' if down else ' (no down script)'}")
+            return 0
+
+        if args.down is not None:
+            return 0 if db_utils.revert_migration(conn, args.down) else 1
+
+        if args.rebuild_stats:
+            if not db_utils.manager_stats_ready(conn):
+                print("Summary tables are missing; apply the migrations first.")
+                return 1
+            return 0 if db_utils.rebuild_manager_stats(conn) else 1
+
+        pending = [m[0] for m in db_utils.list_migrations()
+                   if m[0] not in db_utils.applied_migrations(conn)
+                   and (args.target is None or m[0] <= args.target)]
+        applied = db_utils.apply_migrations(conn, target=args.target)
+        for version in applied:
+            print(f"Applied migration {version:03d}")
+        if not pending:
+            print("Database is up to date.")
+        return 0 if applied == pending else 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
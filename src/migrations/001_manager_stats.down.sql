@@ -0,0 +1,14 @@
+-- Reverts 001_manager_stats: reports fall back to aggregating match history.
+DROP TRIGGER IF EXISTS trg_club_stats_before_delete;
+DROP TRIGGER IF EXISTS trg_tournament_stats_before_delete;
+DROP TRIGGER IF EXISTS trg_club_match_stats_after_delete;
+DROP TRIGGER IF EXISTS trg_club_match_stats_after_update;
+DROP TRIGGER IF EXISTS trg_club_match_stats_after_insert;
+DROP TRIGGER IF EXISTS trg_tournament_match_stats_after_delete;
+DROP TRIGGER IF EXISTS trg_tournament_match_stats_after_update;
+DROP TRIGGER IF EXISTS trg_tournament_match_stats_after_insert;
+DROP PROCEDURE IF EXISTS apply_club_match_stats;
+DROP PROCEDURE IF EXISTS apply_tournament_match_stats;
+DROP TABLE IF EXISTS ClubMatchSummary;
+DROP TABLE IF EXISTS ManagerHeadToHead;
+DROP TABLE IF EXISTS ManagerStats;
@@ -0,0 +1,200 @@
+-- ---------------------------------------------------
+-- MIGRATION 001: Materialized manager statistics
+-- ---------------------------------------------------
+-- Summary tables kept current by triggers, so the win/head-to-head reports
+-- read a few rows per manager instead of re-aggregating all match history.
+--   ManagerStats:      tournament wins and matches per manager
+--   ManagerHeadToHead: the same, per opponent
+--   ClubMatchSummary:  club match results per (home club, home manager, away manager)
+-- FK cascades do not fire triggers: deleting a Tournament or Club is handled
+-- by the BEFORE DELETE triggers below, deeper cascades (League, City)
+-- need db_utils.rebuild_manager_stats (delete_record does it).
+
+CREATE TABLE ManagerStats (
+    manager_id VARCHAR(25) PRIMARY KEY,
+    wins INT NOT NULL DEFAULT 0,
+    matches_played INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (manager_id) REFERENCES Manager(manager_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE ManagerHeadToHead (
+    manager_id VARCHAR(25),
+    opponent_id VARCHAR(25),
+    wins INT NOT NULL DEFAULT 0,
+    matches_played INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (manager_id, opponent_id),
+    FOREIGN KEY (manager_id) REFERENCES Manager(manager_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (opponent_id) REFERENCES Manager(manager_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE ClubMatchSummary (
+    home_club_id VARCHAR(25),
+    home_manager_id VARCHAR(25),
+    away_manager_id VARCHAR(25),
+    matches_played INT NOT NULL DEFAULT 0,
+    home_wins INT NOT NULL DEFAULT 0,
+    away_wins INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (home_club_id, home_manager_id, away_manager_id),
+    FOREIGN KEY (home_club_id) REFERENCES Club(club_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (home_manager_id) REFERENCES ClubManager(manager_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (away_manager_id) REFERENCES ClubManager(manager_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- ---------------------------------------------------
+-- INCREMENTAL MAINTENANCE
+-- ---------------------------------------------------
+DELIMITER $$
+CREATE PROCEDURE apply_tournament_match_stats(
+    IN m1 VARCHAR(25), IN m2 VARCHAR(25), IN winner VARCHAR(25), IN delta INT)
+BEGIN
+    IF m1 IS NOT NULL THEN
+        INSERT INTO ManagerStats (manager_id, wins, matches_played)
+        VALUES (m1, delta * (winner <=> m1), delta)
+        ON DUPLICATE KEY UPDATE wins = wins + delta * (winner <=> m1),
+                                matches_played = matches_played + delta;
+    END IF;
+    IF m2 IS NOT NULL THEN
+        INSERT INTO ManagerStats (manager_id, wins, matches_played)
+        VALUES (m2, delta * (winner <=> m2), delta)
+        ON DUPLICATE KEY UPDATE wins = wins + delta * (winner <=> m2),
+                                matches_played = matches_played + delta;
+    END IF;
+    IF m1 IS NOT NULL AND m2 IS NOT NULL THEN
+        INSERT INTO ManagerHeadToHead (manager_id, opponent_id, wins, matches_played)
+        VALUES (m1, m2, delta * (winner <=> m1), delta)
+        ON DUPLICATE KEY UPDATE wins = wins + delta * (winner <=> m1),
+                                matches_played = matches_played + delta;
+        INSERT INTO ManagerHeadToHead (manager_id, opponent_id, wins, matches_played)
+        VALUES (m2, m1, delta * (winner <=> m2), delta)
+        ON DUPLICATE KEY UPDATE wins = wins + delta * (winner <=> m2),
+                                matches_played = matches_played + delta;
+    END IF;
+END$$
+
+CREATE PROCEDURE apply_club_match_stats(
+    IN home_club VARCHAR(25), IN home_manager VARCHAR(25), IN away_manager VARCHAR(25),
+    IN match_result VARCHAR(10), IN delta INT)
+BEGIN
+    IF home_club IS NOT NULL AND home_manager IS NOT NULL AND away_manager IS NOT NULL THEN
+        INSERT INTO ClubMatchSummary (home_club_id, home_manager_id, away_manager_id,
+                                      matches_played, home_wins, away_wins)
+        VALUES (home_club, home_manager, away_manager, delta,
+                delta * (match_result = 'Home Win'), delta * (match_result = 'Away Win'))
+        ON DUPLICATE KEY UPDATE matches_played = matches_played + delta,
+                                home_wins = home_wins + delta * (match_result = 'Home Win'),
+                                away_wins = away_wins + delta * (match_result = 'Away Win');
+    END IF;
+END$$
+
+CREATE TRIGGER trg_tournament_match_stats_after_insert
+AFTER INSERT ON TournamentMatch FOR EACH ROW
+BEGIN
+    CALL apply_tournament_match_stats(NEW.manager1_id, NEW.manager2_id, NEW.winner_id, 1);
+END$$
+
+CREATE TRIGGER trg_tournament_match_stats_after_update
+AFTER UPDATE ON TournamentMatch FOR EACH ROW
+BEGIN
+    CALL apply_tournament_match_stats(OLD.manager1_id, OLD.manager2_id, OLD.winner_id, -1);
+    CALL apply_tournament_match_stats(NEW.manager1_id, NEW.manager2_id, NEW.winner_id, 1);
+END$$
+
+CREATE TRIGGER trg_tournament_match_stats_after_delete
+AFTER DELETE ON TournamentMatch FOR EACH ROW
+BEGIN
+    CALL apply_tournament_match_stats(OLD.manager1_id, OLD.manager2_id, OLD.winner_id, -1);
+END$$
+
+CREATE TRIGGER trg_club_match_stats_after_insert
+AFTER INSERT ON ClubMatch FOR EACH ROW
+BEGIN
+    CALL apply_club_match_stats(NEW.home_club_id, NEW.home_manager_id, NEW.away_manager_id, NEW.result, 1);
+END$$
+
+CREATE TRIGGER trg_club_match_stats_after_update
+AFTER UPDATE ON ClubMatch FOR EACH ROW
+BEGIN
+    CALL apply_club_match_stats(OLD.home_club_id, OLD.home_manager_id, OLD.away_manager_id, OLD.result, -1);
+    CALL apply_club_match_stats(NEW.home_club_id, NEW.home_manager_id, NEW.away_manager_id, NEW.result, 1);
+END$$
+
+CREATE TRIGGER trg_club_match_stats_after_delete
+AFTER DELETE ON ClubMatch FOR EACH ROW
+BEGIN
+    CALL apply_club_match_stats(OLD.home_club_id, OLD.home_manager_id, OLD.away_manager_id, OLD.result, -1);
+END$$
+
+-- Matches removed by ON DELETE CASCADE bypass the triggers above.
+CREATE TRIGGER trg_tournament_stats_before_delete
+BEFORE DELETE ON Tournament FOR EACH ROW
+BEGIN
+    DECLARE done INT DEFAULT 0;
+    DECLARE m1, m2, winner VARCHAR(25);
+    DECLARE matches CURSOR FOR
+        SELECT manager1_id, manager2_id, winner_id FROM TournamentMatch
+        WHERE tournament_id = OLD.tournament_id;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = 1;
+    OPEN matches;
+    read_loop: LOOP
+        FETCH matches INTO m1, m2, winner;
+        IF done THEN
+            LEAVE read_loop;
+        END IF;
+        CALL apply_tournament_match_stats(m1, m2, winner, -1);
+    END LOOP;
+    CLOSE matches;
+END$$
+
+-- Home-side rows go with the club through the FK; undo its away matches.
+CREATE TRIGGER trg_club_stats_before_delete
+BEFORE DELETE ON Club FOR EACH ROW
+BEGIN
+    UPDATE ClubMatchSummary S
+    JOIN (
+        SELECT home_club_id, home_manager_id, away_manager_id,
+               COUNT(*) AS matches_played,
+               SUM(result = 'Home Win') AS home_wins,
+               SUM(result = 'Away Win') AS away_wins
+        FROM ClubMatch
+        WHERE away_club_id = OLD.club_id AND home_club_id <> OLD.club_id
+        GROUP BY home_club_id, home_manager_id, away_manager_id
+    ) D ON S.home_club_id = D.home_club_id
+       AND S.home_manager_id = D.home_manager_id
+       AND S.away_manager_id = D.away_manager_id
+    SET S.matches_played = S.matches_played - D.matches_played,
+        S.home_wins = S.home_wins - D.home_wins,
+        S.away_wins = S.away_wins - D.away_wins;
+END$$
+DELIMITER ;
+
+-- ---------------------------------------------------
+-- BACKFILL (same statements as db_utils.rebuild_manager_stats)
+-- ---------------------------------------------------
+INSERT INTO ManagerStats (manager_id, wins, matches_played)
+SELECT manager_id, SUM(win_flag), COUNT(*)
+FROM (
+    SELECT manager1_id AS manager_id, (winner_id <=> manager1_id) AS win_flag FROM TournamentMatch
+    UNION ALL
+    SELECT manager2_id AS manager_id, (winner_id <=> manager2_id) AS win_flag FROM TournamentMatch
+) s
+WHERE manager_id IS NOT NULL
+GROUP BY manager_id;
+
+INSERT INTO ManagerHeadToHead (manager_id, opponent_id, wins, matches_played)
+SELECT manager_id, opponent_id, SUM(win_flag), COUNT(*)
+FROM (
+    SELECT manager1_id AS manager_id, manager2_id AS opponent_id,
+           (winner_id <=> manager1_id) AS win_flag FROM TournamentMatch
+    UNION ALL
+    SELECT manager2_id, manager1_id, (winner_id <=> manager2_id) FROM TournamentMatch
+) s
+WHERE manager_id IS NOT NULL AND opponent_id IS NOT NULL
+GROUP BY manager_id, opponent_id;
+
+INSERT INTO ClubMatchSummary (home_club_id, home_manager_id, away_manager_id,
+                              matches_played, home_wins, away_wins)
+SELECT home_club_id, home_manager_id, away_manager_id,
+       COUNT(*), SUM(result = 'Home Win'), SUM(result = 'Away Win')
+FROM ClubMatch
+WHERE home_club_id IS NOT NULL AND home_manager_id IS NOT NULL AND away_manager_id IS NOT NULL
+GROUP BY home_club_id, home_manager_id, away_manager_id;
@@ -0,0 +1,25 @@
+-- Reverts 002_report_indexes. Foreign keys need an index on their column, so
+-- the plain FK indexes the composites replaced are recreated first.
+ALTER TABLE ClubMatch
+    ADD INDEX home_club_id (home_club_id),
+    DROP INDEX idx_clubmatch_pairing;
+
+ALTER TABLE TournamentMatch
+    ADD INDEX manager1_id (manager1_id),
+    ADD INDEX manager2_id (manager2_id),
+    DROP INDEX idx_tm_manager1_winner,
+    DROP INDEX idx_tm_manager2_winner;
+
+ALTER TABLE PlayerArchetype
+    DROP INDEX idx_archetype_name;
+
+ALTER TABLE Player
+    ADD INDEX archetype_id (archetype_id),
+    ADD INDEX manager_id (manager_id),
+    DROP INDEX idx_player_rating,
+    DROP INDEX idx_player_manager_rating,
+    DROP INDEX idx_player_archetype_rating;
+
+ALTER TABLE Tournament
+    DROP INDEX idx_tournament_name,
+    DROP INDEX idx_tournament_start;
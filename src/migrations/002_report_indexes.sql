@@ -0,0 +1,47 @@
+-- ---------------------------------------------------
+-- MIGRATION 002: Index pack for the reports and query library
+-- ---------------------------------------------------
+-- Optional: everything works without it, it only changes query plans.
+-- Each index is named after the db_utils query it serves. Composite
+-- indexes that start with a foreign-key column replace the index MySQL
+-- created for that FK (it drops the implicit one automatically).
+-- ALGORITHM=INPLACE, LOCK=NONE builds them online, one pass per table.
+
+-- query_managers_with_min_wins / query_average_rating_for_tournament:
+--   WHERE T.tournament_name = %s
+-- get_tournament_snapshot: WHERE T.start_date >= CURDATE(), covering the name
+ALTER TABLE Tournament
+    ADD INDEX idx_tournament_name (tournament_name),
+    ADD INDEX idx_tournament_start (start_date, tournament_name),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- query_elite_players: WHERE overall_rating >= %s ORDER BY overall_rating DESC LIMIT 50
+-- query_players_by_manager: WHERE manager_id = %s ORDER BY overall_rating DESC
+-- query_average_rating_for_tournament, get_tournament_snapshot, the performance
+--   sheet's signature list: join on manager_id reading overall_rating/archetype_id
+-- get_archetype_mvp_report: GROUP BY archetype_id over overall_rating (index-only)
+ALTER TABLE Player
+    ADD INDEX idx_player_rating (overall_rating),
+    ADD INDEX idx_player_manager_rating (manager_id, overall_rating, archetype_id),
+    ADD INDEX idx_player_archetype_rating (archetype_id, overall_rating),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- query_archetype_by_prefix: WHERE archetype_name LIKE 'prefix%' ORDER BY archetype_name
+ALTER TABLE PlayerArchetype
+    ADD INDEX idx_archetype_name (archetype_name),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- get_underrated_manager_report (fallback) and rebuild_manager_stats: each
+-- UNION ALL branch reads (managerN_id, winner_id) only, so both are covered.
+ALTER TABLE TournamentMatch
+    ADD INDEX idx_tm_manager1_winner (manager1_id, winner_id),
+    ADD INDEX idx_tm_manager2_winner (manager2_id, winner_id),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- get_manager_performance_sheet (fallback) and rebuild_manager_stats group by
+-- (home_club_id, home_manager_id, away_manager_id) and count results. result
+-- has three values, so on its own it would never be chosen; as the last
+-- column it makes the aggregation index-only.
+ALTER TABLE ClubMatch
+    ADD INDEX idx_clubmatch_pairing (home_club_id, home_manager_id, away_manager_id, result),
+    ALGORITHM=INPLACE, LOCK=NONE;
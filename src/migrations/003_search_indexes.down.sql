@@ -0,0 +1,9 @@
+-- Reverts 003_search_indexes.
+ALTER TABLE Transfer
+    DROP INDEX idx_transfer_date;
+
+ALTER TABLE TournamentMatch
+    DROP INDEX idx_tm_date;
+
+ALTER TABLE ClubMatch
+    DROP INDEX idx_clubmatch_date;
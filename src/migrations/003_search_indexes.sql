@@ -0,0 +1,18 @@
+-- ---------------------------------------------------
+-- MIGRATION 003: Indexes for date searches
+-- ---------------------------------------------------
+-- Optional, like 002: it only changes query plans.
+-- search_table compiles date and year terms into ranges on the bare column
+-- (compile_search_predicates), which these indexes serve; plan_check.py
+-- asserts that through explain_search (SEARCH_PROBES).
+ALTER TABLE ClubMatch
+    ADD INDEX idx_clubmatch_date (match_date),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE TournamentMatch
+    ADD INDEX idx_tm_date (match_date),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Transfer
+    ADD INDEX idx_transfer_date (transfer_date),
+    ALGORITHM=INPLACE, LOCK=NONE;
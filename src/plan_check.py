@@ -0,0 +1,320 @@
+"""
+Plan-regression check for every db_utils report, library query, search
+and browse page.
+
+Each report is run once against a local MySQL instance to capture the
+statements it sends, then every SELECT is explained with EXPLAIN
+FORMAT=JSON (access type, key, estimated rows per table, temporary tables,
+filesorts, cost) and EXPLAIN ANALYZE (rows actually examined, time).
+
+    python plan_check.py -u root --record   # store baselines for this dataset
+    python plan_check.py -u root            # compare, exit 1 on a regression
+    python plan_check.py -u root --show     # print the current plans
+
+It also EXPLAINs the search predicates in SEARCH_PROBES and fails unless
+each one is read through the index on its column (a ref or range access).
+
+Record the baselines against a generated dataset (pop_gen.py) of the size
+you care about; a plan that is fine on 100 rows says little about 1M.
+They describe that local dataset, so plan_baselines.json is not committed
+(see .gitignore); pass --baselines to keep several side by side.
+"""
+import argparse
+import getpass
+import json
+import os
+import re
+import sys
+
+import pymysql
+
+import bench
+import db_utils
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plan_baselines.json")
+
+# Best to worst, as documented for EXPLAIN's "type" column.
+ACCESS_TYPES = ["system", "const", "eq_ref", "ref", "fulltext", "ref_or_null", "index_merge",
+                "unique_subquery", "index_subquery", "range", "index", "ALL"]
+
+# Rows examined may grow this much (plus ROWS_SLACK) before it counts as a regression.
+ROWS_TOLERANCE = 2.0
+ROWS_SLACK = 1000
+
+# (table, column, term): search_table predicates that an index on the
+# column must be able to serve (migrations 002 and 003 add the indexes).
+SEARCH_PROBES = [
+    ("ClubMatch", "match_date", "2024-05-01"),
+    ("ClubMatch", "match_date", "2024"),
+    ("TournamentMatch", "match_date", "2024-05-01"),
+    ("TournamentMatch", "match_date", "2024"),
+    ("Transfer", "transfer_date", "2023"),
+    ("Tournament", "start_date", "2024"),
+    ("Player", "overall_rating", "85"),
+]
+
+# EXPLAIN types that mean a probe's predicate was served by an index lookup or range.
+PROBE_ACCESS_TYPES = ("const", "eq_ref", "ref", "range")
+
+_ANALYZE_NODE = re.compile(r'actual time=[\d.]+\.\.([\d.]+) rows=([\d.]+) loops=(\d+)')
+
+
+class _RecordingCursor:
+    def __init__(self, cursor, log):
+        self._cursor = cursor
+        self._log = log
+
+    def execute(self, query, args=None):
+        self._log.append((query, args))
+        return self._cursor.execute(query, args)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+
+class _RecordingConnection:
+    """Passes everything to a real connection, logging executed statements."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.log = []
+
+    def cursor(self, *args, **kwargs):
+        return _RecordingCursor(self._conn.cursor(*args, **kwargs), self.log)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def capture_statements(conn, func, args):
+    """The SELECT statements (sql, params) a report sends."""
+    recorder = _RecordingConnection(conn)
+    func(recorder, *args)
+    selects = []
+    for sql, params in recorder.log:
+        head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if head in ("SELECT", "WITH") and "information_schema" not in sql:
+            selects.append((sql.strip().rstrip(";"), params))
+    return selects
+
+def _walk(node, summary, seen):
+    if isinstance(node, dict):
+        if node.get("using_filesort"):
+            summary["filesorts"] += 1
+        if node.get("using_temporary_table"):
+            summary["temporary_tables"] += 1
+        table = node.get("table")
+        if isinstance(table, dict) and "table_name" in table:
+            name = table["table_name"]
+            seen[name] = seen.get(name, 0) + 1
+            label = name if seen[name] == 1 else f"{name}#{seen[name]}"
+            summary["tables"][label] = {
+                "access_type": table.get("access_type"),
+                "key": table.get("key"),
+                "rows": table.get("rows_examined_per_scan"),
+            }
+        for value in node.values():
+            _walk(value, summary, seen)
+    elif isinstance(node, list):
+        for item in node:
+            _walk(item, summary, seen)
+
+def explain(conn, sql, params):
+    """Plan summary of one statement from EXPLAIN FORMAT=JSON and EXPLAIN ANALYZE."""
+    summary = {"tables": {}, "temporary_tables": 0, "filesorts": 0,
+               "cost": None, "rows_examined": None, "time_ms": None}
+    with db_utils.borrow_connection(conn) as db, db.cursor() as cursor:
+        cursor.execute("EXPLAIN FORMAT=JSON " + sql, params)
+        plan = json.loads(next(iter(cursor.fetchone().values())))
+        _walk(plan, summary, {})
+        cost = plan.get("query_block", {}).get("cost_info", {}).get("query_cost")
+        summary["cost"] = float(cost) if cost is not None else None
+
+        try:
+            cursor.execute("EXPLAIN ANALYZE " + sql, params)
+            tree = next(iter(cursor.fetchone().values()))
+        except pymysql.Error:
+            tree = ""  # Before MySQL 8.0.18
+        nodes = [(float(t), float(r), int(l)) for t, r, l in _ANALYZE_NODE.findall(tree)]
+        if nodes:
+            summary["rows_examined"] = int(sum(rows * loops for _, rows, loops in nodes))
+            summary["time_ms"] = nodes[0][0]
+    return summary
+
+def plan_cases(conn):
+    """
+    [(name, func, args)]: every report, the browsing and search functions
+    (bench.function_cases) and keyset pages past the first. get_next_id is
+    covered by its seed read only; calling it would use up IDs.
+    """
+    cases = bench.report_cases(conn)
+    cases += [case for case in bench.function_cases(conn) if not case[0].startswith("get_next_id")]
+    for table in ("Player", "TournamentMatch"):
+        first = db_utils.browse_table(conn, table, page_size=100)
+        if first["last_key"]:
+            cases.append((f"browse_table {table} next page", db_utils.browse_table,
+                          (table, None, 100, first["last_key"])))
+            cases.append((f"browse_table {table} previous page", db_utils.browse_table,
+                          (table, None, 100, None, first["last_key"])))
+    cases.append(("get_next_id Player seed", db_utils.id_seed_query, ("Player", "player_id", "R")))
+    return cases
+
+def capture_plans(conn):
+    """{case name: plan summary} for every statement of every plan case."""
+    db_utils.get_schema_catalog(conn)  # Load outside the capture
+    plans = {}
+    for name, func, args in plan_cases(conn):
+        statements = capture_statements(conn, func, args)
+        for n, (sql, params) in enumerate(statements, 1):
+            label = name if len(statements) == 1 else f"{name}#{n}"
+            plans[label] = explain(conn, sql, params)
+    return plans
+
+def _rank(access_type):
+    return ACCESS_TYPES.index(access_type) if access_type in ACCESS_TYPES else -1
+
+def compare_plan(baseline, current):
+    """Human-readable reasons why `current` is worse than `baseline` (empty if not)."""
+    problems = []
+    for table, before in baseline["tables"].items():
+        after = current["tables"].get(table)
+        if after is None:
+            continue
+        if _rank(after["access_type"]) > _rank(before["access_type"]):
+            problems.append(f"{table}: access {before['access_type']} -> {after['access_type']}")
+        if before["key"] and not after["key"]:
+            problems.append(f"{table}: no longer uses index {before['key']}")
+    for flag in ("temporary_tables", "filesorts"):
+        if current[flag] > baseline[flag]:
+            problems.append(f"{flag.replace('_', ' ')} {baseline[flag]} -> {current[flag]}")
+    before_rows, after_rows = baseline.get("rows_examined"), current.get("rows_examined")
+    if before_rows is not None and after_rows is not None:
+        if after_rows > before_rows * ROWS_TOLERANCE + ROWS_SLACK:
+            problems.append(f"rows examined {before_rows} -> {after_rows}")
+    return problems
+
+def _leading_indexes(conn, table):
+    """{column (lower case): {index names}} for the indexes each column leads."""
+    with db_utils.borrow_connection(conn) as db, db.cursor() as cursor:
+        cursor.execute("SELECT column_name, index_name FROM information_schema.statistics "
+                       "WHERE table_schema = DATABASE() AND table_name = %s AND seq_in_index = 1", (table,))
+        indexes = {}
+        for row in cursor.fetchall():
+            indexes.setdefault(row["column_name"].lower(), set()).add(row["index_name"])
+        return indexes
+
+def check_search_probes(conn):
+    """
+    [(label, problems)] for SEARCH_PROBES: for each compiled predicate the
+    optimizer must pick an index on its column (EXPLAIN's key) and read it
+    with an index lookup or range (type in PROBE_ACCESS_TYPES). Probes on
+    columns without an index are skipped (problems is None).
+    """
+    results = []
+    for table, column, term in SEARCH_PROBES:
+        label = f"search {table}.{column} '{term}'"
+        column_indexes = _leading_indexes(conn, table).get(column.lower())
+        if not column_indexes:
+            results.append((label, None))
+            continue
+        plan = db_utils.explain_search(conn, table, term, columns=[column])
+        if not plan:
+            results.append((label, ["no predicate compiled for the term"]))
+            continue
+        row = plan[0]
+        problems = []
+        if row["key"] not in column_indexes:
+            problems.append(f"uses key {row['key']} instead of {', '.join(sorted(column_indexes))} "
+                            f"(possible_keys {row['possible_keys']})")
+        if row["type"] not in PROBE_ACCESS_TYPES:
+            problems.append(f"access type {row['type']}, expected one of {', '.join(PROBE_ACCESS_TYPES)}")
+        results.append((label, problems))
+    return results
+
+def print_plan(name, plan):
+    print(f"{name}: cost={plan['cost']} rows_examined={plan['rows_examined']} "
+          f"time_ms={plan['time_ms']} temp={plan['temporary_tables']} filesort={plan['filesorts']}")
+    for table, info in plan["tables"].items():
+        print(f"    {table:<28} {info['access_type'] or '-':<12} key={info['key']} rows={info['rows']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check db_utils query plans against baselines")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("-u", "--user", default="root")
+    parser.add_argument("-p", "--password", help="prompted for if omitted")
+    parser.add_argument("-d", "--database", default="football_league_db")
+    parser.add_argument("--baselines", default=BASELINE_FILE, help="baseline JSON file")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true", help="write the current plans as the baselines")
+    mode.add_argument("--show", action="store_true", help="print the current plans")
+    args = parser.parse_args(argv)
+
+    password = args.password if args.password is not None else getpass.getpass("MySQL password: ")
+    conn = db_utils.get_db_connection(args.host, args.user, password, args.database)
+    if not conn:
+        return 1
+    try:
+        plans = capture_plans(conn)
+        probes = [] if args.record else check_search_probes(conn)
+    except pymysql.Error as e:
+        print(f"Error capturing plans: {e}")
+        return 1
+    finally:
+        conn.close()
+
+    failed_probes = 0
+    for label, problems in probes:
+        if problems is None:
+            print(f"SKIPPED    {label} (column not indexed)")
+        elif problems:
+            failed_probes += 1
+            print(f"NOT SARGABLE {label}")
+            for problem in problems:
+                print(f"    {problem}")
+        else:
+            print(f"OK         {label}")
+
+    if args.show:
+        for name, plan in plans.items():
+            print_plan(name, plan)
+        return 1 if failed_probes else 0
+
+    if args.record:
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(plans, f, indent=2, sort_keys=True)
+        print(f"Recorded {len(plans)} plans in {args.baselines}")
+        return 0
+
+    if not os.path.exists(args.baselines):
+        print(f"No baselines at {args.baselines}; run with --record first.")
+        return 1
+    with open(args.baselines, encoding="utf-8") as f:
+        baselines = json.load(f)
+
+    regressions = 0
+    for name, plan in plans.items():
+        if name not in baselines:
+            print(f"NEW        {name}")
+            continue
+        problems = compare_plan(baselines[name], plan)
+        if problems:
+            regressions += 1
+            print(f"REGRESSED  {name}")
+            for problem in problems:
+                print(f"    {problem}")
+        else:
+            print(f"OK         {name}")
+    print(f"{len(plans)} plans checked, {regressions} regressed; "
+          f"{len(probes)} search probes, {failed_probes} not sargable")
+    return 1 if regressions or failed_probes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,27 @@
-import random
+"""
+Generates populate.sql, the sample data for the football league schema.
+
+    python pop_gen.py                                  # 1x dataset, default seed
+    python pop_gen.py --scale 100 -o populate_100x.sql
+    python pop_gen.py --count player=10000000 --seed 7 --jobs 0
+
+The output is byte-identical for the same seed, counts and Faker version.
+Tables that grow with --scale are generated in chunks of CHUNK_ROWS rows,
+each from its own random generator seeded by (seed, table, chunk), so any
+chunk can be produced without the ones before it; memory holds one chunk
+and the manager IDs however many rows are written. --jobs spreads the chunks over worker
+processes; the file is the same for any number of jobs.
+"""
+import argparse
 import datetime
+import gzip
+import io
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
 
 # Try to import faker, else fallback
 try:
@@ -11,10 +33,25 @@ except ImportError:
 # ---------------------------------------------------------
 # CONFIGURATION & CONSTANTS
 # ---------------------------------------------------------
-NUM_MANAGERS = 150
-NUM_PLAYERS = 700
-NUM_MATCHES = 1200
 FILE_NAME = "populate.sql"
+DATABASE = "football_league_db"
+DEFAULT_SEED = 42
+CHUNK_ROWS = 10000
+TOURNAMENTS_PER_CHUNK = 40  # each brings 32 entries and ~240 matches
+
+# Rows at scale 1. --scale multiplies every one of them, --count sets one.
+BASE_COUNTS = {
+    "manager": 150,
+    "player": 700,
+    "tournament": 5,
+    "tournament_match": 1200,
+    "club_match": 50,
+    "player_statistics": 100,  # players with statistics, 3 seasons each
+    "transfer": 50,
+}
+
+# Tables whose rows may repeat a key; they are written with INSERT IGNORE.
+IGNORE_DUPLICATES = {"PositionStrength", "PositionWeakness", "PlayerArchetypeSkill", "Trophy", "TournamentEntry"}
 
 # Real World Data for Coherence
 LEAGUES = [
@@ -116,30 +153,48 @@ LORE_CITIES = [
     "Porto", "Valencia", "Seville", "Dortmund", "Naples", "Florence"
 ]
 
+
 # ---------------------------------------------------------
 # HELPER FUNCTIONS
 # ---------------------------------------------------------
 
+# get_id's 3 carry letters and 3 digits: the IDs one prefix can hand out.
+ID_SERIES_SIZE = 999 * 26 ** 3
+
+# IDs each counted table needs per row (PlayerStatistics has 3 seasons per player).
+IDS_PER_ROW = {"manager": 1, "player": 1, "tournament": 1, "club_match": 1, "player_statistics": 3, "transfer": 1}
+
 def get_id(prefix, name, index):
     """
     Generates an ID strictly matching ^Prefix[A-Z]{3,16}[0-9]{3}$
+    Indexes above 999 carry into three extra letters (AAB001 follows 999).
     """
     clean_name = "".join(c for c in name if c.isalpha()).upper()
     if len(clean_name) < 3:
         clean_name = (clean_name + "XXX")[:16]
+    carry, number = divmod(index - 1, 999)
+    if index > ID_SERIES_SIZE:
+        raise ValueError(f"index {index} is too large for a {prefix} id")
+    if carry:
+        letters = ""
+        for _ in range(3):
+            carry, digit = divmod(carry, 26)
+            letters = chr(ord("A") + digit) + letters
+        clean_name = clean_name[:13] + letters
     if len(clean_name) > 16:
         clean_name = clean_name[:16]
-    return f"{prefix}{clean_name}{index:03d}"
+    return f"{prefix}{clean_name}{number + 1:03d}"
 
 def escape_sql(val):
     if val is None:
         return "NULL"
     if isinstance(val, int) or isinstance(val, float):
         return str(val)
-    return f"'{str(val).replace("'", "''")}'"
+    escaped = str(val).replace("'", "''")
+    return f"'{escaped}'"
 
 
-def random_date_between(start_date, end_date):
+def random_date_between(rng, start_date, end_date):
     """Return an ISO date string between two datetime.date objects (inclusive)."""
     if isinstance(start_date, str):
         start_date = datetime.date.fromisoformat(start_date)
@@ -148,394 +203,591 @@ def random_date_between(start_date, end_date):
     delta = (end_date - start_date).days
     if delta <= 0:
         return start_date.isoformat()
-    pick = random.randint(0, delta)
+    pick = rng.randint(0, delta)
     return (start_date + datetime.timedelta(days=pick)).isoformat()
 
 
-def random_date_in_years(start_year=2000, end_year=2025):
+def random_date_in_years(rng, start_year=2000, end_year=2025):
     start = datetime.date(start_year, 1, 1)
     end = datetime.date(end_year, 12, 31)
-    return random_date_between(start, end)
+    return random_date_between(rng, start, end)
 
-# Storage for Referencing IDs
-ids = {
-    "league": [], "position": [], "skill": [], "city": [], 
-    "move": [], "archetype": [], "manager": [], "season": [],
-    "club": [], "club_manager": [], "player": [], "tournament": []
-}
+
+def chunk_rng(seed, table, chunk=0):
+    """
+    Random generator for one chunk of one table, plus the module's Faker
+    reseeded to match (None without faker). Both depend only on the
+    arguments, so chunks can be generated in any order (or not at all).
+    """
+    key = f"{seed}:{table}:{chunk}"
+    if fake:
+        fake.seed_instance(key)
+    return random.Random(key), fake
+
+
+def chunk_range(chunk, total, size=CHUNK_ROWS):
+    """1-based row indexes covered by `chunk` of a table with `total` rows."""
+    return range(chunk * size + 1, min((chunk + 1) * size, total) + 1)
+
+
+def num_chunks(total, size=CHUNK_ROWS):
+    return -(-total // size)
+
+
+def make_counts(scale=1, overrides=None):
+    """Row counts for every scaled table: BASE_COUNTS * scale, then `overrides`."""
+    counts = {name: n * scale for name, n in BASE_COUNTS.items()}
+    counts.update(overrides or {})
+    counts["player_statistics"] = min(counts["player_statistics"], counts["player"])
+    return counts
 
 # ---------------------------------------------------------
 # GENERATION LOGIC
 # ---------------------------------------------------------
-
-with open(FILE_NAME, "w") as f:
-    f.write("-- AUTO-GENERATED POPULATION SCRIPT FOR FOOTBALL LEAGUE\n")
-    f.write("USE football_league_db;\n\n")
-    f.write("-- Disable checks for bulk loading\n")
-    f.write("SET FOREIGN_KEY_CHECKS = 0;\n\n")
-
-    # =====================================================
-    # LEVEL 0
-    # =====================================================
-    f.write("-- LEVEL 0: League, Position, Skill\n")
-    
+# Each generator returns {table name: [row tuples]}. The ones that take a
+# chunk number produce CHUNK_ROWS rows (TOURNAMENTS_PER_CHUNK tournaments)
+# of their table from chunk_rng alone; `ids` holds the fixed ID pools and
+# the manager IDs, which are the only rows later tables look up.
+
+def fixed_tables(seed, ids):
+    """League through PlayerArchetypeSkill: the lookup tables that do not scale."""
+    rng, fake = chunk_rng(seed, "fixed")
+    tables = {name: [] for name in ("League", "Position", "Skill", "City", "SpecialMove",
+                                    "PositionStrength", "PositionWeakness", "PlayerArchetype",
+                                    "LeagueSeason", "PlayerArchetypeSkill")}
+
+    ids["league"] = []
     for i, (lname, main_city, country) in enumerate(LEAGUES, 1):
         lid = get_id("L", lname, i)
         ids["league"].append(lid)
-        f.write(f"INSERT INTO League VALUES ({escape_sql(lid)}, {escape_sql(lname)}, {escape_sql(main_city)}, {escape_sql(country)});\n")
+        tables["League"].append((lid, lname, main_city, country))
 
+    ids["position"] = []
     for i, pname in enumerate(POSITIONS, 1):
         pid = get_id("P", pname, i)
         ids["position"].append(pid)
-        f.write(f"INSERT INTO Position VALUES ({escape_sql(pid)}, {escape_sql(pname)});\n")
+        tables["Position"].append((pid, pname))
 
+    ids["skill"] = []
     for i, sname in enumerate(SKILLS, 1):
         sid = get_id("K", sname, i)
         ids["skill"].append(sid)
-        f.write(f"INSERT INTO Skill VALUES ({escape_sql(sid)}, {escape_sql(sname)}, 'Standard effect');\n")
-
-    # =====================================================
-    # LEVEL 1
-    # =====================================================
-    f.write("\n-- LEVEL 1: Dependent on Level 0\n")
+        tables["Skill"].append((sid, sname, "Standard effect"))
 
     # City
+    ids["city"] = []
     for i in range(1, 60):
-        league_ref = random.choice(ids["league"])
-        
+        league_ref = rng.choice(ids["league"])
         if fake:
             cname = fake.city()
         elif i <= len(LORE_CITIES):
             cname = LORE_CITIES[i-1]
         else:
             cname = f"City{i}"
-            
         cid = get_id("C", cname, i)
         ids["city"].append(cid)
-        f.write(f"INSERT INTO City VALUES ({escape_sql(cid)}, {escape_sql(cname)}, {escape_sql(league_ref)});\n")
+        tables["City"].append((cid, cname, league_ref))
 
     # SpecialMove
+    ids["move"] = []
     for i, (mname, diff, succ, stam, cat) in enumerate(SPECIAL_MOVES_DATA, 1):
         mid = get_id("M", mname, i)
         ids["move"].append(mid)
-        # Random position for move
-        pid = random.choice(ids["position"])
-        f.write(f"INSERT INTO SpecialMove VALUES ({escape_sql(mid)}, {escape_sql(mname)}, {diff}, {succ}, {stam}, {escape_sql(pid)}, {escape_sql(cat)});\n")
+        tables["SpecialMove"].append((mid, mname, diff, succ, stam, rng.choice(ids["position"]), cat))
 
-    # PositionStrength & Weakness
+    # PositionStrength & Weakness: 2 positions each is strong / weak against
     for pid in ids["position"]:
-        # 2 positions it is strong against
-        targets = random.sample(ids["position"], min(2, len(ids["position"])))
-        for t in targets:
+        for t in rng.sample(ids["position"], min(2, len(ids["position"]))):
             if t != pid:
-                f.write(f"INSERT IGNORE INTO PositionStrength VALUES ({escape_sql(pid)}, {escape_sql(t)});\n")
-        
-        # 2 positions it is weak against
-        weak_targets = random.sample(ids["position"], min(2, len(ids["position"])))
-        for wt in weak_targets:
+                tables["PositionStrength"].append((pid, t))
+        for wt in rng.sample(ids["position"], min(2, len(ids["position"]))):
             if wt != pid:
-                f.write(f"INSERT IGNORE INTO PositionWeakness VALUES ({escape_sql(pid)}, {escape_sql(wt)});\n")
+                tables["PositionWeakness"].append((pid, wt))
 
     # PlayerArchetype
+    ids["archetype"] = []
     for i, data in enumerate(ARCHETYPE_DATA, 1):
         aid = get_id("A", data[0], i)
-        ids["archetype"].append({"id": aid, "name": data[0]})
-        p1_idx = POSITIONS.index(data[5])
-        p1_id = ids["position"][p1_idx]
-        p2_id = "NULL"
-        if data[6]:
-            p2_idx = POSITIONS.index(data[6])
-            p2_id = f"'{ids['position'][p2_idx]}'"
-        f.write(f"INSERT INTO PlayerArchetype VALUES ({escape_sql(aid)}, {escape_sql(data[0])}, {data[1]}, {data[2]}, {data[3]}, {data[4]}, {escape_sql(p1_id)}, {p2_id});\n")
-
-    # Manager
-    for i in range(1, NUM_MANAGERS + 1):
-        if fake:
-            mname = fake.name()
-        else:
-            mname = f"Manager {i}"
-        
-        raw_fname = mname.split()[0]
-        clean_fname = "".join(c for c in raw_fname if c.isalnum())
-        
+        ids["archetype"].append(aid)
+        p1_id = ids["position"][POSITIONS.index(data[5])]
+        p2_id = ids["position"][POSITIONS.index(data[6])] if data[6] else None
+        tables["PlayerArchetype"].append((aid, data[0], data[1], data[2], data[3], data[4], p1_id, p2_id))
+
+    # LeagueSeason
+    ids["season"] = []
+    for i in range(1, 6):
+        sid = get_id("S", "SEASON", i)
+        ids["season"].append(sid)
+        lid = ids["league"][i-1] if i-1 < len(ids["league"]) else ids["league"][0]
+        tables["LeagueSeason"].append((sid, 2020 + i, lid, "Official League Season"))
+
+    # PlayerArchetypeSkill: 2-3 random skills per archetype
+    for aid in ids["archetype"]:
+        for skill_id in rng.sample(ids["skill"], min(rng.randint(2, 3), len(ids["skill"]))):
+            tables["PlayerArchetypeSkill"].append((aid, skill_id))
+    return tables
+
+
+def manager_chunk(seed, chunk, counts, ids):
+    rng, fake = chunk_rng(seed, "manager", chunk)
+    rows = []
+    for i in chunk_range(chunk, counts["manager"]):
+        mname = fake.name() if fake else f"Manager {i}"
+        clean_fname = "".join(c for c in mname.split()[0] if c.isalnum())
         mid = get_id("G", clean_fname, i)
-        ids["manager"].append(mid)
-        
-        gender = random.choice(['Male', 'Female', 'Other'])
-        
-        if fake:
-            bdate_obj = fake.date_of_birth(minimum_age=35, maximum_age=70)
-            bdate = bdate_obj.isoformat()
-        else:
-            bdate = random_date_in_years(1955, 1985)
-        
+        gender = rng.choice(["Male", "Female", "Other"])
+        bdate = random_date_in_years(rng, 1955, 1985)
         email = f"{clean_fname}{i}@footballmail.com"
         phone = f"555-{i:04d}"
-        lid = random.choice(ids["league"])
-        
+        lid = rng.choice(ids["league"])
         if fake:
             nationality = fake.country()
         else:
-            nationality = random.choice(["England", "Spain", "Germany", "Italy", "France", "Brazil", "Argentina"])
-        
-        f.write(f"INSERT INTO Manager VALUES ({escape_sql(mid)}, {escape_sql(mname)}, {escape_sql(gender)}, {escape_sql(bdate)}, {escape_sql(email)}, {escape_sql(phone)}, {escape_sql(lid)}, {escape_sql(nationality)});\n")
+            nationality = rng.choice(["England", "Spain", "Germany", "Italy", "France", "Brazil", "Argentina"])
+        rows.append((mid, mname, gender, bdate, email, phone, lid, nationality))
+    return {"Manager": rows}
 
-    # LeagueSeason
-    for i in range(1, 6):
-        sid = get_id("S", "SEASON", i)
-        ids["season"].append(sid)
-        lid = ids["league"][i-1] if i-1 < len(ids["league"]) else ids["league"][0]
-        f.write(f"INSERT INTO LeagueSeason VALUES ({escape_sql(sid)}, {2020+i}, {escape_sql(lid)}, 'Official League Season');\n")
-
-    # =====================================================
-    # LEVEL 2
-    # =====================================================
-    f.write("\n-- LEVEL 2: Dependent on Level 1\n")
-
-    # PlayerArchetypeSkill
-    for a_obj in ids["archetype"]:
-        aid = a_obj["id"]
-        # Assign 2-3 random skills
-        num_skills = random.randint(2, 3)
-        chosen_skills = random.sample(ids["skill"], min(num_skills, len(ids["skill"])))
-        for skill_id in chosen_skills:
-            f.write(f"INSERT IGNORE INTO PlayerArchetypeSkill VALUES ({escape_sql(aid)}, {escape_sql(skill_id)});\n")
-
-    # Club & ClubManager
-    available_cities = ids["city"][:len(CLUB_LORE_DATA)]
-    
-    for i, city_id in enumerate(available_cities):
+
+def club_tables(seed, ids):
+    """One club per CLUB_LORE_DATA entry, managed by the first managers; the last three are champions."""
+    rng, _ = chunk_rng(seed, "club")
+    tables = {name: [] for name in ("Club", "ClubManager", "TrophyName", "Champion", "ClubSeasonRegistry")}
+
+    ids["club"] = []  # (club id, manager id)
+    for i, city_id in enumerate(ids["city"][:len(CLUB_LORE_DATA)]):
         c_name, c_position_name, c_trophy_name, c_stadium = CLUB_LORE_DATA[i]
-        
         cid = get_id("B", c_name, i+1)
-        ids["club"].append({"id": cid, "city": city_id})
-        
-        try:
-            pos_idx = POSITIONS.index(c_position_name)
-            spec_pos_id = ids["position"][pos_idx]
-        except ValueError:
+        if c_position_name in POSITIONS:
+            spec_pos_id = ids["position"][POSITIONS.index(c_position_name)]
+        else:
             spec_pos_id = ids["position"][0]
+        tables["Club"].append((cid, c_name, city_id, spec_pos_id, c_stadium, rng.randint(1880, 1990)))
 
-        founded_year = random.randint(1880, 1990)
-        f.write(f"INSERT INTO Club VALUES ({escape_sql(cid)}, {escape_sql(c_name)}, {escape_sql(city_id)}, {escape_sql(spec_pos_id)}, {escape_sql(c_stadium)}, {founded_year});\n")
-        
-        # Assign Manager
         cmid = ids["manager"][i]
-        ids["club_manager"].append({"mid": cmid, "cid": cid})
-        
-        formation = random.choice(["4-4-2", "4-3-3", "3-5-2", "4-2-3-1", "5-3-2"])
-        f.write(f"INSERT INTO ClubManager VALUES ({escape_sql(cmid)}, {escape_sql(spec_pos_id)}, {random.randint(1,20)}, {escape_sql(formation)});\n")
-        
-        # Trophy Name
-        f.write(f"INSERT INTO TrophyName VALUES ({escape_sql(cid)}, {escape_sql(c_trophy_name)});\n")
-
-    # Champion
+        ids["club"].append((cid, cmid))
+        formation = rng.choice(["4-4-2", "4-3-3", "3-5-2", "4-2-3-1", "5-3-2"])
+        tables["ClubManager"].append((cmid, spec_pos_id, rng.randint(1, 20), formation))
+        tables["TrophyName"].append((cid, c_trophy_name))
+
     for i in range(1, 4):
-        champ_id = ids["manager"][-i]
-        f.write(f"INSERT INTO Champion VALUES ({escape_sql(champ_id)}, {2020+i});\n")
+        tables["Champion"].append((ids["manager"][-i], 2020 + i))
 
-    # Player
-    for i in range(1, NUM_PLAYERS + 1):
-        pid = get_id("R", "PLAYER", i)
-        ids["player"].append(pid)
-        arch_obj = random.choice(ids["archetype"])
-        arch_id = arch_obj["id"]
-        manager_id = random.choice(ids["manager"])
-        
-        if fake:
-            player_name = fake.name()
-        else:
-            player_name = f"Player{i}"
-            
-        jersey_num = random.randint(1, 99)
-        rating = random.randint(50, 99)
-        
-        contract_start = random_date_in_years(2018, 2023)
-        cs_obj = datetime.date.fromisoformat(contract_start)
-        ce_obj = cs_obj + datetime.timedelta(days=random.randint(365, 1825))
-        contract_end = ce_obj.isoformat()
-        
-        market_value = round(random.uniform(100000, 150000000), 2)
-        
-        f.write(f"INSERT INTO Player VALUES ({escape_sql(pid)}, {escape_sql(arch_id)}, {escape_sql(manager_id)}, {escape_sql(player_name)}, {jersey_num}, {rating}, {escape_sql(contract_start)}, {escape_sql(contract_end)}, {market_value});\n")
-
-    # Tournament
-    for i in range(1, 6):
-        tid = get_id("T", "TOURN", i)
-        cid = random.choice(ids["city"])
-        sid = random.choice(ids["season"])
-        
-        if i <= len(TOURNAMENT_NAMES):
-            t_name = TOURNAMENT_NAMES[i-1]
-        else:
-            t_name = f"Cup Competition {i}"
-            
-        start_date = random_date_in_years(2023, 2025)
-        sd_obj = datetime.date.fromisoformat(start_date)
-        end_obj = sd_obj + datetime.timedelta(days=random.randint(3, 30))
-        end_date = end_obj.isoformat()
-        
-        prize_money = round(random.uniform(1000000, 100000000), 2)
-        
-        ids["tournament"].append({"id": tid, "start": start_date, "end": end_date, "city": cid, "season": sid})
-        f.write(f"INSERT INTO Tournament VALUES ({escape_sql(tid)}, {escape_sql(t_name)}, {escape_sql(start_date)}, {escape_sql(end_date)}, {escape_sql(cid)}, {escape_sql(sid)}, {prize_money});\n")
-
-    # =====================================================
-    # LEVEL 3
-    # =====================================================
-    f.write("\n-- LEVEL 3: Complex Intersections\n")
-
-    # PlayerMove
-    for pid in ids["player"]:
-        num_moves = random.randint(1, 4)
-        chosen_moves = random.sample(ids["move"], min(num_moves, len(ids["move"])))
-        for mid in chosen_moves:
-            f.write(f"INSERT INTO PlayerMove VALUES ({escape_sql(pid)}, {escape_sql(mid)});\n")
-
-    # ClubSeasonRegistry
     registry_count = 1
     for season in ids["season"]:
-        for cm_obj in ids["club_manager"]:
-            rid = get_id("E", "REG", registry_count)
-            f.write(f"INSERT INTO ClubSeasonRegistry VALUES ({escape_sql(rid)}, {escape_sql(season)}, {escape_sql(cm_obj['cid'])}, {escape_sql(cm_obj['mid'])});\n")
+        for cid, cmid in ids["club"]:
+            tables["ClubSeasonRegistry"].append((get_id("E", "REG", registry_count), season, cid, cmid))
             registry_count += 1
+    return tables
+
 
-    # ClubMatch & Trophy
-    match_count = 1
-    trophy_counters = {}
-    for i in range(50):
-        if len(ids["club"]) < 2:
-            break
-        home_club_obj, away_club_obj = random.sample(ids["club"], 2)
-        home_cid = home_club_obj['id']
-        away_cid = away_club_obj['id']
-        
-        # Find managers for these clubs
-        home_manager = None
-        away_manager = None
-        for cm in ids["club_manager"]:
-            if cm['cid'] == home_cid:
-                home_manager = cm['mid']
-            if cm['cid'] == away_cid:
-                away_manager = cm['mid']
-        
-        if not home_manager or not away_manager:
-            continue
-            
-        mid = get_id("H", "MATCH", match_count)
-        match_date = random_date_in_years(2022, 2025)
-        
-        home_score = random.randint(0, 5)
-        away_score = random.randint(0, 5)
-        
+def player_chunk(seed, chunk, counts, ids):
+    """Players with their moves and, for the first counts["player_statistics"], 3 seasons of stats."""
+    rng, fake = chunk_rng(seed, "player", chunk)
+    tables = {"Player": [], "PlayerMove": [], "PlayerStatistics": []}
+    for i in chunk_range(chunk, counts["player"]):
+        pid = get_id("R", "PLAYER", i)
+        player_name = fake.name() if fake else f"Player{i}"
+        contract_start = random_date_in_years(rng, 2018, 2023)
+        cs_obj = datetime.date.fromisoformat(contract_start)
+        contract_end = (cs_obj + datetime.timedelta(days=rng.randint(365, 1825))).isoformat()
+        tables["Player"].append((
+            pid, rng.choice(ids["archetype"]), rng.choice(ids["manager"]), player_name,
+            rng.randint(1, 99), rng.randint(50, 99), contract_start, contract_end,
+            round(rng.uniform(100000, 150000000), 2),
+        ))
+
+        for mid in rng.sample(ids["move"], min(rng.randint(1, 4), len(ids["move"]))):
+            tables["PlayerMove"].append((pid, mid))
+
+        if i <= counts["player_statistics"]:
+            for s, season_id in enumerate(ids["season"][:3]):
+                stat_id = get_id("X", "STAT", (i - 1) * 3 + s + 1)
+                tables["PlayerStatistics"].append((
+                    stat_id, pid, season_id, rng.randint(0, 30), rng.randint(0, 20),
+                    rng.randint(0, 8), rng.randint(0, 2), rng.randint(500, 3000), rng.randint(10, 38),
+                ))
+    return tables
+
+
+def tournament_chunk(seed, chunk, counts, ids):
+    """
+    Tournaments with 32 entrants each. counts["tournament_match"] is spread
+    evenly over the tournaments so a chunk knows its share without the others.
+    """
+    rng, _ = chunk_rng(seed, "tournament", chunk)
+    tables = {"Tournament": [], "TournamentEntry": [], "TournamentMatch": []}
+    total = counts["tournament"]
+    per_tournament, extra = divmod(counts["tournament_match"], total) if total else (0, 0)
+    for i in chunk_range(chunk, total, TOURNAMENTS_PER_CHUNK):
+        tid = get_id("T", "TOURN", i)
+        t_name = TOURNAMENT_NAMES[i-1] if i <= len(TOURNAMENT_NAMES) else f"Cup Competition {i}"
+        start_date = random_date_in_years(rng, 2023, 2025)
+        start_dt = datetime.date.fromisoformat(start_date)
+        end_dt = start_dt + datetime.timedelta(days=rng.randint(3, 30))
+        tables["Tournament"].append((
+            tid, t_name, start_date, end_dt.isoformat(), rng.choice(ids["city"]),
+            rng.choice(ids["season"]), round(rng.uniform(1000000, 100000000), 2),
+        ))
+
+        participants = rng.sample(ids["manager"], min(32, len(ids["manager"])))
+        entry_window_start = start_dt - datetime.timedelta(days=30)
+        for p in participants:
+            tables["TournamentEntry"].append((tid, p, random_date_between(rng, entry_window_start, start_dt)))
+
+        num_matches = per_tournament + (1 if i <= extra else 0)
+        num_rounds = rng.randint(4, 6)
+        for match_number in range(1, num_matches + 1):
+            m1, m2 = rng.sample(participants, 2)
+            score1 = rng.randint(0, 5)
+            score2 = rng.randint(0, 5)
+            if score1 > score2:
+                winner = m1
+            elif score2 > score1:
+                winner = m2
+            else:
+                winner = rng.choice([m1, m2])
+            round_no = (match_number - 1) * num_rounds // num_matches + 1
+            tables["TournamentMatch"].append((
+                tid, match_number, m1, m2, winner,
+                random_date_between(rng, start_dt, end_dt), round_no, score1, score2,
+            ))
+    return tables
+
+
+def club_match_chunk(seed, chunk, counts, ids):
+    """ClubMatches between the clubs; each win also awards a Trophy numbered after the match."""
+    rng, _ = chunk_rng(seed, "club_match", chunk)
+    tables = {"ClubMatch": [], "Trophy": []}
+    for i in chunk_range(chunk, counts["club_match"]):
+        (home_cid, home_manager), (away_cid, away_manager) = rng.sample(ids["club"], 2)
+        match_date = random_date_in_years(rng, 2022, 2025)
+        home_score = rng.randint(0, 5)
+        away_score = rng.randint(0, 5)
         if home_score > away_score:
-            result = 'Home Win'
-            winner_manager = home_manager
-            winner_club = home_cid
+            result, winner_club, winner_manager = "Home Win", home_cid, home_manager
         elif away_score > home_score:
-            result = 'Away Win'
-            winner_manager = away_manager
-            winner_club = away_cid
+            result, winner_club, winner_manager = "Away Win", away_cid, away_manager
         else:
-            result = 'Draw'
-            winner_manager = None
-            winner_club = None
-        
-        attendance = random.randint(5000, 80000)
-        
-        f.write(f"INSERT INTO ClubMatch VALUES ({escape_sql(mid)}, {escape_sql(home_cid)}, {escape_sql(away_cid)}, {escape_sql(home_manager)}, {escape_sql(away_manager)}, {escape_sql(match_date)}, {home_score}, {away_score}, {escape_sql(result)}, {attendance});\n")
-        
-        if result != 'Draw' and winner_club:
-            trophy_number = trophy_counters.get(winner_club, 0) + 1
-            trophy_counters[winner_club] = trophy_number
-            trophy_type = random.choice(["League Title", "Cup Trophy", "Super Cup"])
-            f.write(
-                f"INSERT IGNORE INTO Trophy VALUES ({escape_sql(winner_club)}, {trophy_number}, {escape_sql(match_date)}, {escape_sql(winner_manager)}, {escape_sql(trophy_type)});\n"
-            )
-        
-        match_count += 1
-
-    # TournamentEntry & TournamentMatch
-    total_matches = 0
-    for tourn in ids["tournament"]:
-        tourn_id = tourn["id"]
-        t_start = tourn["start"]
-        t_end = tourn["end"]
-        start_dt = datetime.date.fromisoformat(t_start)
-        end_dt = datetime.date.fromisoformat(t_end)
-        participants = random.sample(ids["manager"], min(32, len(ids["manager"])))
-        
-        entry_window_start = start_dt - datetime.timedelta(days=30)
-        for p in participants:
-            entry_date = random_date_between(entry_window_start, start_dt)
-            f.write(f"INSERT IGNORE INTO TournamentEntry VALUES ({escape_sql(tourn_id)}, {escape_sql(p)}, {escape_sql(entry_date)});\n")
-        
-        match_number = 1
-        num_rounds = random.randint(4, 6)
-        for round_no in range(1, num_rounds + 1):
-            matches_this_round = random.randint(18, 32)
-            for _ in range(matches_this_round):
-                if total_matches >= NUM_MATCHES:
-                    break
-                if len(participants) < 2:
-                    break
-                m1, m2 = random.sample(participants, 2)
-                
-                score1 = random.randint(0, 5)
-                score2 = random.randint(0, 5)
-                
-                if score1 > score2:
-                    winner = m1
-                elif score2 > score1:
-                    winner = m2
-                else:
-                    winner = random.choice([m1, m2])
-                
-                match_date = random_date_between(start_dt, end_dt)
-                f.write(
-                    f"INSERT INTO TournamentMatch VALUES ("
-                    f"{escape_sql(tourn_id)}, {match_number}, {escape_sql(m1)}, {escape_sql(m2)}, "
-                    f"{escape_sql(winner)}, {escape_sql(match_date)}, {round_no}, {score1}, {score2});\n"
-                )
-                match_number += 1
-                total_matches += 1
-            if total_matches >= NUM_MATCHES:
-                break
-        if total_matches >= NUM_MATCHES:
-            break
-
-    # PlayerStatistics
-    stat_count = 1
-    for player_id in ids["player"][:100]:  # First 100 players get stats
-        for season_id in ids["season"][:3]:  # First 3 seasons
-            stat_id = get_id("X", "STAT", stat_count)
-            goals = random.randint(0, 30)
-            assists = random.randint(0, 20)
-            yellow_cards = random.randint(0, 8)
-            red_cards = random.randint(0, 2)
-            minutes_played = random.randint(500, 3000)
-            matches_played = random.randint(10, 38)
-            
-            f.write(f"INSERT INTO PlayerStatistics VALUES ({escape_sql(stat_id)}, {escape_sql(player_id)}, {escape_sql(season_id)}, {goals}, {assists}, {yellow_cards}, {red_cards}, {minutes_played}, {matches_played});\n")
-            stat_count += 1
-
-    # Transfer
-    transfer_count = 1
-    for _ in range(50):  # 50 random transfers
-        player_id = random.choice(ids["player"])
-        from_manager = random.choice(ids["manager"])
-        to_manager = random.choice(ids["manager"])
-        
-        if from_manager == to_manager:
-            continue
-            
-        transfer_id = get_id("F", "TRANSFER", transfer_count)
-        transfer_date = random_date_in_years(2020, 2025)
-        transfer_fee = round(random.uniform(1000000, 100000000), 2)
-        
-        f.write(f"INSERT INTO Transfer VALUES ({escape_sql(transfer_id)}, {escape_sql(player_id)}, {escape_sql(from_manager)}, {escape_sql(to_manager)}, {escape_sql(transfer_date)}, {transfer_fee});\n")
-        transfer_count += 1
-
-    f.write("\nSET FOREIGN_KEY_CHECKS = 1;\n")
-
-print(f"Successfully generated {FILE_NAME} for Football League Management System with all tables populated.")
+            result, winner_club, winner_manager = "Draw", None, None
+        tables["ClubMatch"].append((
+            get_id("H", "MATCH", i), home_cid, away_cid, home_manager, away_manager,
+            match_date, home_score, away_score, result, rng.randint(5000, 80000),
+        ))
+        if winner_club:
+            trophy_type = rng.choice(["League Title", "Cup Trophy", "Super Cup"])
+            tables["Trophy"].append((winner_club, i, match_date, winner_manager, trophy_type))
+    return tables
+
+
+def transfer_chunk(seed, chunk, counts, ids):
+    rng, _ = chunk_rng(seed, "transfer", chunk)
+    rows = []
+    for i in chunk_range(chunk, counts["transfer"]):
+        player_id = get_id("R", "PLAYER", rng.randint(1, counts["player"]))
+        from_manager = rng.choice(ids["manager"])
+        to_manager = rng.choice(ids["manager"])
+        while to_manager == from_manager:
+            to_manager = rng.choice(ids["manager"])
+        rows.append((
+            get_id("F", "TRANSFER", i), player_id, from_manager, to_manager,
+            random_date_in_years(rng, 2020, 2025), round(rng.uniform(1000000, 100000000), 2),
+        ))
+    return {"Transfer": rows}
+
+
+# Chunked tables after Manager and the clubs: (generator, count key, rows per chunk)
+CHUNKED_TABLES = [
+    (player_chunk, "player", CHUNK_ROWS),
+    (tournament_chunk, "tournament", TOURNAMENTS_PER_CHUNK),
+    (club_match_chunk, "club_match", CHUNK_ROWS),
+    (transfer_chunk, "transfer", CHUNK_ROWS),
+]
+
+
+# ---------------------------------------------------------
+# OUTPUT FORMATS
+# ---------------------------------------------------------
+# sql:   one INSERT per row
+# multi: one INSERT per `batch` rows of a table
+# tsv:   a <Table>.tsv file per table and a LOAD DATA script (LOAD_SCRIPT)
+# csv:   the same with comma-separated, double-quoted files
+FORMATS = ("sql", "multi", "tsv", "csv")
+DELIMITED = ("tsv", "csv")
+INSERT_BATCH = 1000
+LOAD_SCRIPT = "load.sql"
+
+LOAD_OPTIONS = {
+    "tsv": "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'",
+    "csv": "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' LINES TERMINATED BY '\\n'",
+}
+
+
+def tsv_field(val):
+    if val is None:
+        return "\\N"
+    return str(val).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+def csv_field(val):
+    if val is None:
+        return "NULL"  # unquoted, which LOAD DATA reads as NULL
+    if isinstance(val, int) or isinstance(val, float):
+        return str(val)
+    escaped = str(val).replace('"', '""')
+    return f'"{escaped}"'
+
+
+def render_tables(tables, fmt="sql", batch=INSERT_BATCH):
+    """
+    Text for generated tables, as {target: text}: target "" is the SQL
+    script, otherwise the name of the table whose data file gets the text.
+    """
+    if fmt in DELIMITED:
+        field, sep = (tsv_field, "\t") if fmt == "tsv" else (csv_field, ",")
+        return {table: "".join(sep.join(field(v) for v in row) + "\n" for row in rows)
+                for table, rows in tables.items() if rows}
+
+    step = batch if fmt == "multi" else 1
+    lines = []
+    for table, rows in tables.items():
+        verb = "INSERT IGNORE INTO" if table in IGNORE_DUPLICATES else "INSERT INTO"
+        for start in range(0, len(rows), step):
+            values = ", ".join(f"({', '.join(escape_sql(v) for v in row)})" for row in rows[start:start + step])
+            lines.append(f"{verb} {table} VALUES {values};\n")
+    return {"": "".join(lines)}
+
+
+def render_chunk(key, chunk, tables, fmt="sql", batch=INSERT_BATCH):
+    texts = render_tables(tables, fmt, batch)
+    if "" in texts:
+        texts[""] = f"\n-- {key} chunk {chunk}\n" + texts[""]
+    return texts
+
+
+class Output:
+    """
+    Where the generated text goes. The SQL formats write one script to
+    `path` ("-" for stdout), gzip-compressed if asked to or if the path ends
+    in .gz. The delimited formats make `path` a directory holding one data
+    file per table and LOAD_SCRIPT, written on close.
+    """
+
+    def __init__(self, path, fmt="sql", compress=False, database=DATABASE):
+        self.path = path
+        self.format = fmt
+        self.database = database
+        self.tables = {}  # table -> open data file, in first-written order
+        if fmt in DELIMITED:
+            os.makedirs(path, exist_ok=True)
+            self.script = None
+            return
+        compress = compress or path.endswith(".gz")
+        if path == "-":
+            raw = sys.stdout.buffer
+        else:
+            raw = open(path, "wb")
+        self._raw = raw
+        if compress:
+            # No name or timestamp in the header, so the same data gives the same bytes.
+            raw = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+        self._gzip = raw if compress else None
+        self.script = io.TextIOWrapper(raw, encoding="utf-8", newline="\n")
+
+    def _target(self, target):
+        if target == "":
+            return self.script
+        if target not in self.tables:
+            name = os.path.join(self.path, f"{target}.{self.format}")
+            self.tables[target] = open(name, "w", encoding="utf-8", newline="\n")
+        return self.tables[target]
+
+    def write(self, texts):
+        for target, text in texts.items():
+            f = self._target(target)
+            if f is not None:
+                f.write(text)
+
+    def copy(self, target, path):
+        """Append the contents of the file at `path` to `target`."""
+        f = self._target(target)
+        if f is not None:
+            with open(path, encoding="utf-8", newline="\n") as part:
+                shutil.copyfileobj(part, f)
+
+    def close(self):
+        for f in self.tables.values():
+            f.close()
+        if self.script is None:
+            self._write_load_script()
+            return
+        self.script.flush()
+        self.script.detach()
+        if self._gzip:
+            self._gzip.close()
+        if self._raw is not sys.stdout.buffer:
+            self._raw.close()
+        else:
+            self._raw.flush()
+
+    def _write_load_script(self):
+        """
+        LOAD DATA LOCAL INFILE for every data file, with foreign key and
+        unique checks off and non-unique indexes disabled while loading.
+        Run it from the output directory: mysql --local-infile=1 < load.sql
+        """
+        with open(os.path.join(self.path, LOAD_SCRIPT), "w", encoding="utf-8", newline="\n") as f:
+            f.write("-- AUTO-GENERATED LOAD SCRIPT FOR FOOTBALL LEAGUE\n")
+            f.write(f"USE {self.database};\n\n")
+            f.write("SET FOREIGN_KEY_CHECKS = 0;\nSET UNIQUE_CHECKS = 0;\nSET autocommit = 0;\n\n")
+            for table in self.tables:
+                ignore = " IGNORE" if table in IGNORE_DUPLICATES else ""
+                f.write(f"ALTER TABLE {table} DISABLE KEYS;\n")
+                f.write(f"LOAD DATA LOCAL INFILE '{table}.{self.format}'{ignore} INTO TABLE {table}\n"
+                        f"    CHARACTER SET utf8mb4 {LOAD_OPTIONS[self.format]};\n")
+                f.write(f"ALTER TABLE {table} ENABLE KEYS;\nCOMMIT;\n\n")
+            f.write("SET autocommit = 1;\nSET UNIQUE_CHECKS = 1;\nSET FOREIGN_KEY_CHECKS = 1;\n")
+
+# ---------------------------------------------------------
+# PARALLEL GENERATION
+# ---------------------------------------------------------
+
+# The ID pools in a worker process, set once by _init_worker rather than
+# pickled with every chunk.
+_worker_ids = None
+
+def _init_worker(ids):
+    global _worker_ids
+    _worker_ids = ids
+
+def _write_shard(task):
+    """
+    Worker: generate one chunk into shard files (one per output target),
+    returning the targets written and, if asked, the chunk's row IDs.
+    """
+    func, key, seed, chunk, counts, prefix, fmt, batch, keep_ids = task
+    tables = func(seed, chunk, counts, _worker_ids)
+    targets = []
+    for n, (target, text) in enumerate(render_chunk(key, chunk, tables, fmt, batch).items()):
+        with open(f"{prefix}.{n}", "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+        targets.append(target)
+    return targets, [row[0] for row in next(iter(tables.values()))] if keep_ids else None
+
+
+def write_chunks(out, chunked, seed, counts, ids, jobs=1, batch=INSERT_BATCH, keep_ids=False):
+    """
+    Write every chunk of the `chunked` (generator, count key, chunk size)
+    tables to the Output `out`, in order. With keep_ids, returns the first
+    column of the first table's rows. With jobs > 1 the chunks are spread
+    over a process pool whose workers write shard files, copied into `out`
+    in chunk order, so the output is the same whatever the number of jobs.
+    """
+    tasks = [(func, key, chunk) for func, key, size in chunked
+             for chunk in range(num_chunks(counts[key], size))]
+    kept = []
+    if jobs <= 1 or len(tasks) <= 1:
+        for func, key, chunk in tasks:
+            tables = func(seed, chunk, counts, ids)
+            out.write(render_chunk(key, chunk, tables, out.format, batch))
+            if keep_ids:
+                kept.extend(row[0] for row in next(iter(tables.values())))
+        return kept
+
+    with tempfile.TemporaryDirectory(prefix="pop_gen_") as shard_dir, \
+            multiprocessing.Pool(min(jobs, len(tasks)), _init_worker, (ids,)) as pool:
+        shards = [(func, key, seed, chunk, counts, os.path.join(shard_dir, f"{n:06d}"), out.format, batch, keep_ids)
+                  for n, (func, key, chunk) in enumerate(tasks)]
+        # imap hands results back in task order while later chunks are still being generated
+        for shard, (targets, chunk_ids) in zip(shards, pool.imap(_write_shard, shards)):
+            for n, target in enumerate(targets):
+                path = f"{shard[5]}.{n}"
+                out.copy(target, path)
+                os.remove(path)
+            kept.extend(chunk_ids or ())
+    return kept
+
+
+def generate(out, counts, seed=DEFAULT_SEED, jobs=1, batch=INSERT_BATCH):
+    """Write the whole dataset for `counts` to the Output `out`, using `jobs` processes."""
+    out.write({"": "-- AUTO-GENERATED POPULATION SCRIPT FOR FOOTBALL LEAGUE\n"
+                   f"-- seed {seed}, " + ", ".join(f"{k}={v}" for k, v in counts.items()) + "\n"
+                   f"USE {out.database};\n\n"
+                   "-- Disable checks for bulk loading\n"
+                   "SET FOREIGN_KEY_CHECKS = 0;\n"
+                   + ("SET UNIQUE_CHECKS = 0;\nSET autocommit = 0;\n" if out.format == "multi" else "")
+                   + "\n-- Lookup tables\n"})
+
+    ids = {}
+    out.write(render_tables(fixed_tables(seed, ids), out.format, batch))
+
+    # Every later table refers to managers, so they are generated first.
+    ids["manager"] = write_chunks(out, [(manager_chunk, "manager", CHUNK_ROWS)], seed, counts, ids,
+                                  jobs, batch, keep_ids=True)
+
+    out.write({"": "\n-- Clubs\n"})
+    out.write(render_tables(club_tables(seed, ids), out.format, batch))
+
+    write_chunks(out, CHUNKED_TABLES, seed, counts, ids, jobs, batch)
+    out.write({"": ("\nCOMMIT;\nSET autocommit = 1;\nSET UNIQUE_CHECKS = 1;" if out.format == "multi" else "")
+                   + "\nSET FOREIGN_KEY_CHECKS = 1;\n"})
+
+
+def _count(text):
+    table, sep, n = text.partition("=")
+    if not sep or table not in BASE_COUNTS or not n.isdigit():
+        raise argparse.ArgumentTypeError(f"expected TABLE=N with TABLE one of {', '.join(BASE_COUNTS)}")
+    return table, int(n)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate sample data for the football league schema")
+    parser.add_argument("--scale", type=int, default=1, help="multiply every row count (default 1)")
+    parser.add_argument("--count", type=_count, action="append", default=[], metavar="TABLE=N",
+                        help=f"row count for one table, repeatable ({', '.join(BASE_COUNTS)})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="same seed, same output")
+    parser.add_argument("-o", "--output",
+                        help=f"script file, - for stdout (default {FILE_NAME}); a directory for tsv/csv")
+    parser.add_argument("-d", "--database", default=DATABASE, help="database named in the USE statement")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes, 0 for one per CPU (the output does not change)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="sql",
+                        help="sql: INSERT per row, multi: INSERT per --batch rows, tsv/csv: data files + LOAD DATA script")
+    parser.add_argument("--batch", type=int, default=INSERT_BATCH, help="rows per INSERT with --format multi")
+    parser.add_argument("-z", "--gzip", action="store_true", help="gzip the script (implied by a .gz output)")
+    args = parser.parse_args(argv)
+
+    if args.scale < 1:
+        parser.error("--scale must be at least 1")
+    if args.jobs < 0:
+        parser.error("--jobs cannot be negative")
+    if args.batch < 1:
+        parser.error("--batch must be at least 1")
+    if args.format in DELIMITED:
+        output = args.output or "populate_data"
+        if output == "-" or args.gzip or output.endswith(".gz"):
+            parser.error("tsv/csv write a directory for LOAD DATA; stdout and gzip are for the SQL formats")
+    else:
+        output = args.output or FILE_NAME
+    counts = make_counts(args.scale, dict(args.count))
+    if counts["manager"] < len(CLUB_LORE_DATA):
+        parser.error(f"need at least {len(CLUB_LORE_DATA)} managers, one per club")
+    if counts["tournament_match"] and not counts["tournament"]:
+        parser.error("tournament matches need at least one tournament")
+    if counts["transfer"] and not counts["player"]:
+        parser.error("transfers need at least one player")
+    for table, per_row in IDS_PER_ROW.items():
+        if counts[table] * per_row > ID_SERIES_SIZE:
+            parser.error(f"{table}={counts[table]} needs more IDs than the {ID_SERIES_SIZE} one series can hold")
+
+    out = Output(output, args.format, args.gzip, args.database)
+    try:
+        generate(out, counts, args.seed, args.jobs or os.cpu_count(), args.batch)
+    finally:
+        out.close()
+    # Keep stdout clean when it carries the script.
+    print(f"Successfully generated {output} for Football League Management System with all tables populated.",
+          file=sys.stderr if output == "-" else sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -316,6 +316,12 @@ CREATE TABLE Transfer (
     CONSTRAINT chk_transfer_id CHECK (transfer_id REGEXP '^F[A-Z]{3,16}[0-9]{3}$')
 );
 
+-- ID SEQUENCES (next free ID ordinal per table, see db_utils.next_ids)
+CREATE TABLE IdSequence (
+    seq_name VARCHAR(64) PRIMARY KEY,
+    next_value BIGINT UNSIGNED NOT NULL
+);
+
 -- ---------------------------------------------------
 -- TRIGGERS: Ensure winner_id is one of the participants
 -- ---------------------------------------------------
@@ -1,4 +1,10 @@
 import sys
+import os
+import contextlib
+import logging
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, Grid, VerticalScroll
@@ -6,6 +12,7 @@ from textual.widgets import Header, Footer, Button, Static, DataTable, Input, La
 from textual.screen import ModalScreen, Screen
 from textual import on
 from textual.binding import Binding
+from textual.logging import TextualHandler
 from textual.validation import Number, Function
 from rich.text import Text
 import db_utils
@@ -252,6 +259,109 @@ TABLE_CONFIG = {
     }
 }
 
+def table_pk_columns(table_name):
+    """Primary key columns of a table from TABLE_CONFIG, single or composite."""
+    config = TABLE_CONFIG.get(table_name, {})
+    if config.get('pk'):
+        return [config['pk']]
+    return list(config.get('pks', []))
+
+# The Data Browser is a sliding window over keyset pages of PAGE_SIZE rows:
+# a page is fetched when the cursor comes within PREFETCH_MARGIN rows of
+# either edge, and at most WINDOW_MAX_ROWS rows are held at once.
+PAGE_SIZE = 100
+PREFETCH_MARGIN = 20
+WINDOW_MAX_ROWS = 500
+
+# Global search fans out over the connection pool; these bound how long it
+# may take and how many rows each table contributes.
+GLOBAL_SEARCH_DEADLINE = 10.0
+GLOBAL_SEARCH_ROW_LIMIT = 200
+
+# Searches use FULLTEXT indexes where db_utils.ensure_fulltext_indexes has
+# created them and quietly fall back to LIKE everywhere else.
+SEARCH_MODE = "fulltext"
+
+# Global Search answers from an in-memory trigram index once it is built.
+# Set a path to reuse a snapshot between sessions instead of rebuilding.
+FUZZY_INDEX_SNAPSHOT = None
+FUZZY_SEARCH_LIMIT = 100
+
+# The Performance tab redraws from in-memory counters (db_utils.TraceStats,
+# pool and cache stats) every PERF_REFRESH_SECONDS while it is visible.
+PERF_REFRESH_SECONDS = 1.0
+PERF_SLOWEST = 10
+PERF_UI_SAMPLES = 50
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+class DbJob:
+    """A db_utils call running on a worker thread (see FootballTUI.run_db)."""
+
+    def __init__(self, group, spinner):
+        self.group = group
+        self.spinner = spinner
+        self.started = time.perf_counter()
+        self.rendered = 0.0
+        self.thread_ident = None
+        self.cancelled = False
+        self.cancel_event = threading.Event()  # Passed to func as cancel= with run_db(pass_cancel=True)
+        self.worker = None
+
+
+class TableWindow:
+    """
+    Consecutive keyset pages (from db_utils.browse_table) currently loaded in
+    the Data Browser. Adding a page at one edge drops whole pages from the
+    other edge once more than max_rows rows are held.
+    """
+
+    def __init__(self, max_rows):
+        self.max_rows = max_rows
+        self.pages = deque()
+
+    def rows(self):
+        return [row for page in self.pages for row in page["rows"]]
+
+    def row_count(self):
+        return sum(len(page["rows"]) for page in self.pages)
+
+    def first_key(self):
+        return self.pages[0]["first_key"]
+
+    def last_key(self):
+        return self.pages[-1]["last_key"]
+
+    def has_prev(self):
+        return bool(self.pages) and self.pages[0]["has_prev"]
+
+    def has_next(self):
+        return bool(self.pages) and self.pages[-1]["has_next"]
+
+    def close_edge(self, forward):
+        """Marks an edge as the end of the table (a fetch past it came back empty)."""
+        if self.pages:
+            self.pages[-1 if forward else 0]["has_next" if forward else "has_prev"] = False
+
+    def append(self, page):
+        """Adds a page after the window; returns the rows dropped from the front."""
+        self.pages.append(page)
+        dropped = []
+        while len(self.pages) > 1 and self.row_count() > self.max_rows:
+            gone = self.pages.popleft()
+            dropped.extend(gone["rows"])
+            self.pages[0]["has_prev"] = True
+        return dropped
+
+    def prepend(self, page):
+        """Adds a page before the window; returns the rows dropped from the back."""
+        self.pages.appendleft(page)
+        dropped = []
+        while len(self.pages) > 1 and self.row_count() > self.max_rows:
+            gone = self.pages.pop()
+            dropped.extend(gone["rows"])
+            self.pages[-1]["has_next"] = True
+        return dropped
+
 LOGO_ASCII = r"""
    ___         _   _         _ _  
   / __\___   _| |_| |__   __| | | 
@@ -355,12 +465,6 @@ class RecordForm(ModalScreen):
         if single_pk and not any(c['col'] == single_pk for c in display_columns):
             display_columns.insert(0, {"col": single_pk, "type": "str"})
 
-        # Auto-generate ID if in Add mode and table has auto-id config
-        if self.mode == "add" and config.get('pk') and config.get('prefix'):
-             generated_id = db_utils.get_next_id(self.conn, self.table_name, config['pk'], config['prefix'])
-             if generated_id:
-                 self.record_data[config['pk']] = generated_id
-
         title = f"{self.mode.upper()} Record: {self.table_name}"
         
         with Container(id="form_container"):
@@ -398,6 +502,25 @@ class RecordForm(ModalScreen):
                 yield Button("Save", variant="success", id="btn_save")
                 yield Button("Cancel", variant="error", id="btn_cancel")
 
+    def on_mount(self) -> None:
+        # Auto-generate ID if in Add mode and table has auto-id config
+        config = TABLE_CONFIG.get(self.table_name, {})
+        if self.mode == "add" and config.get('pk') and config.get('prefix') and not self.record_data.get(config['pk']):
+            self.app.run_db("form_id", db_utils.get_next_id, self.conn, self.table_name, config['pk'], config['prefix'],
+                            on_done=self.fill_generated_id)
+
+    def fill_generated_id(self, generated_id):
+        pk = TABLE_CONFIG.get(self.table_name, {}).get('pk')
+        if not generated_id or not pk:
+            return
+        self.record_data[pk] = generated_id
+        try:
+            inp = self.query_one(f"#inp_{pk}", Input)
+            if not inp.value:
+                inp.value = generated_id
+        except Exception:
+            pass  # Form was closed before the ID arrived
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn_cancel":
             self.dismiss(None)
@@ -505,6 +628,9 @@ class FootballTUI(App):
     .search_row { height: auto; margin-top: 1; }
     #search_input, #filter_input { width: 80%; }
     #btn_do_search, #btn_filter { width: 20%; }
+    .perf_btn { width: auto; margin-right: 1; }
+    #perf_summary { height: auto; margin-bottom: 1; }
+    #perf_ops, #perf_slow { height: 1fr; }
     """
 
     BINDINGS = [
@@ -514,6 +640,9 @@ class FootballTUI(App):
         Binding("d", "delete_record", "Delete"),
         Binding("u", "update_record", "Update"),
         Binding("r", "refresh_table", "Refresh"),
+        Binding("n", "next_page", "Next Page"),
+        Binding("p", "prev_page", "Prev Page"),
+        Binding("e", "export_table", "Export CSV"),
         Binding("j", "cursor_down", "Down", show=False),
         Binding("k", "cursor_up", "Up", show=False),
         Binding("h", "cursor_left", "Left", show=False),
@@ -525,24 +654,148 @@ class FootballTUI(App):
         self.conn = None
         self.current_table = None
         self.current_table_data = []
+        self.fuzzy_index = None
+        self.window = None
+        self._extending = False
+        self._db_jobs = {}
+        self.trace_stats = db_utils.TraceStats()
+        self._ui_timings = {}
 
     def on_mount(self) -> None:
         self.title = "Football League Manager"
         self.theme = "tokyo-night"
+        db_utils.tracer.add_sink(self.trace_stats)
+        self.set_interval(PERF_REFRESH_SECONDS, self.refresh_performance)
         self.push_screen(LoginScreen(), self.login_callback)
 
+    def on_unmount(self) -> None:
+        db_utils.tracer.remove_sink(self.trace_stats)
+        for group in list(self._db_jobs):
+            self.cancel_db_job(group)
+        self.drop_fuzzy_index()
+        if self.conn:
+            self.conn.close()
+
     def login_callback(self, credentials):
         if not credentials:
             self.exit()
             return
         host, user, password, db_name = credentials
-        self.conn = db_utils.get_db_connection(host, user, password, db_name)
+        self.run_db("connect", db_utils.create_pool, host, user, password, db_name, on_done=self.on_connected)
+
+    def on_connected(self, pool):
+        self.conn = pool
+        self.drop_fuzzy_index()  # It indexed the previous connection's data
         if self.conn:
             self.notify("Connected Successfully!", severity="success")
+            self.run_worker(self.build_fuzzy_index, thread=True, exclusive=True, group="fuzzy_index")
         else:
             self.notify("Connection Failed. Retrying...", severity="error")
             self.push_screen(LoginScreen(), self.login_callback)
 
+    # --- BACKGROUND DATABASE WORK ---
+    def run_db(self, group, func, *args, on_done=None, on_chunk=None, on_error=None, spinner=None, supersede=True,
+               pass_cancel=False, **kwargs):
+        """
+        Runs func(*args, **kwargs) on a worker thread and passes its result to
+        on_done back on the UI thread, so the interface never waits on MySQL.
+
+        A new job supersedes the running job of the same group (a second
+        filter, another table, ...): the old one is cancelled, its SQL is
+        stopped with KILL QUERY, and its result is thrown away. Writes pass
+        supersede=False so they always run to completion.
+        spinner is a selector whose widget shows a loading indicator meanwhile.
+        on_error(exception) runs on the UI thread if func raises, after the
+        error has been shown.
+        pass_cancel=True hands func the job's threading.Event as cancel=; it
+        is set as soon as the job is cancelled (see db_utils.search_global).
+
+        With on_chunk, func returns a generator of row chunks (the db_utils
+        stream/iter functions): each chunk is handed to on_chunk as it
+        arrives, then on_done(None) runs. A cancelled job closes the
+        generator, which abandons the rest of the result.
+        """
+        if supersede:
+            self.cancel_db_job(group)
+        job = DbJob(group, spinner)
+        if pass_cancel:
+            kwargs["cancel"] = job.cancel_event
+        if supersede:
+            self._db_jobs[group] = job
+        if spinner:
+            self.query_one(spinner).loading = True
+
+        def work():
+            job.thread_ident = threading.get_ident()
+            try:
+                result = func(*args, **kwargs)
+                if on_chunk is not None:
+                    with contextlib.closing(result):
+                        for chunk in result:
+                            if job.cancelled:
+                                return
+                            self.call_from_thread(self._deliver_chunk, job, on_chunk, chunk)
+                    result = None
+            except Exception as e:
+                if not job.cancelled:
+                    self.call_from_thread(self._finish_db_job, job, on_error, None, e)
+                return
+            finally:
+                job.thread_ident = None
+            if not job.cancelled:
+                self.call_from_thread(self._finish_db_job, job, on_done, result, None)
+
+        job.worker = self.run_worker(work, thread=True, group=f"db_{group}", exit_on_error=False)
+        return job
+
+    def _deliver_chunk(self, job, on_chunk, chunk):
+        if job.cancelled:
+            return
+        spinner, job.spinner = job.spinner, None  # Rows are on screen from the first chunk
+        self._stop_spinner(spinner)
+        started = time.perf_counter()
+        on_chunk(chunk)
+        job.rendered += time.perf_counter() - started
+
+    def _finish_db_job(self, job, on_done, result, error):
+        """Runs on_done(result), or, with an error, shows it and runs on_done(error) if given."""
+        if job.cancelled:
+            return
+        waited = time.perf_counter() - job.started - job.rendered
+        if self._db_jobs.get(job.group) is job:
+            del self._db_jobs[job.group]
+        self._stop_spinner(job.spinner)
+        if error is not None:
+            self.notify(f"Database error: {error}", severity="error")
+            if on_done:
+                on_done(error)
+        elif on_done:
+            started = time.perf_counter()
+            on_done(result)
+            timings = self._ui_timings.setdefault(job.group, deque(maxlen=PERF_UI_SAMPLES))
+            timings.append((waited, job.rendered + time.perf_counter() - started))
+
+    def _stop_spinner(self, spinner):
+        if spinner and not any(j.spinner == spinner for j in self._db_jobs.values()):
+            try:
+                self.query_one(spinner).loading = False
+            except Exception:
+                pass
+
+    def cancel_db_job(self, group):
+        """Abandons the running job of a group and kills its query server-side."""
+        job = self._db_jobs.pop(group, None)
+        if job is None:
+            return
+        job.cancelled = True
+        job.cancel_event.set()
+        job.worker.cancel()
+        self._stop_spinner(job.spinner)
+        ident = job.thread_ident
+        if ident is not None and self.conn:
+            # KILL QUERY needs its own connection; keep that off the UI thread too.
+            threading.Thread(target=db_utils.cancel_queries, args=(self.conn, ident), daemon=True).start()
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         with Container():
@@ -588,6 +841,16 @@ class FootballTUI(App):
                                 yield Button("Club Assignments", id="rep_2", classes="report_box")
                                 yield Button("Player Skills", id="rep_3", classes="report_box")
                             yield DataTable(id="report_table")
+
+                        with TabPane("Performance", id="tab_perf"):
+                            yield Static("Waiting for database activity...", id="perf_summary")
+                            with Horizontal(classes="search_row"):
+                                yield Button("Server Timing: Off", id="btn_server_timing", classes="perf_btn")
+                                yield Button("Reset Stats", id="btn_perf_reset", classes="perf_btn")
+                            yield Label("Statement latency per operation (histogram: <=1 5 10 50 100 500 1000 >1000 ms):")
+                            yield DataTable(id="perf_ops")
+                            yield Label("Slowest recent queries:")
+                            yield DataTable(id="perf_slow")
         yield Footer()
 
     def _is_input_focused(self):
@@ -611,6 +874,29 @@ class FootballTUI(App):
         if not self._is_input_focused():
             self.on_button_pressed(Button(id="btn_refresh"))
 
+    def action_next_page(self):
+        if not self._is_input_focused() and self.current_table and self.window:
+            if self.window.has_next():
+                self.load_table_data(self.current_table, after=self.window.last_key())
+            else:
+                self.notify("Already on the last page.")
+
+    def action_prev_page(self):
+        if not self._is_input_focused() and self.current_table and self.window:
+            if self.window.has_prev():
+                self.load_table_data(self.current_table, before=self.window.first_key())
+            else:
+                self.notify("Already on the first page.")
+
+    def action_export_table(self):
+        if not self._is_input_focused() and self.current_table and self.conn:
+            path = os.path.abspath(f"{self.current_table}.csv")
+            self.notify(f"Exporting {self.current_table} to {path}...")
+            self.run_db("export", db_utils.export_table_csv, self.conn, self.current_table, path,
+                        on_done=lambda count: self.notify(
+                            f"Exported {count} rows to {path}" if count is not None else "Export failed.",
+                            severity="information" if count is not None else "error"))
+
     def action_cursor_down(self):
         if not self._is_input_focused():
             if isinstance(self.focused, (DataTable, ListView)):
@@ -646,27 +932,27 @@ class FootballTUI(App):
         except:
             pass
 
-        self.load_table_data(table_name, limit=1000)
-        
         config = TABLE_CONFIG.get(table_name, {})
         pk_col = config.get('pk')
-        
-        if pk_col and hasattr(self, 'current_table_data') and self.current_table_data:
-            found = False
-            for index, row in enumerate(self.current_table_data):
-                row_val = str(row.get(pk_col, "")).strip().lower()
-                target_val = str(pk_val).strip().lower()
-
-                if row_val == target_val:
-                    table = self.query_one("#main_table", DataTable)
-                    table.move_cursor(row=index, animate=True)
-                    self.notify(f"Jumped to {table_name}: {pk_val}")
-                    found = True
-                    break
-            if not found:
-                 self.notify(f"Switched to {table_name}, but row {pk_val} not in top 1000 results.", severity="warning")
-        else:
+
+        if not pk_col:
+            self.load_table_data(table_name)
             self.notify(f"Switched to {table_name} (Composite PK jump not supported)", severity="warning")
+            return
+
+        # Start the page at the target key, so the row is first whatever its position.
+        self.load_table_data(table_name, start_at=(pk_val,),
+                             on_loaded=lambda: self._highlight_jump_target(table_name, pk_col, pk_val))
+
+    def _highlight_jump_target(self, table_name, pk_col, pk_val):
+        if self.current_table_data:
+            row_val = str(self.current_table_data[0].get(pk_col, "")).strip().lower()
+            if row_val == str(pk_val).strip().lower():
+                table = self.query_one("#main_table", DataTable)
+                table.move_cursor(row=0, animate=True)
+                self.notify(f"Jumped to {table_name}: {pk_val}")
+                return
+        self.notify(f"Switched to {table_name}, but row {pk_val} was not found.", severity="warning")
 
     # --- TABLE LOADING ---
     def on_list_view_selected(self, event: ListView.Selected) -> None:
@@ -675,57 +961,131 @@ class FootballTUI(App):
             self.query_one("#table_label").update(f"Browsing: [bold yellow]{self.current_table}[/]")
             self.load_table_data(self.current_table)
 
-    def normalize_data_keys(self, data):
-        """Converts all dictionary keys in a list of dicts to lowercase."""
-        if not data:
-            return []
-        
-        normalized = []
-        for row in data:
-            new_row = {k.lower(): v for k, v in row.items()}
-            normalized.append(new_row)
-        return normalized
-
-    def load_table_data(self, table_name, data=None, limit=100):
+    def load_table_data(self, table_name, data=None, limit=PAGE_SIZE, after=None, before=None, start_at=None,
+                        on_loaded=None):
+        """
+        Shows `data` (e.g. search results) as-is, or, when data is None,
+        opens a virtual view of the table: one keyset page is fetched in the
+        background now and more as the cursor nears either edge (see
+        extend_window). on_loaded runs once the rows are on screen.
+        """
         if not self.conn: return
+        self.cancel_db_job("window")
+        self._extending = False  # A cancelled prefetch never reaches _slide_window
+
+        if data is not None:
+            self.cancel_db_job("main_table")
+            self.show_table_data(table_name, data, None)
+            if on_loaded: on_loaded()
+            return
+
+        def show_page(page):
+            if page["error"]:
+                self.notify(f"Database error: {page['error']}", severity="error")
+                return
+            window = TableWindow(WINDOW_MAX_ROWS)
+            window.append(page)
+            self.show_table_data(table_name, page["rows"], window)
+            if on_loaded: on_loaded()
+
+        self.run_db("main_table", db_utils.browse_table, self.conn, table_name, table_pk_columns(table_name),
+                    page_size=limit, after=after, before=before, start_at=start_at,
+                    on_done=show_page, spinner="#main_table")
+
+    def show_table_data(self, table_name, data, window):
         table = self.query_one("#main_table", DataTable)
         table.clear(columns=True)
-        
-        if data is None:
-            data = db_utils.view_table(self.conn, table_name, limit=limit)
+        self.window = window
         
         if not data:
+            self.current_table_data = []
             self.notify("No records found.")
             return
 
-        data = self.normalize_data_keys(data)
-
         config = TABLE_CONFIG.get(table_name, {})
         
         headers = list(data[0].keys())
         
-        pks = set()
-        if config.get('pk'): pks.add(config['pk'])
-        if config.get('pks'): pks.update(config['pks'])
+        pks = set(table_pk_columns(table_name))
         fks = {col['col']: col for col in config.get('columns', []) if col['type'] == 'fk'}
 
         styled_headers = []
         for h in headers:
             label = h
-            if h in pks: label += " 🔑"
-            if h in fks: label += " 🔗"
+            if h.lower() in pks: label += " 🔑"
+            if h.lower() in fks: label += " 🔗"
             styled_headers.append(Text(label, style="bold cyan"))
             
         table.add_columns(*styled_headers)
         table.misc_col_map = headers 
 
-        for row in data:
-            table.add_row(*[str(row.get(h, "")) for h in headers])
-        
-        self.current_table_data = data 
+        self._add_table_rows(table, data)
+        self.current_table_data = window.rows() if window else data
         
         self.query_one("#filter_input").value = ""
 
+    def _add_table_rows(self, table, rows):
+        # db_utils Rows look up columns case-insensitively and share one
+        # header, so the cells are their values as-is; DataTable formats them.
+        for row in rows:
+            table.add_row(*row.values(), key=str(id(row)))
+
+    def extend_window(self, forward):
+        """Fetches the page past one edge of the window in the background."""
+        window = self.window
+        edge = {"after": window.last_key()} if forward else {"before": window.first_key()}
+        self._extending = True
+        self.run_db("window", db_utils.browse_table, self.conn, self.current_table,
+                    table_pk_columns(self.current_table), page_size=PAGE_SIZE, **edge,
+                    on_done=lambda page: self._slide_window(window, forward, page),
+                    on_error=lambda error: self._stop_extending(window))
+
+    def _stop_extending(self, window):
+        if window is self.window:
+            self._extending = False
+
+    def _slide_window(self, window, forward, page):
+        """Adds a fetched page to the window and slides the DataTable over it."""
+        self._extending = False
+        if window is not self.window:
+            return  # The table was reloaded meanwhile
+        table = self.query_one("#main_table", DataTable)
+        if page["error"]:
+            # Leave the edge open so the next scroll retries the fetch.
+            self.notify(f"Database error: {page['error']}", severity="error")
+            return
+        if not page["rows"]:
+            window.close_edge(forward)
+            return
+
+        cursor_row, cursor_col = table.cursor_coordinate
+        if forward:
+            dropped = window.append(page)
+            self._add_table_rows(table, page["rows"])
+            for row in dropped:
+                table.remove_row(str(id(row)))
+            cursor_row -= len(dropped)
+        else:
+            # DataTable can only append, so re-render the (bounded) window.
+            window.prepend(page)
+            table.clear()
+            self._add_table_rows(table, window.rows())
+            cursor_row += len(page["rows"])
+
+        self.current_table_data = window.rows()
+        table.move_cursor(row=max(cursor_row, 0), column=cursor_col, animate=False)
+
+    def on_data_table_cell_highlighted(self, event: DataTable.CellHighlighted) -> None:
+        if event.data_table.id != "main_table" or not self.window or self._extending:
+            return
+        # Read the live cursor: highlight events raised by our own re-render
+        # arrive after move_cursor has already put the cursor back in place.
+        row = event.data_table.cursor_row
+        if row >= len(self.current_table_data) - PREFETCH_MARGIN and self.window.has_next():
+            self.extend_window(forward=True)
+        elif row < PREFETCH_MARGIN and self.window.has_prev():
+            self.extend_window(forward=False)
+
     # --- SELECTION & DRILL DOWN ---
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         if event.data_table.id != "main_table": return
@@ -775,26 +1135,32 @@ class FootballTUI(App):
         
         elif bid == "btn_refresh":
             if self.current_table:
-                self.load_table_data(self.current_table, data=None)
-                self.notify("Table refreshed.")
+                self.load_table_data(self.current_table, data=None,
+                                     on_loaded=lambda: self.notify("Table refreshed."))
         
         elif bid == "btn_filter":
             if not self.current_table: return
+            table_name = self.current_table
             term = self.query_one("#filter_input").value.strip()
             if term:
-                results = db_utils.search_table(self.conn, self.current_table, term)
-                self.load_table_data(self.current_table, data=results)
-                self.notify(f"Filter applied: {len(results)} records")
+                def show_results(results):
+                    self.load_table_data(table_name, data=results)
+                    self.notify(f"Filter applied: {len(results)} records")
+                self.run_db("main_table", db_utils.search_table, self.conn, table_name, term, mode=SEARCH_MODE,
+                            on_done=show_results, spinner="#main_table")
             else:
-                self.load_table_data(self.current_table)
+                self.load_table_data(table_name)
 
         elif bid == "btn_recent":
             if self.current_table:
-                config = TABLE_CONFIG.get(self.current_table, {})
+                table_name = self.current_table
+                config = TABLE_CONFIG.get(table_name, {})
                 pk = config.get('pk')
-                data = db_utils.get_recent_records(self.conn, self.current_table, pk)
-                self.load_table_data(self.current_table, data)
-                self.notify(f"Showing last 5 entries for {self.current_table}")
+                def show_recent(data):
+                    self.load_table_data(table_name, data)
+                    self.notify(f"Showing last 5 entries for {table_name}")
+                self.run_db("main_table", db_utils.get_recent_records, self.conn, table_name, pk,
+                            on_done=show_recent, spinner="#main_table")
         
         elif bid == "btn_add":
             if not self.current_table:
@@ -833,12 +1199,34 @@ class FootballTUI(App):
         elif bid == "btn_do_search":
             term = self.query_one("#search_input").value
             if term and self.conn:
-                res = db_utils.search_global(self.conn, term)
-                self.populate_search_table(res)
+                # Fuzzy hits show at once; the SQL search still runs, since only
+                # it matches numbers, dates and exact substrings, and its rows
+                # are added below them.
+                hits = []
+                if self.fuzzy_index is not None:
+                    hits = self.fuzzy_index.search(term, limit=FUZZY_SEARCH_LIMIT)
+                    if hits:
+                        self.populate_fuzzy_results(hits)
+                self.run_db("search", db_utils.search_global, self.conn, term, parallel=True,
+                            deadline=GLOBAL_SEARCH_DEADLINE, row_limit=GLOBAL_SEARCH_ROW_LIMIT, mode=SEARCH_MODE,
+                            on_done=lambda results: self.populate_search_table(results, hits),
+                            spinner="#search_results_table", pass_cancel=True)
         
         elif bid.startswith("rep_"):
             if self.conn: self.run_report(bid)
 
+        elif bid == "btn_server_timing":
+            db_utils.tracer.server_time = not db_utils.tracer.server_time
+            state = "On" if db_utils.tracer.server_time else "Off"
+            self.query_one("#btn_server_timing", Button).label = f"Server Timing: {state}"
+            if db_utils.tracer.server_time:
+                self.notify("Server timing costs one extra round trip per statement.")
+
+        elif bid == "btn_perf_reset":
+            self.trace_stats.reset()
+            self._ui_timings.clear()
+            self.refresh_performance()
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.input.id == "filter_input":
             self.on_button_pressed(Button(id="btn_filter"))
@@ -849,26 +1237,27 @@ class FootballTUI(App):
     def handle_add_submit(self, data):
         if not data: return
         
-        config = TABLE_CONFIG.get(self.current_table, {})
+        table_name = self.current_table
+        config = TABLE_CONFIG.get(table_name, {})
         pk = config.get('pk')
         prefix = config.get('prefix')
-        
-        if pk and prefix and (pk not in data or not data[pk]):
-            new_id = db_utils.get_next_id(self.conn, self.current_table, pk, prefix)
-            data[pk] = new_id
-            self.notify(f"Generated ID: {new_id}")
-
-        columns = list(data.keys())
-        placeholders = ["%s"] * len(columns)
-        sql = f"INSERT INTO {self.current_table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-        
-        try:
-            with self.conn.cursor() as cursor:
-                cursor.execute(sql, list(data.values()))
-            self.notify("Record Added!", severity="success")
-            self.load_table_data(self.current_table)
-        except Exception as e:
-            self.notify(f"Error adding record: {e}", severity="error")
+        generate_id = bool(pk and prefix and (pk not in data or not data[pk]))
+
+        def insert():
+            if generate_id:
+                data[pk] = db_utils.get_next_id(self.conn, table_name, pk, prefix)
+            return db_utils.insert_record(self.conn, table_name, data)
+
+        def done(ok):
+            if generate_id:
+                self.notify(f"Generated ID: {data[pk]}")
+            if ok:
+                self.notify("Record Added!", severity="success")
+                self.load_table_data(table_name)
+            else:
+                self.notify("Insert failed. Check database constraints.", severity="error")
+
+        self.run_db("write", insert, on_done=done, supersede=False)
 
     def handle_update_submit(self, data):
         if not data: return
@@ -913,11 +1302,17 @@ class FootballTUI(App):
              self.notify("No changes detected.", severity="warning")
              return
 
-        if db_utils.update_record(self.conn, self.current_table, pk_dict, updates):
-            self.notify("Record Updated!", severity="success")
-            self.load_table_data(self.current_table)
-        else:
-            self.notify("Update failed. Check database constraints.", severity="error")
+        table_name = self.current_table
+
+        def done(ok):
+            if ok:
+                self.notify("Record Updated!", severity="success")
+                self.load_table_data(table_name)
+            else:
+                self.notify("Update failed. Check database constraints.", severity="error")
+
+        self.run_db("write", db_utils.update_record, self.conn, table_name, pk_dict, updates,
+                    on_done=done, supersede=False)
 
     def handle_delete_confirm(self, confirmed):
         if not confirmed or not hasattr(self, 'row_to_delete'): return
@@ -932,15 +1327,64 @@ class FootballTUI(App):
             for k in config['pks']:
                 pk_dict[k] = self.row_to_delete.get(k)
                 
-        if db_utils.delete_record(self.conn, self.current_table, pk_dict):
-            self.notify("Record Deleted!", severity="success")
-            self.load_table_data(self.current_table)
-        else:
-            self.notify("Delete failed.", severity="error")
+        table_name = self.current_table
+
+        def done(ok):
+            if ok:
+                self.notify("Record Deleted!", severity="success")
+                self.load_table_data(table_name)
+            else:
+                self.notify("Delete failed.", severity="error")
+
+        self.run_db("write", db_utils.delete_record, self.conn, table_name, pk_dict,
+                    on_done=done, supersede=False)
 
     # --- HELPERS ---
-    def populate_search_table(self, results):
+    def build_fuzzy_index(self):
+        """Worker: loads the trigram index and keeps it current via write listeners."""
+        index = db_utils.TrigramIndex()
+        try:
+            if FUZZY_INDEX_SNAPSHOT and os.path.exists(FUZZY_INDEX_SNAPSHOT):
+                index.load(FUZZY_INDEX_SNAPSHOT)
+            else:
+                index.build(self.conn)
+                if FUZZY_INDEX_SNAPSHOT:
+                    index.save(FUZZY_INDEX_SNAPSHOT)
+        except Exception as e:
+            self.call_from_thread(self.notify, f"Fuzzy search unavailable: {e}", severity="warning")
+            return
+        self.drop_fuzzy_index()
+        db_utils.add_write_listener(index.on_write)
+        self.fuzzy_index = index
+        self.call_from_thread(self.notify, f"Fuzzy search ready ({len(index)} rows indexed).")
+
+    def drop_fuzzy_index(self):
+        """Detaches the current trigram index from the write listeners and forgets it."""
+        index, self.fuzzy_index = self.fuzzy_index, None
+        if index is not None:
+            db_utils.remove_write_listener(index.on_write)
+
+    def populate_fuzzy_results(self, hits):
+        table = self.query_one("#search_results_table", DataTable)
+        table.clear(columns=True)
+        table.add_columns("Table", "Key", "Field", "Value", "Score")
+        for hit in hits:
+            key = ", ".join(str(v) for v in hit["pk"].values())
+            table.add_row(hit["table"], key, hit["column"], hit["value"], f"{hit['score']:.2f}")
+
+    def populate_search_table(self, results, fuzzy_hits=()):
+        """Shows the SQL search results, below the fuzzy hits if there are any."""
         table = self.query_one("#search_results_table", DataTable)
+        if fuzzy_hits:
+            shown = {(hit["table"].lower(), tuple(str(v) for v in hit["pk"].values())) for hit in fuzzy_hits}
+            for t_name, rows in (results or {}).items():
+                pks = table_pk_columns(t_name)
+                for row in rows:
+                    key = tuple(str(row.get(c)) for c in pks)
+                    if pks and (t_name.lower(), key) in shown:
+                        continue
+                    table.add_row(t_name, ", ".join(key), "", str(dict(row)), "match")
+            return
         table.clear(columns=True)
         if not results:
             self.notify("No matches.")
@@ -948,24 +1392,103 @@ class FootballTUI(App):
         table.add_columns("Table", "Row Data")
         for t_name, rows in results.items():
             for row in rows:
-                table.add_row(t_name, str(row))
+                table.add_row(t_name, str(dict(row)))
 
     def run_report(self, rep_id):
-        data = []
-        if rep_id == "rep_1": data = db_utils.get_league_management_report(self.conn)
-        elif rep_id == "rep_2": data = db_utils.get_club_assignments_report(self.conn)
-        elif rep_id == "rep_3": data = db_utils.get_player_skills_report(self.conn)
-        
+        # The unbounded reports stream into the table; the others are small.
+        stream = None
+        report = None
+        if rep_id == "rep_1": stream = db_utils.iter_league_management_report
+        elif rep_id == "rep_2": stream = db_utils.iter_club_assignments_report
+        elif rep_id == "rep_3": report = db_utils.get_player_skills_report
+        if stream:
+            self.query_one("#report_table", DataTable).clear(columns=True)
+            self.run_db("report", stream, self.conn, on_chunk=self.append_report_rows,
+                        on_done=self._report_streamed, spinner="#report_table")
+        elif report:
+            self.run_db("report", report, self.conn, on_done=self.show_report, spinner="#report_table")
+
+    def append_report_rows(self, rows):
+        table = self.query_one("#report_table", DataTable)
+        if not table.columns:
+            table.add_columns(*rows[0].keys())
+        for row in rows:
+            table.add_row(*row.values())
+
+    def _report_streamed(self, _):
+        if not self.query_one("#report_table", DataTable).row_count:
+            self.notify("No data.")
+
+    def show_report(self, data):
         table = self.query_one("#report_table", DataTable)
         table.clear(columns=True)
         if data:
             headers = list(data[0].keys())
             table.add_columns(*headers)
             for row in data:
-                table.add_row(*[str(v) for v in row.values()])
+                table.add_row(*row.values())
         else:
             self.notify("No data.")
 
+    # --- PERFORMANCE TAB ---
+    def refresh_performance(self):
+        """Redraws the Performance tab from in-memory stats; never touches MySQL."""
+        try:
+            if self.query_one(TabbedContent).active != "tab_perf":
+                return
+        except Exception:
+            return
+        snapshot = self.trace_stats.snapshot(PERF_SLOWEST)
+        self.query_one("#perf_summary", Static).update(self._perf_summary(snapshot))
+
+        ops = self.query_one("#perf_ops", DataTable)
+        ops.clear(columns=True)
+        ops.add_columns("Operation", "Calls", "p50 ms", "p95 ms", "Max ms", "Server ms", "Rows", "KB", "Errors",
+                        "Histogram")
+        operations = sorted(snapshot["operations"].items(), key=lambda item: item[1]["calls"], reverse=True)
+        for name, op in operations:
+            server = f"{op['server_ms']:.1f}" if op["server_ms"] is not None else "-"
+            ops.add_row(name, op["calls"], f"{op['p50_ms']:.1f}", f"{op['p95_ms']:.1f}", f"{op['max_ms']:.1f}",
+                        server, op["rows"], f"{op['bytes'] / 1024:.1f}", op["errors"], _sparkline(op["buckets"]))
+
+        slow = self.query_one("#perf_slow", DataTable)
+        slow.clear(columns=True)
+        slow.add_columns("Wall ms", "Server ms", "Rows", "Operation", "Params", "SQL")
+        for event in snapshot["slowest"]:
+            server = f"{event['server_ms']:.1f}" if event["server_ms"] is not None else "-"
+            rows = event["rows"] if event["rows"] is not None else "-"
+            slow.add_row(f"{event['wall_ms']:.1f}", server, rows, event["operation"] or "-",
+                         str(event["params"])[:60], event["sql"][:120])
+
+    def _perf_summary(self, snapshot):
+        lines = []
+        if isinstance(self.conn, db_utils.ConnectionPool):
+            pool = self.conn.stats()
+            lines.append(f"Pool: {pool['in_use']} in use, {pool['idle']} idle "
+                         f"(size {pool['size']}, max {pool['max_size']})")
+        cache = db_utils.query_cache.stats()
+        registry = db_utils.statement_stats()
+        lines.append(f"Result cache: {_hit_rate(cache)} hit rate, {cache['entries']} entries, "
+                     f"{cache['rows']} rows  |  Statement cache: {_hit_rate(registry)} hit rate")
+        lines.append(f"Rows fetched: {snapshot['rows_per_sec']:.0f}/s over the last "
+                     f"{self.trace_stats.window:.0f}s")
+        for group, timings in sorted(self._ui_timings.items()):
+            waited = sum(w for w, _ in timings) / len(timings) * 1000
+            rendered = sum(r for _, r in timings) / len(timings) * 1000
+            lines.append(f"  {group:<12} waiting on db {waited:8.1f} ms   rendering {rendered:8.1f} ms")
+        return "\n".join(lines)
+
+
+def _hit_rate(stats):
+    total = stats["hits"] + stats["misses"]
+    return f"{stats['hits'] / total:.0%}" if total else "-"
+
+def _sparkline(counts):
+    peak = max(counts) or 1
+    return "".join(SPARK_CHARS[-(-c * (len(SPARK_CHARS) - 1) // peak)] for c in counts)
+
 if __name__ == "__main__":
+    # db_utils reports errors through logging; keep them off the terminal
+    logging.basicConfig(level=logging.WARNING, handlers=[TextualHandler()])
     app = FootballTUI()
     app.run()
@@ -0,0 +1,79 @@
+"""
+SQL produced by db_utils.compile_search_predicates for each kind of column.
+Pure string building: no MySQL server is needed.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import db_utils  # noqa: E402
+
+
+def column(name, dtype, column_type=None, max_length=None):
+    return {"name": name, "type": dtype, "column_type": column_type or dtype, "max_length": max_length}
+
+
+def test_year_on_date_column_is_a_half_open_range():
+    clauses, params = db_utils.compile_search_predicates([column("match_date", "date")], "2024")
+    assert clauses == ["(match_date >= %s AND match_date < %s)"]
+    assert params == ["2024-01-01", "2025-01-01"]
+
+
+def test_year_on_datetime_column_is_a_half_open_range():
+    clauses, params = db_utils.compile_search_predicates([column("kickoff", "datetime")], "2024")
+    assert clauses == ["(kickoff >= %s AND kickoff < %s)"]
+    assert params == ["2024-01-01", "2025-01-01"]
+
+
+def test_full_date_on_date_column_is_an_equality():
+    clauses, params = db_utils.compile_search_predicates([column("match_date", "date")], "2024-05-01")
+    assert clauses == ["match_date = %s"]
+    assert params == ["2024-05-01"]
+
+
+def test_full_date_on_datetime_column_covers_the_whole_day():
+    clauses, params = db_utils.compile_search_predicates([column("kickoff", "datetime")], "2024-05-01")
+    assert clauses == ["(kickoff >= %s AND kickoff < %s)"]
+    assert params == ["2024-05-01", "2024-05-02"]
+
+
+def test_enum_matches_become_an_in_list():
+    position = column("position", "enum", "enum('Goalkeeper','Defender','Midfielder','Forward')")
+    clauses, params = db_utils.compile_search_predicates([position], "er")
+    assert clauses == ["position IN (%s, %s, %s)"]
+    assert params == ["Goalkeeper", "Defender", "Midfielder"]
+
+    clauses, params = db_utils.compile_search_predicates([position], "keep")
+    assert clauses == ["position IN (%s)"]
+    assert params == ["Goalkeeper"]
+
+
+def test_enum_without_matching_member_is_skipped():
+    position = column("position", "enum", "enum('Goalkeeper','Defender')")
+    assert db_utils.compile_search_predicates([position], "xyz") == ([], [])
+
+
+def test_like_escapes_wildcards():
+    clauses, params = db_utils.compile_search_predicates([column("player_name", "varchar", max_length=100)],
+                                                         "50%_off\\")
+    assert clauses == ["player_name LIKE %s"]
+    assert params == ["%50\\%\\_off\\\\%"]
+
+
+def test_term_longer_than_text_column_is_skipped():
+    code = column("code", "char", max_length=3)
+    assert db_utils.compile_search_predicates([code], "ABCD") == ([], [])
+
+
+def test_non_numeric_term_skips_numeric_and_date_columns():
+    columns = [column("overall_rating", "int"), column("match_date", "date"), column("season", "year")]
+    assert db_utils.compile_search_predicates(columns, "Madrid") == ([], [])
+
+
+def test_skip_columns_are_left_out():
+    columns = [column("player_name", "varchar"), column("nickname", "varchar")]
+    clauses, _ = db_utils.compile_search_predicates(columns, "Real", skip_columns={"player_name"})
+    assert clauses == ["nickname LIKE %s"]